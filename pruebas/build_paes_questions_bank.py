@@ -7,6 +7,18 @@ import requests
 from datetime import datetime
 import csv
 import random
+import sys
+from collections import Counter
+
+# Módulos compartidos con scripts/ (temario y palabras clave)
+SCRIPTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "scripts")
+if SCRIPTS_DIR not in sys.path:
+    sys.path.insert(0, SCRIPTS_DIR)
+
+# Palabras clave por materia y área (Historia, Química, Matemáticas y Lenguaje),
+# compartidas con el preclasificador; se compilan una sola vez por materia junto
+# con las palabras del temario.
+from paes_keywords import AREA_KEYWORDS
 
 # Try to import Ollama; if it fails, we'll use OpenAI as a fallback
 try:
@@ -176,27 +188,442 @@ def extract_questions_line_by_line(doc):
     return questions
 
 # Step 2: Categorize questions using temario_paes_vf.csv
-def categorize_questions(questions, temario_path, subject_code):
+
+# Patrones del análisis secundario (Matemáticas y Lenguaje)
+NUMERIC_EXPRESSION = re.compile(r'[\d\+\-\*\/\^\=\(\)\[\]\{\}]{5,}')
+NUMERIC_OPERATION = re.compile(r'\d+\s*[\+\-\*\/]\s*\d+')
+POWER_OR_LOG = re.compile(r'x\s*\^|logaritmo|log|exponencial')
+SHAPE_WORDS = re.compile(r'triángulo|círculo|cuadrado|rectángulo|perímetro|área|volumen', re.IGNORECASE)
+STATISTICS_WORDS = re.compile(r'probabilidad|frecuencia|porcentaje|estadística|promedio|media|mediana|moda', re.IGNORECASE)
+ALGEBRAIC_EXPRESSION = re.compile(r'[a-zA-Z]\s*[\+\-\*\/\=]\s*[a-zA-Z0-9]|[a-zA-Z]\(\s*[a-zA-Z0-9\+\-\*\/\s]*\)')
+GEOMETRY_WORDS = re.compile(r'dibujo|figura|punto|recta|plano|ángulo|triángulo|cuadrado|círculo', re.IGNORECASE)
+CHANCE_WORDS = re.compile(r'azar|aleatorio|dado|moneda|baraja|carta|probabilidad|estadística', re.IGNORECASE)
+
+LITERARY_WORDS = re.compile(r'poet|novel|cuent|narr|liter|personaje|dramát|líric|épic|estrofa|verso|rima|métrica|soneto', re.IGNORECASE)
+EVALUATE_WORDS = re.compile(r'evalu|juzg|valid|opin|argumen|postur|críti|valor|propósito|intenci|objetivo|punto de vista', re.IGNORECASE)
+LITERARY_ANALYSIS_WORDS = re.compile(r'autor|narrador|obra|literari|poema|cuento|novela|ensayo|editorial', re.IGNORECASE)
+INTERPRET_WORDS = re.compile(r'interpret|signific|comprend|sentido|idea|mensaje|sinteti|relaci|proble|soluci|compara|contrast|inferir|deduci|conclu', re.IGNORECASE)
+READING_WORDS = re.compile(r'según el texto|de acuerdo|lectura|fragmento|párrafo|pasaje', re.IGNORECASE)
+LOCATE_WORDS = re.compile(r'identific|reconoc|extraer|dato|explícit|menciona|indica|dice|señala|afirma', re.IGNORECASE)
+SYNONYM_WORDS = re.compile(r'sinónim|significado|reemplazar|sustituir|palabra', re.IGNORECASE)
+
+QUALITY_WORDS = re.compile(r'calidad|pertinencia|releva|exactitud|validez', re.IGNORECASE)
+CONTEXT_WORDS = re.compile(r'contexto|nuevo|aplicar|relacionar|extrapolar|situacion', re.IGNORECASE)
+CAUSE_WORDS = re.compile(r'causa|efecto|problema|solucion|resulta|consecuencia', re.IGNORECASE)
+SECTION_WORDS = re.compile(r'parrafo|seccion|fragmen|pasaje|parte|apartado', re.IGNORECASE)
+PARAPHRASE_WORDS = re.compile(r'sinonimo|parafrasis|signif|equivale|reemplaz|sustituir', re.IGNORECASE)
+
+# Desde este número de preguntas la categorización se reparte entre procesos
+PARALLEL_MIN_QUESTIONS = 5000
+PARALLEL_CHUNK_SIZE = 2000
+
+
+def _trie_pattern(terms):
+    """Alternación regex con prefijos comunes factorizados; prefiere el término más largo"""
+    trie = {}
+    for term in terms:
+        node = trie
+        for char in term:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def emit(node):
+        branches = [re.escape(char) + emit(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if "" in node:
+            return f"(?:{body})?"
+        return body
+
+    return emit(trie)
+
+
+def _has_border(term):
+    """Indica si dos apariciones del término pueden solaparse (prefijo propio = sufijo)"""
+    return any(term[:size] == term[-size:] for size in range(1, len(term)))
+
+
+class TermScorer:
+    """
+    Puntajes de un conjunto fijo de términos sobre un texto: cada aparición
+    (como subcadena, con el mismo conteo que `text.count`) de un término suma
+    su peso en cada casilla donde participa.
+
+    Un término sin espacios no puede cruzar un espacio, así que se cuenta
+    palabra por palabra: cada palabra distinta se analiza una sola vez con
+    una expresión con lookahead que, en cada posición, devuelve el término
+    más largo que empieza ahí (los más cortos son prefijos suyos y salen de
+    una tabla precalculada), y su aporte a las casillas queda memorizado.
+    Los términos con espacios se cuentan con `text.count` solo si aparece su
+    palabra más larga.
+    """
+
+    # Palabras distintas memorizadas antes de vaciar la memoria
+    MAX_MEMO_WORDS = 200_000
+
+    def __init__(self, weights, size):
+        """
+        Args:
+            weights: término → [(casilla, peso)]
+            size: Número de casillas
+        """
+        self.weights = weights
+        self.size = size
+        terms = set(weights)
+        phrases = sorted(term for term in terms if len(term.split()) > 1 or term != term.strip())
+        self.phrases = [(phrase, max(phrase.split(), key=len)) for phrase in phrases]
+        words = terms.difference(phrases)
+        self.anchors = {anchor for _, anchor in self.phrases}
+        words.update(self.anchors)
+
+        self.pattern = None
+        if words:
+            # El lookahead inicial descarta rápido las posiciones que no empiezan ningún término
+            first_chars = re.escape("".join(sorted({word[0] for word in words})))
+            self.pattern = re.compile(f"(?=[{first_chars}])(?=({_trie_pattern(sorted(words))}))")
+        self.prefixes = {
+            word: [word[:size] for size in range(1, len(word) + 1) if word[:size] in words]
+            for word in words
+        }
+        # Solo estos términos pueden solaparse consigo mismos (p. ej. "algebralgebra"),
+        # donde `str.count` cuenta menos apariciones que el recorrido
+        self.bordered = {word for word in words if _has_border(word)}
+        self._memo = {}
+
+    def _scan_word(self, word):
+        """(aportes por casilla, anclas de frases presentes) de una palabra"""
+        counts = {}
+        for longest, found in Counter(self.pattern.findall(word)).items():
+            for term in self.prefixes[longest]:
+                counts[term] = counts.get(term, 0) + found
+        for term in self.bordered.intersection(counts):
+            if counts[term] > 1:
+                counts[term] = word.count(term)
+
+        contributions = {}
+        for term, found in counts.items():
+            for slot, weight in self.weights.get(term, ()):
+                contributions[slot] = contributions.get(slot, 0) + weight * found
+        return tuple(contributions.items()), self.anchors.intersection(counts)
+
+    def scores(self, text):
+        """Puntaje de cada casilla para `text`"""
+        scores = [0] * self.size
+        if self.pattern is None:
+            return scores
+        memo = self._memo
+        if len(memo) > self.MAX_MEMO_WORDS:
+            memo.clear()
+
+        anchors = set()
+        for word, repeats in Counter(text.split()).items():
+            scanned = memo.get(word)
+            if scanned is None:
+                scanned = memo[word] = self._scan_word(word)
+            for slot, score in scanned[0]:
+                scores[slot] += score * repeats
+            if scanned[1]:
+                anchors.update(scanned[1])
+
+        for phrase, anchor in self.phrases:
+            if anchor in anchors:
+                found = text.count(phrase)
+                for slot, weight in self.weights.get(phrase, ()):
+                    scores[slot] += weight * found
+        return scores
+
+
+def _word_weights(text, multiplier=1):
+    """Peso por palabra (>3 letras) del temario: largo × repeticiones × multiplicador"""
+    weights = {}
+    for word in re.findall(r'\w+', text.lower()):
+        if len(word) > 3:
+            weights[word] = weights.get(word, 0) + len(word) * multiplier
+    return weights
+
+
+def _best(labels, scores):
+    """Primera etiqueta con el puntaje máximo (mismo desempate que max())"""
+    best_label, best_score = None, None
+    for label, slot in labels:
+        if best_score is None or scores[slot] > best_score:
+            best_label, best_score = label, scores[slot]
+    return best_label, best_score
+
+
+class QuestionCategorizer:
+    """
+    Tablas de palabras clave y del temario de una materia, compiladas una sola
+    vez en un TermScorer: cada pregunta se recorre una vez y de ahí salen
+    todos los puntajes (área, tema, subtema y respaldo sobre el temario
+    completo), cada uno en su propia casilla.
+    """
+
+    def __init__(self, relevant_entries, subject_code):
+        self.subject_code = subject_code
+        self.relevant_entries = relevant_entries
+        self._index = {}
+        self._slots = 0
+
+        # Áreas por palabras clave; las palabras repetidas en una lista suman
+        keywords = AREA_KEYWORDS.get(subject_code, {})
+        self.areas = [
+            (area, self._add_slot({keyword.lower(): 0 for keyword in area_keywords}, area_keywords))
+            for area, area_keywords in keywords.items()
+        ]
+
+        # Temas y subtemas por área: cada fila del temario suma su puntaje una vez
+        rows = {}
+        for entry in relevant_entries:
+            rows.setdefault(entry['area'], {}).setdefault(entry['theme'], []).append(entry['subtheme'])
+        self.themes = {
+            area: [
+                ((theme, [
+                    (subtheme, self._add_slot(_word_weights(subtheme, multiplier=subthemes.count(subtheme))))
+                    for subtheme in dict.fromkeys(subthemes)
+                ]), self._add_slot(_word_weights(theme, multiplier=len(subthemes))))
+                for theme, subthemes in themes.items()
+            ]
+            for area, themes in rows.items()
+        }
+        self.first_entry = {}
+        for entry in relevant_entries:
+            self.first_entry.setdefault(entry['area'], (entry['theme'], entry['subtheme']))
+
+        # Respaldo: todas las palabras de área, tema y subtema de cada fila
+        self.entries = [
+            (entry, self._add_slot(_word_weights(entry['area'] + " " + entry['theme'] + " " + entry['subtheme'])))
+            for entry in relevant_entries
+        ]
+
+        self.scorer = TermScorer(self._index, self._slots)
+
+    def _add_slot(self, weights, keywords=None):
+        """Registra una casilla de puntaje con sus pesos por término y devuelve su índice"""
+        slot = self._slots
+        self._slots += 1
+        if keywords is not None:
+            # Palabras clave: pesan su largo cada vez que aparecen en la lista
+            for keyword in keywords:
+                weights[keyword.lower()] += len(keyword)
+        for term, weight in weights.items():
+            self._index.setdefault(term, []).append((slot, weight))
+        return slot
+
+    def categorize(self, texto, alternativas):
+        """(área, tema, subtema) de una pregunta"""
+        subject_code = self.subject_code
+        best_area = "Unknown"
+        best_theme = "Unknown"
+        best_subtheme = "Unknown"
+
+        text = texto.lower() + " " + " ".join([alt.lower() for alt in alternativas])
+        scores = self.scorer.scores(text)
+
+        # Para Matemáticas, Historia y Química, usar palabras clave específicas
+        if subject_code in ["CQ", "H", "M1", "M2", "L"] and self.areas:
+            area, score = _best(self.areas, scores)
+            if score > 0:
+                best_area = area
+
+                # Buscar el tema y subtema más relevante para esta área
+                themes = self.themes.get(best_area)
+                if themes:
+                    (theme, subthemes), theme_score = _best(themes, scores)
+                    if theme_score > 0:
+                        best_theme = theme
+                        subtheme, subtheme_score = _best(subthemes, scores)
+                        if subthemes and subtheme_score > 0:
+                            best_subtheme = subtheme
+
+        # Si no se encontró un área con palabras clave, buscar en el temario completo
+        if best_area == "Unknown" and self.relevant_entries:
+            best_score = 0
+            for entry, slot in self.entries:
+                if scores[slot] > best_score:
+                    best_score = scores[slot]
+                    best_area = entry['area']
+                    best_theme = entry['theme']
+                    best_subtheme = entry['subtheme']
+
+        # Si todavía está sin categorizar y es matemáticas o lenguaje, intenta análisis secundario
+        if best_area == "Unknown" and subject_code in ["M1", "M2", "L"]:
+            analysis_result = analyze_question_content(text, subject_code)
+            if analysis_result != "Unknown":
+                best_area = analysis_result
+                # Tema/subtema apropiado para el área detectada: la primera fila del temario
+                if best_area in self.first_entry:
+                    best_theme, best_subtheme = self.first_entry[best_area]
+
+        # Para lenguaje, revisar una última vez si sigue sin categorizar
+        if best_area == "Unknown" and subject_code == "L":
+            # Si contiene texto largo es probable que sea interpretación
+            if len(text) > 500:
+                best_area = "Interpretar"
+            # Si tiene menos de 3 alternativas, probablemente es una pregunta de completar o localizar
+            elif len(alternativas) <= 3:
+                best_area = "Localizar"
+            # Si tiene las 4 alternativas con texto largo, probablemente es evaluación
+            elif all(len(alt) > 20 for alt in alternativas):
+                best_area = "Evaluar"
+            else:
+                # Por defecto, la mayoría de preguntas de lectura comprensiva son interpretación
+                best_area = "Interpretar"
+
+        # Para Lenguaje, siempre asignar temas y subtemas específicos basados en temario_paes_vf.csv
+        if subject_code == "L" and best_area in ("Evaluar", "Interpretar", "Localizar"):
+            if best_area == "Evaluar":
+                if QUALITY_WORDS.search(text):
+                    best_theme = "Juzgar la calidad y pertinencia de la informacion textual"
+                elif CONTEXT_WORDS.search(text):
+                    best_theme = "Valorar la informacion textual en relacion con nuevos contextos"
+                else:
+                    best_theme = "Determinar la intencion del emisor"
+            elif best_area == "Interpretar":
+                if CAUSE_WORDS.search(text):
+                    best_theme = "Establecer relaciones causa-efecto y problema-solucion"
+                elif SECTION_WORDS.search(text):
+                    best_theme = "Determinar el significado de un parrafo o seccion"
+                else:
+                    best_theme = "Sintetizar las ideas centrales del texto"
+            elif PARAPHRASE_WORDS.search(text):
+                best_theme = "Reconocer sinonimos y parafrasis en textos"
+            else:
+                best_theme = "Extraer informacion explicita de textos"
+
+            # Asignar subtema según tipo de texto (literario o no literario)
+            if LITERARY_WORDS.search(text):
+                best_subtheme = "en texto literario - narraciones"
+            else:
+                best_subtheme = "en texto no literario"
+
+        return best_area, best_theme, best_subtheme
+
+
+def analyze_question_content(text, subject_code):
+    """Análisis secundario del contenido para preguntas de Matemáticas y Lenguaje sin categoría"""
+
+    # Patrones comunes en preguntas de matemáticas
+    if subject_code in ["M1", "M2"]:
+        # Detectar patrones numéricos
+        if NUMERIC_EXPRESSION.search(text) or NUMERIC_OPERATION.search(text):
+            if POWER_OR_LOG.search(text):
+                return "Algebra y funciones"
+            if SHAPE_WORDS.search(text):
+                return "Geometria"
+            if STATISTICS_WORDS.search(text):
+                return "Probabilidad y Estadistica"
+            # Si hay números pero no hay otros indicadores claros
+            return "Numeros"
+
+        # Detectar patrones algebraicos
+        if ALGEBRAIC_EXPRESSION.search(text):
+            return "Algebra y funciones"
+
+        # Detectar patrones geométricos
+        if GEOMETRY_WORDS.search(text):
+            return "Geometria"
+
+        # Detectar patrones probabilísticos
+        if CHANCE_WORDS.search(text):
+            return "Probabilidad y Estadistica"
+
+    # Análisis de texto para preguntas de Lenguaje
+    elif subject_code == "L":
+        # Patrones para evaluar (requiere juicio crítico o valoración)
+        if EVALUATE_WORDS.search(text):
+            return "Evaluar"
+
+        # Patrones de textos literarios y análisis de textos que suelen ser de evaluación
+        if LITERARY_ANALYSIS_WORDS.search(text):
+            return "Evaluar"
+
+        # Patrones para interpretar (requiere comprensión o análisis)
+        if INTERPRET_WORDS.search(text):
+            return "Interpretar"
+
+        # Patrones típicos de comprensión lectora
+        if READING_WORDS.search(text):
+            return "Interpretar"
+
+        # Patrones para localizar (información explícita, reconocimiento)
+        if LOCATE_WORDS.search(text):
+            return "Localizar"
+
+        # Patrones de sinónimos o significado contextual (tarea de localización)
+        if SYNONYM_WORDS.search(text):
+            return "Localizar"
+
+        # Si el texto es muy largo, es probable que sea comprensión lectora
+        if len(text) > 100:
+            return "Interpretar"
+
+        # Si la pregunta es corta y directa
+        if len(text.split()) < 30 and re.search(r'\?', text):
+            return "Localizar"
+
+    return "Unknown"
+
+
+def _load_temario_index(temario_path):
+    """Índice compartido del temario (scripts/temario.py)"""
+    from temario import load_temario
+
+    return load_temario(temario_path)
+
+
+# Categorizadores ya compilados en este proceso, por (hash del temario, materia)
+_CATEGORIZERS = {}
+
+
+def get_categorizer(temario, subject_code):
+    """Categorizador de una materia, compilado la primera vez que se pide"""
+    key = (temario.sha256 if temario is not None else None, subject_code)
+    if key not in _CATEGORIZERS:
+        rows = temario.rows() if temario is not None else ()
+        relevant_entries = [
+            {'subject': subject, 'area': area, 'theme': theme, 'subtheme': subtheme}
+            for subject, area, theme, subtheme in rows
+            if subject.lower() == subject_code.lower()
+        ]
+        _CATEGORIZERS[key] = QuestionCategorizer(relevant_entries, subject_code)
+    return _CATEGORIZERS[key]
+
+
+# Categorizador de cada worker del pool
+_WORKER = {}
+
+
+def _init_categorizer_worker(temario_path, subject_code):
+    """Inicializador del pool: compila las tablas una sola vez por proceso"""
+    _WORKER["categorizer"] = get_categorizer(_load_temario_index(temario_path), subject_code)
+
+
+def _categorize_chunk(chunk):
+    categorizer = _WORKER["categorizer"]
+    return [categorizer.categorize(texto, alternativas) for texto, alternativas in chunk]
+
+
+def categorize_questions(questions, temario_path, subject_code, workers=None):
     """
     Categoriza una lista de preguntas basándose en el temario y palabras clave.
-    
+
     Args:
         questions: Lista de preguntas a categorizar
         temario_path: Ruta al archivo CSV del temario
         subject_code: Código de la materia (CB, CQ, CF, etc.)
-    
+        workers: Procesos para bancos grandes (desde PARALLEL_MIN_QUESTIONS
+            preguntas); None usa todos los núcleos y 1 desactiva el paralelismo
+
     Returns:
         La lista de preguntas categorizada
     """
-    import os
-    import csv
-    import re
-    
     # Usar el archivo temario_paes_vf.csv
     temario_path = os.path.join(os.path.dirname(temario_path), "temario_paes_vf.csv")
     print(f"Cargando temario desde: {temario_path}")
     print(f"El archivo existe: {os.path.exists(temario_path)}")
-    
+
     # Mapeo de códigos de materias a términos de búsqueda en el CSV
     subject_map = {
         "CB": "CB",
@@ -206,518 +633,71 @@ def categorize_questions(questions, temario_path, subject_code):
         "M1": "M1",
         "M2": "M2"
     }
-    
+
     search_term = subject_map.get(subject_code, subject_code)
-    
-    # Cargar temario desde CSV
-    temario_entries = []
+
+    # Cargar temario desde el índice compartido (scripts/temario.py)
     try:
-        # Primero intenta leer el archivo como texto para determinar el delimitador correcto
-        with open(temario_path, 'r', encoding='utf-8') as f:
-            sample = f.readline()
-            if ';' in sample:
-                delimiter = ';'
-            else:
-                delimiter = ','
-        
-        with open(temario_path, 'r', encoding='utf-8') as csvfile:
-            # Leer la primera línea para determinar la estructura
-            first_line = csvfile.readline().strip()
-            csv_reader = csv.reader([first_line], delimiter=delimiter)
-            header = next(csv_reader)
-            print(f"Cabecera: {header}")
-            
-            # Reiniciar el puntero del archivo
-            csvfile.seek(0)
-            csv_reader = csv.reader(csvfile, delimiter=delimiter)
-            next(csv_reader)  # Saltamos la cabecera
-            
-            for row in csv_reader:
-                if len(row) >= 4:  # Asegurar que hay suficientes campos
-                    subject, area, theme, subtheme = row[0], row[1], row[2], row[3]
-                    temario_entries.append({
-                        'subject': subject.strip(),
-                        'area': area.strip(),
-                        'theme': theme.strip(),
-                        'subtheme': subtheme.strip()
-                    })
+        temario = _load_temario_index(temario_path)
     except Exception as e:
         print(f"Error al cargar el temario: {e}")
-        temario_entries = []
-    
-    print(f"Temario cargado: {len(temario_entries)} entradas")
-    
-    # Filtrar entradas relevantes para la materia
-    relevant_entries = [entry for entry in temario_entries if search_term.lower() == entry['subject'].lower()]
+        temario = None
+
+    print(f"Temario cargado: {sum(1 for _ in temario.rows()) if temario else 0} entradas")
+
+    categorizer = get_categorizer(temario, search_term)
+    relevant_entries = categorizer.relevant_entries
     print(f"Entradas relevantes para {search_term}: {len(relevant_entries)}")
-    
+
     # Obtener las áreas temáticas disponibles para la materia
     thematic_areas = set(entry['area'] for entry in relevant_entries)
     print(f"Áreas para {search_term}: {thematic_areas}")
-    
-    # Para Historia y Química, reforzar con palabras clave específicas por área
-    keywords = {}
-    if subject_code == "CQ":
-        keywords = {
-            "Estructura atómica": [
-                "átomo", "protón", "neutrón", "electrón", "orbital", "modelo atómico", 
-                "bohr", "cuántico", "número atómico", "masa atómica", "isótopo",
-                "configuración electrónica", "nivel de energía", "capa", "subcapa",
-                "orbital", "spin", "tabla periódica", "grupo", "período", "metal",
-                "no metal", "gas noble", "elemento"
-            ],
-            "Enlaces químicos": [
-                "enlace", "covalente", "iónico", "metálico", "puente de hidrógeno",
-                "electronegatividad", "polar", "apolar", "dipolo", "molécular",
-                "lewis", "octet", "valencia", "par solitario", "hibridación"
-            ],
-            "Reacciones químicas": [
-                "reacción", "estequiometría", "mol", "reactivo", "producto", "rendimiento",
-                "limitante", "exceso", "balance", "oxidación", "reducción", "redox", 
-                "neutralización", "ácido", "base", "sal", "precipitación", "combustión",
-                "síntesis", "descomposición", "intercambio", "equilibrio", "constante",
-                "le chatelier", "concentración", "presión", "temperatura", "catalizador"
-            ],
-            "Química orgánica": [
-                "orgánico", "carbono", "hidrocarburo", "alcano", "alqueno", "alquino",
-                "aromático", "benceno", "alcohol", "fenol", "éter", "aldehído", "cetona",
-                "ácido carboxílico", "éster", "amina", "amida", "funcional", "isomería",
-                "nomenclatura", "iupac", "saturado", "insaturado"
-            ]
-        }
-    elif subject_code == "H":
-        # Usar solamente las áreas oficiales del temario actualizado
-        keywords = {
-            "Historia": [
-                "chile", "chileno", "chilena", "colonia", "colonial", "independencia", 
-                "república", "constitución", "guerra del pacífico", "parlamentarismo", 
-                "alessandri", "ibáñez", "allende", "pinochet", "concertación", "dictadura",
-                "democracia", "transición", "frente popular", "unidad popular", "golpe de estado",
-                "reforma agraria", "nacionalización", "privatización", "antigüedad", "edad media", 
-                "edad moderna", "edad contemporánea", "grecia", "roma", "imperio", 
-                "revolución francesa", "revolución industrial", "mundial", "ilustración", 
-                "guerra fría", "holocausto", "nazismo", "fascismo", "comunismo",
-                "capitalismo", "feudalismo", "absolutismo", "imperialismo", "colonialismo",
-                "descolonización", "revolución rusa", "primera guerra", "segunda guerra",
-                "siglo XIX", "siglo XX"
-            ],
-            "Formacion Ciudadana": [
-                "ciudadanía", "democracia", "constitución", "derechos humanos", "derechos fundamentales",
-                "participación", "representatividad", "votación", "sufragio", "elecciones",
-                "instituciones", "estado", "gobierno", "poderes del estado", "ejecutivo", 
-                "legislativo", "judicial", "tecnología", "medios de comunicación", "redes sociales",
-                "libertad de expresión", "diversidad", "inclusión", "pluralismo", "tolerancia",
-                "bien común", "ley", "norma", "justicia"
-            ],
-            "Sistema Economico": [
-                "economía", "mercado", "oferta", "demanda", "precio", "consumo", "producción",
-                "bienes", "servicios", "factores productivos", "capital", "trabajo", "recursos",
-                "empresa", "industria", "comercio", "importación", "exportación", "aranceles",
-                "impuestos", "subsidios", "inflación", "deflación", "producto interno bruto",
-                "crecimiento económico", "desarrollo económico", "crisis", "recesión", "bancos",
-                "créditos", "interés", "globalización", "neoliberalismo", "libre mercado"
-            ]
-        }
-    elif subject_code == "L":
-        # Áreas del temario correcto para Lenguaje según temario_paes_vf.csv
-        keywords = {
-            "Evaluar": [
-                "evaluar", "evalúa", "crítica", "crítico", "juzgar", "valorar", "apreciar", "calidad", "pertinencia", 
-                "información", "intención", "emisor", "propósito", "objetivo", "punto de vista", "perspectiva", 
-                "opinión", "argumentos", "credibilidad", "validez", "juicio", "justificar", "criterios", 
-                "convencer", "persuadir", "postura", "sesgo", "subjetividad", "objetividad", "veracidad", 
-                "confiabilidad", "fundamentar", "sostener", "evidencia", "noticia", "artículo", "editorial",
-                "ensayo", "columna", "reseña", "informe", "manual", "instructivo", "expositivo", "argumentativo",
-                "obra", "literaria", "poema", "cuento", "novela", "narrativo", "lírico", "dramático", "personaje",
-                "narrador", "autor", "poeta", "dramaturgo", "literatura"
-            ],
-            "Interpretar": [
-                "interpretar", "interpreta", "comprender", "comprensión", "significado", "sentido", "idea central", 
-                "tema", "mensaje", "global", "sintetizar", "resumir", "establecer", "relación", "relaciones", 
-                "causa", "efecto", "problema", "solución", "comparación", "contraste", "secuencia", "párrafo", 
-                "sección", "fragmento", "pasaje", "contextualizar", "implícito", "explícito", "inferir", "inferencia", 
-                "deducir", "conclusión", "generalización", "específico", "detalle", "concepto", "definición",
-                "obra", "literaria", "poema", "cuento", "novela", "narrativo", "lírico", "dramático", "personaje",
-                "narrador", "autor", "poeta", "dramaturgo", "literatura"
-            ],
-            "Localizar": [
-                "localizar", "localiza", "identificar", "identifica", "información", "explícita", "reconocer", 
-                "reconocimiento", "extraer", "dato", "nombres", "fechas", "lugares", "hechos", "cifras", "palabras clave", 
-                "sinónimos", "paráfrasis", "equivalente", "significado", "buscar", "encontrar", "ubicar", "datos", 
-                "evidencia", "elementos", "textual", "literal", "directo", "mencionado", "citado", "expuesto", 
-                "presentado", "escrito", "explícito", "obra", "literaria", "poema", "cuento", "novela", "narrativo"
-            ]
-        }
-    elif subject_code == "M1":
-        # Áreas del temario actualizado para M1 con palabras clave ampliadas
-        keywords = {
-            "Algebra": [
-                "ecuación", "lineal", "sistemas", "inecuaciones", "fórmula", "expresión algebraica",
-                "factorización", "productos notables", "binomio", "trinomio", "monomio", "polinomio",
-                "variable", "término", "coeficiente", "resolución", "álgebra", "factor", "factorizar",
-                "combinación", "permutación", "operatoria", "símbolos", "operaciones", "signo",
-                "valor", "solución", "desarrolla", "simplifica", "sustituye", "reducir", "términos semejantes",
-                "distributiva", "ax+b", "cuadrado", "paréntesis", "corchetes", "incógnita", "resolución", 
-                "evalúa"
-            ],
-            "Algebra y funciones": [
-                "función", "ecuación", "inecuación", "proporcionalidad", "gráfico", "coordenadas", 
-                "pendiente", "ejes", "intercepto", "dominio", "recorrido", "imagen", "lineal", 
-                "cuadrático", "exponencial", "logarítmico", "creciente", "decreciente", "directa", 
-                "inversa", "plano cartesiano", "variable", "escala", "mapas", "f(x)", "g(x)", "y=",
-                "función", "evaluación", "gráfico", "tabla", "proporcional", "relación", "dependiente", 
-                "independiente", "abscisa", "ordenada", "par ordenado", "punto", "xey", "recta", 
-                "línea", "curva", "parábola", "exponencial", "correspondencia", "regla", "fórmula",
-                "asíntota", "intervalo", "graficar"
-            ],
-            "Estadistica": [
-                "probabilidad", "estadística", "condicional", "simple", "muestra", "población", 
-                "evento", "espacio muestral", "variable aleatoria", "experimento", "frecuencia", 
-                "resultado", "azar", "dado", "baraja", "extracción", "urna", "diagrama", "árbol", 
-                "combinatoria", "factorial", "permutación", "conjunto", "independiente", "dependiente",
-                "caso", "favorable", "total", "laplace", "moneda", "carta", "naipe", "bola", "bolita", 
-                "aleatorio", "equiprobable", "ley de laplace", "probabilidades", "casos", "ocurrir", 
-                "azar", "suceso", "eventos", "posibilidad"
-            ],
-            "Geometria": [
-                "geometría", "triángulo", "cuadrado", "rectángulo", "polígono", "circunferencia", 
-                "círculo", "ángulo", "lado", "vértice", "perímetro", "área", "volumen", "prisma", 
-                "cilindro", "cuerpo", "sólido", "teorema", "pitagórico", "pitagoras", "cateto", 
-                "hipotenusa", "trigonometría", "seno", "coseno", "tangente", "figura", "plano", 
-                "espacio", "superficie", "altura", "base", "diagonal", "radio", "diámetro", "semejanza", 
-                "congruencia", "paralelo", "perpendicular", "cubo", "esfera", "cono", "paralelogramo", 
-                "trapecio", "rombo", "sector", "segmento", "arco", "isósceles", "equilátero", 
-                "escaleno", "rectángulo", "obtusángulo", "acutángulo", "complementario", "suplementario"
-            ],
-            "Numeros": [
-                "número", "entero", "racional", "decimal", "fracción", "potencia", "raíz", "porcentaje", 
-                "operación", "suma", "resta", "multiplicación", "división", "positivo", "negativo", 
-                "factor", "múltiplo", "divisor", "orden", "comparación", "enésimo", "natural", "cálculo", 
-                "interés", "descuento", "comercial", "numerador", "denominador", "equivalente", 
-                "irreducible", "simplificar", "amplificar", "mixto", "impropio", "numérico", "valor", 
-                "mayor", "menor", "igual", "distinto", "comparar", "ordenar", "sumar", "restar", 
-                "multiplicar", "dividir", "potencia", "base", "exponente", "radical", "índice", 
-                "radicando", "aproximar", "redondear", "truncar", "calcular", "resolver"
-            ],
-            "Probabilidad y Estadistica": [
-                "media", "mediana", "moda", "medida", "tendencia", "central", "dispersión", "dato", 
-                "gráfico", "tabla", "representación", "frecuencia", "absoluta", "relativa", "acumulada", 
-                "histograma", "polígono", "barras", "circular", "porcentaje", "distribución", "varianza", 
-                "desviación", "estándar", "cuartil", "percentil", "población", "muestra", "estadístico", 
-                "parámetro", "clase", "intervalo", "amplitud", "encuesta", "censo", "promedio", "rango", 
-                "media aritmética", "ponderada", "conjunto", "datos", "variable", "cualitativa", "cuantitativa", 
-                "discreta", "continua", "muestreo", "representativo", "conclusión", "análisis"
-            ]
-        }
-    elif subject_code == "M2":
-        # Áreas del temario actualizado para M2 con palabras clave ampliadas
-        keywords = {
-            "Algebra y funciones": [
-                "ecuación", "segundo grado", "cuadrática", "parábola", "vértice", "concavidad", 
-                "discriminante", "raíces", "sistemas", "solución", "físico", "modelamiento", 
-                "gráfico", "intersección", "único", "infinitas", "lineal", "recta", "múltiple",
-                "eje", "coordenada", "función", "evaluar", "valor", "dominio", "recorrido", "imagen", 
-                "preimagen", "compuesta", "inversa", "creciente", "decreciente", "máximo", "mínimo", 
-                "constante", "pendiente", "intercepto", "ecuación", "sistema", "sustitución", "igualación", 
-                "reducción", "combinación", "gauss", "matriz", "determinante", "cramer", "eliminación"
-            ],
-            "Geometria": [
-                "homotecia", "transformación", "ampliación", "reducción", "centro", "factor", 
-                "plano", "cartesiano", "similar", "proporcional", "razón", "figuras", "semejanza", 
-                "trigonometría", "seno", "coseno", "tangente", "triángulo", "rectángulo", "navegación", 
-                "ángulo", "altura", "distancia", "vector", "traslación", "rotación", "reflexión", 
-                "simetría", "composición", "transformación", "isometría", "congruencia", "eje", 
-                "punto", "origen", "imagen", "plano", "espacio", "coordenada", "proyección", "teorema", 
-                "razón", "proporción", "semejanza", "congruencia", "tales", "segmento", "paralelo", 
-                "transversal", "secante", "lado", "ángulos", "lados", "vértices", "inscrito", "circunscrito"
-            ],
-            "Numeros": [
-                "real", "conjunto", "operaciones", "radical", "fracción", "decimal", "logaritmo", 
-                "exponencial", "crecimiento", "base", "propiedades", "matemática", "financiera", 
-                "interés", "crédito", "inversión", "tasa", "capital", "simple", "compuesto", "anualidad",
-                "irracional", "racional", "entero", "natural", "número", "propiedad", "intervalo", 
-                "desigualdad", "orden", "recta", "numérica", "pertenece", "pertenencia", "inclusión", 
-                "subconjunto", "unión", "intersección", "complemento", "diferencia", "operación", 
-                "aritmética", "logaritmo", "exponencial", "potencia", "raíz", "radical", "aplicación", 
-                "capitalizar", "amortización", "valor futuro", "valor presente", "tasa", "capital"
-            ],
-            "Probabilidad y Estadistica": [
-                "dispersión", "variabilidad", "rango", "desviación", "estándar", "varianza", 
-                "cuartil", "percentil", "análisis", "probabilidad", "condicional", "bayes", 
-                "independencia", "toma", "decisión", "riesgo", "análisis", "árbol", "diagrama", 
-                "contingencia", "tabla", "distribución", "normal", "binomial", "estándar", "media", 
-                "esperanza", "dispersión", "varianza", "desviación", "coeficiente", "correlación", 
-                "regresión", "línea", "ajuste", "tendencia", "proyección", "predicción", "inferencia", 
-                "hipótesis", "contraste", "significativo", "nivel", "confianza", "error", "muestra", 
-                "población", "parámetro", "estadístico", "aleatorio", "frecuencia", "relativa", "absoluta", 
-                "acumulada", "histograma", "margen", "error", "estadística", "descriptiva", "inferencial"
-            ]
-        }
-    
+
     # Contar preguntas por categoría
     category_counts = {"Unknown": 0}
     for area in thematic_areas:
         category_counts[area] = 0
-    
+
     # Si no hay áreas definidas en el temario para Historia, usar las áreas oficiales
     if subject_code == "H" and (not thematic_areas or len(thematic_areas) < 3):
         thematic_areas = {"Historia", "Formacion Ciudadana", "Sistema Economico"}
         for area in thematic_areas:
             if area not in category_counts:
                 category_counts[area] = 0
-    
-    # Análisis secundario para casos no categorizados en matemáticas
-    def analyze_mathematical_content(text, subject_code):
-        """Función adicional para analizar el contenido matemático y asignar categoría"""
-        
-        # Patrones comunes en preguntas de matemáticas
-        if subject_code in ["M1", "M2"]:
-            # Detectar patrones numéricos
-            if re.search(r'[\d\+\-\*\/\^\=\(\)\[\]\{\}]{5,}', text) or re.search(r'\d+\s*[\+\-\*\/]\s*\d+', text):
-                if re.search(r'x\s*\^', text) or re.search(r'logaritmo', text) or re.search(r'log', text) or re.search(r'exponencial', text):
-                    return "Algebra y funciones"
-                
-                if re.search(r'triángulo|círculo|cuadrado|rectángulo|perímetro|área|volumen', text, re.IGNORECASE):
-                    return "Geometria"
-                    
-                if re.search(r'probabilidad|frecuencia|porcentaje|estadística|promedio|media|mediana|moda', text, re.IGNORECASE):
-                    return "Probabilidad y Estadistica"
-                    
-                # Si hay números pero no hay otros indicadores claros
-                return "Numeros"
-                
-            # Detectar patrones algebraicos
-            if re.search(r'[a-zA-Z]\s*[\+\-\*\/\=]\s*[a-zA-Z0-9]', text) or re.search(r'[a-zA-Z]\(\s*[a-zA-Z0-9\+\-\*\/\s]*\)', text):
-                return "Algebra y funciones"
-                
-            # Detectar patrones geométricos
-            if re.search(r'dibujo|figura|punto|recta|plano|ángulo|triángulo|cuadrado|círculo', text, re.IGNORECASE):
-                return "Geometria"
-                
-            # Detectar patrones probabilísticos
-            if re.search(r'azar|aleatorio|dado|moneda|baraja|carta|probabilidad|estadística', text, re.IGNORECASE):
-                return "Probabilidad y Estadistica"
-        
-        # Análisis de texto para preguntas de Lenguaje
-        elif subject_code == "L":
-            # Detectar si es un texto literario o no literario
-            is_literary = False
-            if re.search(r'poet|novel|cuent|narr|liter|personaje|dramát|líric|épic|estrofa|verso|rima|métrica|soneto', text, re.IGNORECASE):
-                is_literary = True
-
-            # Patrones para evaluar (requiere juicio crítico o valoración)
-            if re.search(r'evalu|juzg|valid|opin|argumen|postur|críti|valor|propósito|intenci|objetivo|punto de vista', text, re.IGNORECASE):
-                return "Evaluar"
-            
-            # Patrones de textos literarios y análisis de textos que suelen ser de evaluación
-            if re.search(r'autor|narrador|obra|literari|poema|cuento|novela|ensayo|editorial', text, re.IGNORECASE):
-                return "Evaluar"
-            
-            # Patrones para interpretar (requiere comprensión o análisis)
-            if re.search(r'interpret|signific|comprend|sentido|idea|mensaje|sinteti|relaci|proble|soluci|compara|contrast|inferir|deduci|conclu', text, re.IGNORECASE):
-                return "Interpretar"
-            
-            # Patrones típicos de comprensión lectora
-            if re.search(r'según el texto|de acuerdo|lectura|fragmento|párrafo|pasaje', text, re.IGNORECASE):
-                return "Interpretar"
-            
-            # Patrones para localizar (información explícita, reconocimiento)
-            if re.search(r'identific|reconoc|extraer|dato|explícit|menciona|indica|dice|señala|afirma', text, re.IGNORECASE):
-                return "Localizar"
-            
-            # Patrones de sinónimos o significado contextual (tarea de localización)
-            if re.search(r'sinónim|significado|reemplazar|sustituir|palabra', text, re.IGNORECASE):
-                return "Localizar"
-            
-            # Si el texto es muy largo, es probable que sea comprensión lectora
-            if len(text) > 100:
-                return "Interpretar"
-            
-            # Si la pregunta es corta y directa
-            if len(text.split()) < 30 and re.search(r'\?', text):
-                return "Localizar"
-        
-        return "Unknown"
-    
-    # Categorizar cada pregunta
-    for question in questions:
-        best_area = "Unknown"
-        best_theme = "Unknown"
-        best_subtheme = "Unknown"
-        best_score = 0
-        
-        text = question["texto"].lower() + " " + " ".join([alt.lower() for alt in question["alternativas"]])
-        
-        # Para Matemáticas, Historia y Química, usar palabras clave específicas
-        if (subject_code in ["CQ", "H", "M1", "M2", "L"]) and keywords:
-            area_scores = {}
-            for area, area_keywords in keywords.items():
-                score = 0
-                for keyword in area_keywords:
-                    if keyword.lower() in text:
-                        # Mayor peso para palabras clave más específicas o largas
-                        score += len(keyword) * text.count(keyword.lower())
-                area_scores[area] = score
-            
-            # Encontrar el área con mayor puntaje
-            if area_scores:
-                max_score_area = max(area_scores.items(), key=lambda x: x[1])
-                if max_score_area[1] > 0:
-                    best_area = max_score_area[0]
-                    
-                    # Buscar el tema y subtema más relevante para esta área
-                    area_entries = [e for e in relevant_entries if e['area'] == best_area]
-                    if area_entries:
-                        theme_scores = {}
-                        for entry in area_entries:
-                            theme = entry['theme']
-                            if theme not in theme_scores:
-                                theme_scores[theme] = 0
-                            
-                            # Calcular puntaje basado en coincidencias de palabras clave
-                            for word in re.findall(r'\w+', theme.lower()):
-                                if len(word) > 3 and word in text:
-                                    theme_scores[theme] += text.count(word) * len(word)
-                        
-                        # Elegir el tema con mayor puntaje
-                        if theme_scores and max(theme_scores.values()) > 0:
-                            best_theme = max(theme_scores.items(), key=lambda x: x[1])[0]
-                            
-                            # Buscar el subtema más relevante para este tema
-                            theme_entries = [e for e in area_entries if e['theme'] == best_theme]
-                            if theme_entries:
-                                subtheme_scores = {}
-                                for entry in theme_entries:
-                                    subtheme = entry['subtheme']
-                                    if subtheme not in subtheme_scores:
-                                        subtheme_scores[subtheme] = 0
-                                    
-                                    for word in re.findall(r'\w+', subtheme.lower()):
-                                        if len(word) > 3 and word in text:
-                                            subtheme_scores[subtheme] += text.count(word) * len(word)
-                                
-                                if subtheme_scores and max(subtheme_scores.values()) > 0:
-                                    best_subtheme = max(subtheme_scores.items(), key=lambda x: x[1])[0]
-        
-        # Si no se encontró un área con palabras clave, buscar en el temario completo
-        if best_area == "Unknown" and relevant_entries:
-            # Buscar por coincidencia con palabras clave en el texto
-            for entry in relevant_entries:
-                area = entry['area']
-                theme = entry['theme']
-                subtheme = entry['subtheme']
-                
-                score = 0
-                
-                # Contar coincidencias de palabras clave
-                for word in re.findall(r'\w+', area.lower() + " " + theme.lower() + " " + subtheme.lower()):
-                    if len(word) > 3 and word in text:
-                        score += text.count(word) * len(word)
-                
-                if score > best_score:
-                    best_score = score
-                    best_area = area
-                    best_theme = theme
-                    best_subtheme = subtheme
-                    
-        # Si todavía está sin categorizar y es matemáticas o lenguaje, intenta análisis secundario
-        if best_area == "Unknown" and (subject_code in ["M1", "M2", "L"]):
-            analysis_result = analyze_mathematical_content(text, subject_code)
-            if analysis_result != "Unknown":
-                best_area = analysis_result
-                # Buscar un tema/subtema apropiado para el área detectada
-                area_entries = [e for e in relevant_entries if e['area'] == best_area]
-                if area_entries:
-                    best_theme = area_entries[0]['theme']
-                    best_subtheme = area_entries[0]['subtheme']
-                
-        # Para lenguaje, revisar una última vez si sigue sin categorizar
-        if best_area == "Unknown" and subject_code == "L":
-            # Detectar si es un texto literario o no literario
-            is_literary = False
-            if re.search(r'poet|novel|cuent|narr|liter|personaje|dramát|líric|épic|estrofa|verso|rima|métrica|soneto', text, re.IGNORECASE):
-                is_literary = True
-            
-            # Si contiene texto largo es probable que sea interpretación
-            if len(text) > 500:
-                best_area = "Interpretar"
-            # Si tiene menos de 3 alternativas, probablemente es una pregunta de completar o localizar
-            elif len(question["alternativas"]) <= 3:
-                best_area = "Localizar"
-            # Si tiene las 4 alternativas con texto largo, probablemente es evaluación
-            elif all(len(alt) > 20 for alt in question["alternativas"]):
-                best_area = "Evaluar"
-            else:
-                # Por defecto, la mayoría de preguntas de lectura comprensiva son interpretación
-                best_area = "Interpretar"
-        
-        # Para Lenguaje, siempre asignar temas y subtemas específicos basados en temario_paes_vf.csv
-        if subject_code == "L":
-            # Detectar si es literario o no literario para asignar el subtema correcto
-            is_literary = False
-            if re.search(r'poet|novel|cuent|narr|liter|personaje|dramát|líric|épic|estrofa|verso|rima|métrica|soneto', text, re.IGNORECASE):
-                is_literary = True
-                
-            # Asignar temas específicos según el área detectada y temario
-            if best_area == "Evaluar":
-                # Buscar pistas para asignar el tema correcto
-                if re.search(r'calidad|pertinencia|releva|exactitud|validez', text, re.IGNORECASE):
-                    best_theme = "Juzgar la calidad y pertinencia de la informacion textual"
-                elif re.search(r'contexto|nuevo|aplicar|relacionar|extrapolar|situacion', text, re.IGNORECASE):
-                    best_theme = "Valorar la informacion textual en relacion con nuevos contextos"
-                else:
-                    best_theme = "Determinar la intencion del emisor"
-                
-                # Asignar subtema según tipo de texto
-                if is_literary:
-                    best_subtheme = "en texto literario - narraciones"
-                else:
-                    best_subtheme = "en texto no literario"
-                    
-            elif best_area == "Interpretar":
-                # Buscar pistas para asignar el tema correcto
-                if re.search(r'causa|efecto|problema|solucion|resulta|consecuencia', text, re.IGNORECASE):
-                    best_theme = "Establecer relaciones causa-efecto y problema-solucion"
-                elif re.search(r'parrafo|seccion|fragmen|pasaje|parte|apartado', text, re.IGNORECASE):
-                    best_theme = "Determinar el significado de un parrafo o seccion"
-                else:
-                    best_theme = "Sintetizar las ideas centrales del texto"
-                
-                # Asignar subtema según tipo de texto
-                if is_literary:
-                    best_subtheme = "en texto literario - narraciones"
-                else:
-                    best_subtheme = "en texto no literario"
-                    
-            elif best_area == "Localizar":
-                # Buscar pistas para asignar el tema correcto
-                if re.search(r'sinonimo|parafrasis|signif|equivale|reemplaz|sustituir', text, re.IGNORECASE):
-                    best_theme = "Reconocer sinonimos y parafrasis en textos"
-                else:
-                    best_theme = "Extraer informacion explicita de textos"
-                
-                # Asignar subtema según tipo de texto
-                if is_literary:
-                    best_subtheme = "en texto literario - narraciones"
-                else:
-                    best_subtheme = "en texto no literario"
-        
+
+    # Categorizar cada pregunta (en paralelo para bancos grandes)
+    items = [(question["texto"], question["alternativas"]) for question in questions]
+    workers = workers or os.cpu_count() or 1
+    if workers > 1 and len(items) >= PARALLEL_MIN_QUESTIONS and temario is not None:
+        from concurrent.futures import ProcessPoolExecutor
+
+        chunks = [items[start:start + PARALLEL_CHUNK_SIZE] for start in range(0, len(items), PARALLEL_CHUNK_SIZE)]
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_categorizer_worker,
+            initargs=(temario_path, search_term),
+        ) as pool:
+            labels = [label for chunk_labels in pool.map(_categorize_chunk, chunks) for label in chunk_labels]
+    else:
+        labels = [categorizer.categorize(texto, alternativas) for texto, alternativas in items]
+
+    for question, (best_area, best_theme, best_subtheme) in zip(questions, labels):
         # Asignar categorías a la pregunta
         question["area_tematica"] = best_area
         question["tema"] = best_theme
         question["subtema"] = best_subtheme
-        
+
         # Incrementar contador
         if best_area in category_counts:
             category_counts[best_area] += 1
         else:
             category_counts[best_area] = 1
-    
+
     # Mostrar estadísticas de categorización
     print("Estadísticas de categorización:")
     for category, count in sorted(category_counts.items()):
         print(f"- {category}: {count} preguntas")
-    
+
     return questions
 
 # Step 3: Assign difficulty levels
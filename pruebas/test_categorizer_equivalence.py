@@ -0,0 +1,264 @@
+#!/usr/bin/env python
+"""
+Equivalencia del categorizador compilado del banco de preguntas
+===============================================================
+
+`QuestionCategorizer` (un solo recorrido con `TermScorer`) debe asignar
+exactamente las mismas etiquetas que el `categorize_questions` original, que
+recorría las palabras clave y el temario con `in` y `str.count` pregunta a
+pregunta. `_reference_categorize` reproduce esa lógica original tal cual y se
+compara contra el banco real de M2 (data/m2_question_bank_completo.json) y
+contra preguntas de Lenguaje y Química pensadas para los casos borde
+(subcadenas, tildes, palabras repetidas en las tablas).
+
+Uso:
+    python pruebas/test_categorizer_equivalence.py
+    (o `python -m pytest pruebas/test_categorizer_equivalence.py`)
+"""
+
+import re
+import sys
+import json
+import copy
+from pathlib import Path
+
+PRUEBAS_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = PRUEBAS_DIR.parent
+for path in (PRUEBAS_DIR, PROJECT_ROOT / "scripts"):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+import build_paes_questions_bank as bank  # noqa: E402
+from paes_keywords import AREA_KEYWORDS  # noqa: E402
+
+TEMARIO = PRUEBAS_DIR / "temario_paes_vf.csv"
+M2_BANK = PROJECT_ROOT / "data" / "m2_question_bank_completo.json"
+
+LENGUAJE_FIXTURES = [
+    ("¿Cuál es la solucion propuesta por el autor?", ["A) Ninguna", "B) Una", "C) Dos", "D) Tres"]),
+    ("¿Qué función cumple el parrafo 3 en el texto?", ["A) Ejemplifica", "B) Concluye", "C) Introduce", "D) Refuta"]),
+    ("¿Qué función cumple el párrafo 3 en el texto?", ["A) Ejemplifica", "B) Concluye", "C) Introduce", "D) Refuta"]),
+    ("¿Cómo se relaciona la situación descrita con la situacion actual?", ["A) Sí", "B) No", "C) A veces"]),
+    ("¿Qué significó la nueva ley para los trabajadores?", ["A) Más derechos", "B) Menos derechos"]),
+    ("En el contexto del fragmento, ¿qué palabra admite el reemplazo de 'ardid'?", ["A) truco", "B) plan", "C) idea", "D) meta"]),
+    ("Los datos que relevan los investigadores indican que", ["A) aumentó", "B) disminuyó", "C) se mantuvo", "D) no se sabe"]),
+    ("El narrador del cuento evalúa la postura del personaje", ["A) con ironía", "B) con pena", "C) con rabia", "D) sin juicio"]),
+    ("Según el texto, ¿qué afirma el emisor sobre la validez del estudio?", ["A) Es válido", "B) No lo es"]),
+    ("¿Cuál es el sinónimo contextual de la palabra destacada?", ["A) grande", "B) chico", "C) mediano", "D) enorme"]),
+    ("¿?", ["A)", "B)"]),
+    ("x" * 600, ["A) uno", "B) dos", "C) tres", "D) cuatro"]),
+    ("Pregunta breve sin pistas", ["A) una alternativa bastante larga", "B) otra alternativa bastante larga",
+                                   "C) tercera alternativa bastante larga", "D) cuarta alternativa bastante larga"]),
+]
+
+QUIMICA_FIXTURES = [
+    ("Según la regla del octeto, ¿cuántos electrones de valencia tiene el átomo?", ["A) 2", "B) 4", "C) 6", "D) 8"]),
+    ("La geometría molecular del agua es", ["A) lineal", "B) angular", "C) trigonal", "D) tetraédrica"]),
+    ("La masa molécular y la regla del octet en compuestos iónicos", ["A) sí", "B) no"]),
+    ("¿Cuál es el número atómico y la configuración electrónica del sodio?", ["A) 11", "B) 12", "C) 10", "D) 23"]),
+    ("En la reacción química se conserva la masa: estequiometría de reactivos y productos", ["A) 1", "B) 2"]),
+    ("El pH de una disolución ácida y la concentración molar del soluto", ["A) 3", "B) 7", "C) 9", "D) 12"]),
+    ("Los hidrocarburos, alcanos y grupos funcionales de la química orgánica", ["A) C", "B) H"]),
+    ("Pregunta sin palabras clave", ["A) uno", "B) dos"]),
+]
+
+
+def _reference_analyze(text, subject_code):
+    """`analyze_mathematical_content` del categorizador original"""
+    if subject_code in ["M1", "M2"]:
+        if re.search(r'[\d\+\-\*\/\^\=\(\)\[\]\{\}]{5,}', text) or re.search(r'\d+\s*[\+\-\*\/]\s*\d+', text):
+            if re.search(r'x\s*\^', text) or re.search(r'logaritmo', text) or re.search(r'log', text) or re.search(r'exponencial', text):
+                return "Algebra y funciones"
+            if re.search(r'triángulo|círculo|cuadrado|rectángulo|perímetro|área|volumen', text, re.IGNORECASE):
+                return "Geometria"
+            if re.search(r'probabilidad|frecuencia|porcentaje|estadística|promedio|media|mediana|moda', text, re.IGNORECASE):
+                return "Probabilidad y Estadistica"
+            return "Numeros"
+        if re.search(r'[a-zA-Z]\s*[\+\-\*\/\=]\s*[a-zA-Z0-9]', text) or re.search(r'[a-zA-Z]\(\s*[a-zA-Z0-9\+\-\*\/\s]*\)', text):
+            return "Algebra y funciones"
+        if re.search(r'dibujo|figura|punto|recta|plano|ángulo|triángulo|cuadrado|círculo', text, re.IGNORECASE):
+            return "Geometria"
+        if re.search(r'azar|aleatorio|dado|moneda|baraja|carta|probabilidad|estadística', text, re.IGNORECASE):
+            return "Probabilidad y Estadistica"
+    elif subject_code == "L":
+        if re.search(r'evalu|juzg|valid|opin|argumen|postur|críti|valor|propósito|intenci|objetivo|punto de vista', text, re.IGNORECASE):
+            return "Evaluar"
+        if re.search(r'autor|narrador|obra|literari|poema|cuento|novela|ensayo|editorial', text, re.IGNORECASE):
+            return "Evaluar"
+        if re.search(r'interpret|signific|comprend|sentido|idea|mensaje|sinteti|relaci|proble|soluci|compara|contrast|inferir|deduci|conclu', text, re.IGNORECASE):
+            return "Interpretar"
+        if re.search(r'según el texto|de acuerdo|lectura|fragmento|párrafo|pasaje', text, re.IGNORECASE):
+            return "Interpretar"
+        if re.search(r'identific|reconoc|extraer|dato|explícit|menciona|indica|dice|señala|afirma', text, re.IGNORECASE):
+            return "Localizar"
+        if re.search(r'sinónim|significado|reemplazar|sustituir|palabra', text, re.IGNORECASE):
+            return "Localizar"
+        if len(text) > 100:
+            return "Interpretar"
+        if len(text.split()) < 30 and re.search(r'\?', text):
+            return "Localizar"
+    return "Unknown"
+
+
+def _reference_categorize(question, relevant_entries, subject_code):
+    """Bucle por pregunta del `categorize_questions` original, sin cambios de lógica"""
+    keywords = AREA_KEYWORDS.get(subject_code, {})
+    best_area = "Unknown"
+    best_theme = "Unknown"
+    best_subtheme = "Unknown"
+    best_score = 0
+
+    text = question["texto"].lower() + " " + " ".join([alt.lower() for alt in question["alternativas"]])
+
+    if (subject_code in ["CQ", "H", "M1", "M2", "L"]) and keywords:
+        area_scores = {}
+        for area, area_keywords in keywords.items():
+            score = 0
+            for keyword in area_keywords:
+                if keyword.lower() in text:
+                    score += len(keyword) * text.count(keyword.lower())
+            area_scores[area] = score
+
+        if area_scores:
+            max_score_area = max(area_scores.items(), key=lambda x: x[1])
+            if max_score_area[1] > 0:
+                best_area = max_score_area[0]
+                area_entries = [e for e in relevant_entries if e['area'] == best_area]
+                if area_entries:
+                    theme_scores = {}
+                    for entry in area_entries:
+                        theme = entry['theme']
+                        if theme not in theme_scores:
+                            theme_scores[theme] = 0
+                        for word in re.findall(r'\w+', theme.lower()):
+                            if len(word) > 3 and word in text:
+                                theme_scores[theme] += text.count(word) * len(word)
+
+                    if theme_scores and max(theme_scores.values()) > 0:
+                        best_theme = max(theme_scores.items(), key=lambda x: x[1])[0]
+                        theme_entries = [e for e in area_entries if e['theme'] == best_theme]
+                        if theme_entries:
+                            subtheme_scores = {}
+                            for entry in theme_entries:
+                                subtheme = entry['subtheme']
+                                if subtheme not in subtheme_scores:
+                                    subtheme_scores[subtheme] = 0
+                                for word in re.findall(r'\w+', subtheme.lower()):
+                                    if len(word) > 3 and word in text:
+                                        subtheme_scores[subtheme] += text.count(word) * len(word)
+
+                            if subtheme_scores and max(subtheme_scores.values()) > 0:
+                                best_subtheme = max(subtheme_scores.items(), key=lambda x: x[1])[0]
+
+    if best_area == "Unknown" and relevant_entries:
+        for entry in relevant_entries:
+            score = 0
+            for word in re.findall(r'\w+', entry['area'].lower() + " " + entry['theme'].lower() + " " + entry['subtheme'].lower()):
+                if len(word) > 3 and word in text:
+                    score += text.count(word) * len(word)
+            if score > best_score:
+                best_score = score
+                best_area = entry['area']
+                best_theme = entry['theme']
+                best_subtheme = entry['subtheme']
+
+    if best_area == "Unknown" and (subject_code in ["M1", "M2", "L"]):
+        analysis_result = _reference_analyze(text, subject_code)
+        if analysis_result != "Unknown":
+            best_area = analysis_result
+            area_entries = [e for e in relevant_entries if e['area'] == best_area]
+            if area_entries:
+                best_theme = area_entries[0]['theme']
+                best_subtheme = area_entries[0]['subtheme']
+
+    if best_area == "Unknown" and subject_code == "L":
+        if len(text) > 500:
+            best_area = "Interpretar"
+        elif len(question["alternativas"]) <= 3:
+            best_area = "Localizar"
+        elif all(len(alt) > 20 for alt in question["alternativas"]):
+            best_area = "Evaluar"
+        else:
+            best_area = "Interpretar"
+
+    if subject_code == "L":
+        is_literary = bool(re.search(r'poet|novel|cuent|narr|liter|personaje|dramát|líric|épic|estrofa|verso|rima|métrica|soneto', text, re.IGNORECASE))
+        if best_area == "Evaluar":
+            if re.search(r'calidad|pertinencia|releva|exactitud|validez', text, re.IGNORECASE):
+                best_theme = "Juzgar la calidad y pertinencia de la informacion textual"
+            elif re.search(r'contexto|nuevo|aplicar|relacionar|extrapolar|situacion', text, re.IGNORECASE):
+                best_theme = "Valorar la informacion textual en relacion con nuevos contextos"
+            else:
+                best_theme = "Determinar la intencion del emisor"
+            best_subtheme = "en texto literario - narraciones" if is_literary else "en texto no literario"
+        elif best_area == "Interpretar":
+            if re.search(r'causa|efecto|problema|solucion|resulta|consecuencia', text, re.IGNORECASE):
+                best_theme = "Establecer relaciones causa-efecto y problema-solucion"
+            elif re.search(r'parrafo|seccion|fragmen|pasaje|parte|apartado', text, re.IGNORECASE):
+                best_theme = "Determinar el significado de un parrafo o seccion"
+            else:
+                best_theme = "Sintetizar las ideas centrales del texto"
+            best_subtheme = "en texto literario - narraciones" if is_literary else "en texto no literario"
+        elif best_area == "Localizar":
+            if re.search(r'sinonimo|parafrasis|signif|equivale|reemplaz|sustituir', text, re.IGNORECASE):
+                best_theme = "Reconocer sinonimos y parafrasis en textos"
+            else:
+                best_theme = "Extraer informacion explicita de textos"
+            best_subtheme = "en texto literario - narraciones" if is_literary else "en texto no literario"
+
+    return best_area, best_theme, best_subtheme
+
+
+def _relevant_entries(subject_code):
+    temario = bank._load_temario_index(str(TEMARIO))
+    return [
+        {'subject': subject, 'area': area, 'theme': theme, 'subtheme': subtheme}
+        for subject, area, theme, subtheme in temario.rows()
+        if subject.lower() == subject_code.lower()
+    ]
+
+
+def _assert_same_labels(subject_code, questions):
+    entries = _relevant_entries(subject_code)
+    categorizer = bank.QuestionCategorizer(entries, subject_code)
+    for question in questions:
+        expected = _reference_categorize(question, entries, subject_code)
+        got = categorizer.categorize(question["texto"], question["alternativas"])
+        assert got == expected, (subject_code, question["texto"][:80], got, expected)
+
+
+def _fixtures(items):
+    return [{"texto": texto, "alternativas": alternativas} for texto, alternativas in items]
+
+
+def test_m2_bank_matches_original():
+    questions = json.loads(M2_BANK.read_text(encoding="utf-8"))["preguntas"]
+    assert len(questions) == 300
+    _assert_same_labels("M2", questions)
+
+    # También a través de categorize_questions, con el mismo temario que usa el builder
+    entries = _relevant_entries("M2")
+    categorized = bank.categorize_questions(copy.deepcopy(questions), str(TEMARIO), "M2", workers=1)
+    for question, original in zip(categorized, questions):
+        assert (question["area_tematica"], question["tema"], question["subtema"]) == \
+            _reference_categorize(original, entries, "M2")
+
+
+def test_lenguaje_fixtures_match_original():
+    _assert_same_labels("L", _fixtures(LENGUAJE_FIXTURES))
+
+
+def test_quimica_fixtures_match_original():
+    _assert_same_labels("CQ", _fixtures(QUIMICA_FIXTURES))
+
+
+def run():
+    tests = [value for name, value in globals().items() if name.startswith("test_") and callable(value)]
+    for test in tests:
+        test()
+        print(f"✅ {test.__name__}")
+    print(f"✅ {len(tests)} pruebas de equivalencia del categorizador pasaron")
+
+
+if __name__ == "__main__":
+    run()
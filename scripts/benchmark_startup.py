@@ -0,0 +1,135 @@
+#!/usr/bin/env python
+"""
+Presupuesto de tiempo de arranque de las CLI
+============================================
+
+Ejecuta cada comando con `python -X importtime`, suma el tiempo de
+importación que reporta el intérprete y mide el tiempo de pared. Falla si
+algún comando supera el presupuesto o si carga bibliotecas pesadas
+(transformers, torch, pandas, PyMuPDF, Tesseract...) que solo hacen falta al
+clasificar o procesar un PDF.
+
+Uso:
+    python scripts/benchmark_startup.py --budget-ms 1000 --repeat 3
+"""
+
+import sys
+import time
+import argparse
+import subprocess
+from pathlib import Path
+from statistics import median
+from typing import Dict, List, Tuple
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+
+# (nombre, argumentos tras `python -X importtime`), ejecutados desde scripts/
+DEFAULT_TARGETS: List[Tuple[str, List[str]]] = [
+    ("pdf_processor --help", ["ocr/pdf_processor.py", "--help"]),
+    ("batch_runner --help", ["ocr/batch_runner.py", "--help"]),
+    ("classify_batch --help", ["classify_batch.py", "--help"]),
+    ("import ocr.batch_runner", ["-c", "import ocr.batch_runner"]),
+    ("import classification", ["-c", "import classification, classification.client"]),
+    ("import taxonomy_classifier", ["-c", "import classification.taxonomy_classifier"]),
+]
+
+# Paquetes de primer nivel que no deben cargarse solo para arrancar
+HEAVY_MODULES = (
+    "transformers", "torch", "optimum", "pandas", "numpy",
+    "fitz", "pdfplumber", "pytesseract", "PIL", "tqdm",
+)
+
+
+def parse_importtime(stderr: str) -> List[Tuple[str, int, int, int]]:
+    """
+    Filas (módulo, profundidad, self_us, cumulative_us) de la salida de
+    `-X importtime`; la profundidad sale de la indentación del nombre
+    """
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3:
+            continue
+        try:
+            self_us, cumulative_us = int(parts[0]), int(parts[1])
+        except ValueError:
+            continue
+        name = parts[2].rstrip()
+        module = name.lstrip()
+        depth = max(0, (len(name) - len(module) - 1) // 2)
+        rows.append((module, depth, self_us, cumulative_us))
+    return rows
+
+
+def measure(args: List[str]) -> Dict[str, object]:
+    """Una ejecución: tiempo de pared, importaciones y código de salida"""
+    start = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", *args],
+        cwd=SCRIPTS_DIR,
+        capture_output=True,
+        text=True,
+    )
+    wall_ms = 1000 * (time.perf_counter() - start)
+
+    rows = parse_importtime(completed.stderr)
+    top_level = [row for row in rows if row[1] == 0]
+    errors = [line for line in completed.stderr.splitlines() if not line.startswith("import time:")]
+    return {
+        "wall_ms": wall_ms,
+        "import_ms": sum(row[3] for row in top_level) / 1000,
+        "top_level": top_level,
+        "modules": {row[0] for row in rows},
+        "returncode": completed.returncode,
+        "error": errors[-1] if completed.returncode and errors else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Verifica el presupuesto de arranque de las CLI PAES")
+    parser.add_argument("--budget-ms", type=float, default=1000.0,
+                        help="Tiempo de pared máximo por comando (mediana de --repeat ejecuciones)")
+    parser.add_argument("--repeat", type=int, default=3, help="Ejecuciones por comando")
+    parser.add_argument("--top", type=int, default=5, help="Importaciones más costosas a listar por comando")
+    parser.add_argument("--only", nargs="+", help="Subconjunto de comandos (por nombre) a medir")
+    args = parser.parse_args()
+
+    targets = [target for target in DEFAULT_TARGETS if not args.only or target[0] in args.only]
+    failures = 0
+
+    for name, target_args in targets:
+        runs = [measure(target_args) for _ in range(max(1, args.repeat))]
+        last = runs[-1]
+        wall_ms = median(run["wall_ms"] for run in runs)
+        import_ms = median(run["import_ms"] for run in runs)
+
+        if last["returncode"]:
+            print(f"{name}: ERROR (código {last['returncode']}) {last['error'] or ''}")
+            failures += 1
+            continue
+
+        heavy = sorted(
+            module for module in last["modules"]
+            if module.split(".", 1)[0] in HEAVY_MODULES and "." not in module
+        )
+        over_budget = wall_ms > args.budget_ms
+        status = "OK" if not (heavy or over_budget) else "FALLA"
+        failures += status != "OK"
+
+        print(f"{name}: {status} — pared {wall_ms:.0f} ms, importaciones {import_ms:.0f} ms")
+        for module, _, _, cumulative_us in sorted(last["top_level"], key=lambda row: -row[3])[:args.top]:
+            print(f"    {cumulative_us / 1000:8.1f} ms  {module}")
+        if heavy:
+            print(f"    importa módulos pesados: {', '.join(heavy)}")
+        if over_budget:
+            print(f"    supera el presupuesto de {args.budget_ms:.0f} ms")
+
+    if failures:
+        print(f"\n{failures} comando(s) con error o fuera de presupuesto")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -6,8 +6,17 @@ Este módulo proporciona clasificación automática de preguntas PAES usando IA:
 - Clasificación por área temática
 - Clasificación por tema específico  
 - Identificación de habilidades requeridas
+- Backends intercambiables: zero-shot NLI (por defecto), embeddings u ONNX int8
+- Servidor residente (`server.py`) y su cliente liviano (`client.py`)
 """
 
-from .taxonomy_classifier import TaxonomyClassifier
+__all__ = ['TaxonomyClassifier', 'get_classifier']
 
-__all__ = ['TaxonomyClassifier']
\ No newline at end of file
+
+def __getattr__(name):
+    # Importación diferida: el cliente del servidor (classification.client)
+    # no debe arrastrar transformers ni pandas al importar el paquete
+    if name in __all__:
+        from . import taxonomy_classifier
+        return getattr(taxonomy_classifier, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
\ No newline at end of file
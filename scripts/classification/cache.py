@@ -0,0 +1,119 @@
+"""
+Caché persistente de clasificaciones
+====================================
+
+Memoriza en SQLite el resultado completo de `classify_question` bajo una
+clave derivada del texto normalizado de la pregunta (enunciado + opciones),
+la materia y la huella del clasificador (backend, modelo, modo, plantillas de
+hipótesis y hash del temario). Si cambia el modelo o el temario la huella
+cambia y las entradas anteriores dejan de coincidir.
+"""
+
+import os
+import re
+import json
+import time
+import sqlite3
+import hashlib
+import unicodedata
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+# Artefactos derivados (embeddings de etiquetas, modelos exportados, cachés);
+# definidos aquí para que las CLI los usen sin importar el clasificador
+DEFAULT_CACHE_DIR = Path(
+    os.environ.get("PAES_CLASSIFIER_CACHE", Path.home() / ".cache" / "paes_classifier")
+)
+DEFAULT_CLASSIFICATION_CACHE = DEFAULT_CACHE_DIR / "classifications.sqlite"
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalise_question_text(text: str) -> str:
+    """Normaliza Unicode, mayúsculas y espacios para que variantes triviales compartan clave"""
+    text = unicodedata.normalize("NFKC", text or "")
+    return _WHITESPACE.sub(" ", text).strip().lower()
+
+
+class ClassificationCache:
+    """Memo en disco de clasificaciones con estadísticas de aciertos"""
+
+    def __init__(self, path: Path, fingerprint: str):
+        """
+        Abre (o crea) la caché
+
+        Args:
+            path: Archivo SQLite de la caché
+            fingerprint: Huella del clasificador que produce los resultados
+        """
+        self.path = Path(path)
+        self.fingerprint = fingerprint
+        self.hits = 0
+        self.misses = 0
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._conn = sqlite3.connect(str(self.path), timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS classifications (
+                key TEXT PRIMARY KEY,
+                fingerprint TEXT NOT NULL,
+                result TEXT NOT NULL,
+                created_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.commit()
+
+    def make_key(self, subject: str, full_text: str) -> str:
+        """Clave de una pregunta: materia normalizada + enunciado con opciones completo (sin recortar al modelo)"""
+        payload = "\x1f".join([self.fingerprint, subject, normalise_question_text(full_text)])
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """Resultados guardados para las claves pedidas (las ausentes se cuentan como fallos)"""
+        keys = list(keys)
+        found: Dict[str, Dict[str, Any]] = {}
+        for start in range(0, len(keys), 500):
+            chunk = keys[start:start + 500]
+            placeholders = ",".join("?" * len(chunk))
+            rows = self._conn.execute(
+                f"SELECT key, result FROM classifications WHERE key IN ({placeholders})",
+                chunk,
+            )
+            for key, result in rows:
+                found[key] = json.loads(result)
+
+        self.hits += len(found)
+        self.misses += len(keys) - len(found)
+        return found
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        return self.get_many([key]).get(key)
+
+    def put_many(self, items: Dict[str, Dict[str, Any]]) -> None:
+        now = time.time()
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO classifications (key, fingerprint, result, created_at) VALUES (?, ?, ?, ?)",
+            [
+                (key, self.fingerprint, json.dumps(result, ensure_ascii=False), now)
+                for key, result in items.items()
+            ],
+        )
+        self._conn.commit()
+
+    def put(self, key: str, result: Dict[str, Any]) -> None:
+        self.put_many({key: result})
+
+    def stats(self) -> Dict[str, Any]:
+        """Aciertos, fallos y tasa de aciertos de este proceso"""
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+    def close(self) -> None:
+        self._conn.close()
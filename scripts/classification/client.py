@@ -0,0 +1,74 @@
+"""
+Cliente del servidor de clasificación
+=====================================
+
+Habla con `classification/server.py` por HTTP local usando solo la
+biblioteca estándar, de modo que quien lo use no tenga que importar
+transformers ni cargar el modelo.
+"""
+
+import os
+import json
+import urllib.error
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+DEFAULT_SERVER_URL = os.environ.get("PAES_CLASSIFIER_URL", "http://127.0.0.1:8765")
+
+# Parámetros que cambian el resultado: el servidor solo sirve a clientes que coinciden
+SERVER_CONFIG_KEYS = ("backend", "temario_path", "model_name", "mode", "embedding_model", "cascade_threshold")
+
+
+def comparable_config(config: Dict[str, Any]) -> Dict[str, Any]:
+    """Subconjunto de la configuración del clasificador que determina los resultados"""
+    comparable = {key: config.get(key) for key in SERVER_CONFIG_KEYS}
+    if comparable["temario_path"]:
+        comparable["temario_path"] = str(Path(comparable["temario_path"]).resolve())
+    if comparable["backend"] != "embedding":
+        comparable["embedding_model"] = None
+    return comparable
+
+
+class ClassificationClient:
+    """Cliente JSON del servidor de clasificación"""
+
+    def __init__(self, url: str = DEFAULT_SERVER_URL, timeout: float = 600.0):
+        self.url = url.rstrip("/")
+        self.timeout = timeout
+
+    def _request(self, path: str, payload: Optional[Any] = None, timeout: Optional[float] = None) -> Any:
+        import urllib.request  # arrastra http.client y ssl: solo al hablar con el servidor
+
+        data = None
+        headers = {}
+        if payload is not None:
+            data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+            headers["Content-Type"] = "application/json"
+        request = urllib.request.Request(f"{self.url}{path}", data=data, headers=headers)
+        with urllib.request.urlopen(request, timeout=timeout or self.timeout) as response:
+            return json.loads(response.read().decode("utf-8"))
+
+    def health(self, timeout: float = 0.5) -> Optional[Dict[str, Any]]:
+        """Estado del servidor, o None si no está corriendo"""
+        try:
+            return self._request("/health", timeout=timeout)
+        except (urllib.error.URLError, OSError, ValueError):
+            return None
+
+    def serves(self, config: Dict[str, Any]) -> bool:
+        """Indica si hay un servidor activo con la misma configuración de clasificador"""
+        health = self.health()
+        if not health or health.get("status") != "ok":
+            return False
+        return comparable_config(health.get("config", {})) == comparable_config(config)
+
+    def classify(self, questions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Clasifica preguntas en el servidor y devuelve la lista clasificada"""
+        try:
+            return self._request("/classify", {"questions": questions})
+        except urllib.error.HTTPError as e:
+            detail = e.read().decode("utf-8", errors="replace")
+            raise RuntimeError(f"El servidor de clasificación respondió {e.code}: {detail}") from e
+
+    def metrics(self) -> Dict[str, Any]:
+        return self._request("/metrics", timeout=5.0)
@@ -0,0 +1,109 @@
+#!/usr/bin/env python
+"""
+Comparación de backends de clasificación: precisión vs. latencia
+================================================================
+
+Clasifica el banco M2 (`data/m2_question_bank_completo.json`, que trae
+`area_tematica` y `tema` de referencia) con cada backend y reporta:
+
+- Precisión de área y tema contra las etiquetas del banco
+- Coincidencia con el primer backend de la lista (referencia)
+- Latencia total y preguntas por segundo
+
+Uso:
+    python scripts/classification/compare_backends.py --backends nli onnx --limit 100
+"""
+
+import sys
+import json
+import time
+import argparse
+import unicodedata
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent
+PROJECT_ROOT = SCRIPTS_DIR.parent
+if str(SCRIPTS_DIR) not in sys.path:
+    sys.path.insert(0, str(SCRIPTS_DIR))
+
+from classification.taxonomy_classifier import CLASSIFIER_BACKENDS, get_classifier  # noqa: E402
+
+
+def _normalise_label(value) -> str:
+    """Compara etiquetas sin tildes ni mayúsculas"""
+    text = unicodedata.normalize("NFKD", str(value or ""))
+    return "".join(char for char in text if not unicodedata.combining(char)).strip().lower()
+
+
+def load_questions(path: Path, limit: int):
+    data = json.loads(path.read_text(encoding="utf-8"))
+    questions = []
+    for item in data["preguntas"][:limit]:
+        questions.append({
+            "id": item.get("id"),
+            "content": item.get("texto", ""),
+            "options": item.get("alternativas", []),
+            "subject": item.get("materia", "M2"),
+            "gold_area": item.get("area_tematica"),
+            "gold_tema": item.get("tema"),
+        })
+    return questions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compara backends de clasificación en precisión y latencia")
+    parser.add_argument("--input", type=Path, default=PROJECT_ROOT / "data" / "m2_question_bank_completo.json",
+                        help="Banco de preguntas con etiquetas de referencia")
+    parser.add_argument("--backends", nargs="+", choices=CLASSIFIER_BACKENDS, default=["nli", "onnx"],
+                        help="Backends a comparar (el primero es la referencia)")
+    parser.add_argument("--limit", type=int, default=300, help="Número máximo de preguntas")
+    parser.add_argument("--temario", type=Path, default=PROJECT_ROOT / "content" / "temario_paes_vs.csv",
+                        help="Ruta al CSV del temario PAES")
+    parser.add_argument("--model", default="MoritzLaurer/mDeBERTa-v3-base-mnli-xnli",
+                        help="Modelo zero-shot de Hugging Face")
+    parser.add_argument("--batch-size", type=int, default=16, help="Pares por forward del modelo")
+    args = parser.parse_args()
+
+    questions = load_questions(args.input, args.limit)
+    print(f"Preguntas: {len(questions)} desde {args.input}")
+
+    reference = None
+    rows = []
+    for backend in args.backends:
+        classifier = get_classifier(
+            backend=backend,
+            temario_path=str(args.temario),
+            model_name=args.model,
+            batch_size=args.batch_size,
+        )
+        classifier.classifier  # excluir la carga del modelo de la latencia
+
+        batch = [dict(q) for q in questions]
+        start = time.perf_counter()
+        classifier.classify_batch(batch, show_progress=False)
+        elapsed = time.perf_counter() - start
+
+        total = len(batch)
+        area_ok = sum(_normalise_label(q.get("area_tematica")) == _normalise_label(q["gold_area"]) for q in batch)
+        tema_ok = sum(_normalise_label(q.get("tema")) == _normalise_label(q["gold_tema"]) for q in batch)
+
+        if reference is None:
+            reference = batch
+            agreement = 1.0
+        else:
+            agreement = sum(
+                q.get("area_tematica") == r.get("area_tematica") and q.get("tema") == r.get("tema")
+                for q, r in zip(batch, reference)
+            ) / total
+
+        rows.append((backend, elapsed, total / elapsed if elapsed else 0.0,
+                     area_ok / total, tema_ok / total, agreement, classifier.load_seconds))
+
+    print(f"\n{'backend':<10} {'tiempo':>8} {'preg/s':>8} {'área':>7} {'tema':>7} {'=ref':>7} {'carga':>7}")
+    for backend, elapsed, qps, area_acc, tema_acc, agreement, load in rows:
+        print(f"{backend:<10} {elapsed:>7.1f}s {qps:>8.2f} {area_acc:>7.1%} {tema_acc:>7.1%} "
+              f"{agreement:>7.1%} {load:>6.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,235 @@
+"""
+Clasificador Taxonómico PAES por embeddings
+===========================================
+
+Alternativa al zero-shot NLI para clasificar grandes volúmenes en CPU:
+
+- Cada área temática, par área/tema y habilidad del temario se embebe una
+  sola vez y la matriz de etiquetas se guarda en disco
+- Cada pregunta requiere una sola pasada del encoder; las puntuaciones contra
+  todas las etiquetas salen de un producto matricial de cosenos
+
+Expone la misma API que TaxonomyClassifier (`classify_question`,
+`classify_batch`) y se selecciona con `backend="embedding"`.
+"""
+
+import time
+import hashlib
+import logging
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from classification.taxonomy_classifier import (
+    ABILITY_MAP,
+    DEFAULT_CACHE_DIR,
+    TaxonomyClassifier,
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_EMBEDDING_MODEL = "sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2"
+
+
+class EmbeddingTaxonomyClassifier(TaxonomyClassifier):
+    """
+    Clasificador de preguntas PAES por similitud coseno contra etiquetas precomputadas
+    """
+
+    def __init__(self,
+                 embedding_model: str = DEFAULT_EMBEDDING_MODEL,
+                 temperature: float = 20.0,
+                 cache_dir: Optional[str] = None,
+                 **kwargs):
+        """
+        Inicializa el clasificador
+
+        Args:
+            embedding_model: Modelo de Hugging Face usado como encoder
+            temperature: Escala aplicada a los cosenos antes del softmax
+            cache_dir: Carpeta donde persistir la matriz de etiquetas
+            **kwargs: Argumentos de TaxonomyClassifier (temario_path, device, ...)
+        """
+        super().__init__(**kwargs)
+        self.embedding_model = embedding_model
+        self.temperature = temperature
+        self.cache_dir = Path(cache_dir) if cache_dir else DEFAULT_CACHE_DIR / "label_embeddings"
+
+        self._tokenizer = None
+        self._encoder = None
+        self._label_index: Optional[Dict[str, int]] = None
+        self._label_matrix: Optional[np.ndarray] = None
+
+    @property
+    def tokenizer(self):
+        """Tokenizer del encoder (también usado para ajustar las entradas a su largo máximo)"""
+        if self._tokenizer is None:
+            from transformers import AutoTokenizer
+            self._tokenizer = AutoTokenizer.from_pretrained(self.embedding_model)
+        return self._tokenizer
+
+    @property
+    def classifier(self):
+        """Este backend no usa el pipeline zero-shot; se carga el encoder"""
+        self._load_encoder()
+        return self._encoder
+
+    def _load_encoder(self) -> None:
+        """Lazy loading del encoder"""
+        if self._encoder is not None:
+            return
+
+        from transformers import AutoModel
+
+        logger.info(f"Cargando encoder: {self.embedding_model}")
+        start = time.perf_counter()
+        self.tokenizer
+        self._encoder = AutoModel.from_pretrained(self.embedding_model)
+        self._encoder.to(self._torch_device)
+        self._encoder.eval()
+        self.load_seconds += time.perf_counter() - start
+        logger.info("Encoder cargado exitosamente")
+
+    @property
+    def _torch_device(self) -> str:
+        return "cpu" if self.device < 0 else f"cuda:{self.device}"
+
+    def _encode(self, texts: List[str]) -> np.ndarray:
+        """Embeddings normalizados (mean pooling) de una lista de textos"""
+        import torch
+
+        self._load_encoder()
+        vectors = []
+
+        with torch.no_grad():
+            for start in range(0, len(texts), self.batch_size):
+                batch = texts[start:start + self.batch_size]
+                encoded = self._tokenizer(
+                    batch,
+                    padding=True,
+                    truncation=True,
+                    return_tensors="pt",
+                ).to(self._torch_device)
+                output = self._encoder(**encoded).last_hidden_state
+                mask = encoded["attention_mask"].unsqueeze(-1).to(output.dtype)
+                pooled = (output * mask).sum(dim=1) / mask.sum(dim=1).clamp(min=1e-9)
+                pooled = torch.nn.functional.normalize(pooled, p=2, dim=1)
+                vectors.append(pooled.cpu().numpy())
+
+        return np.vstack(vectors).astype(np.float32)
+
+    # ------------------------------------------------------------------
+    # Matriz de etiquetas
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _area_label(area: str) -> str:
+        return area
+
+    @staticmethod
+    def _tema_label(area: str, tema: str) -> str:
+        return f"{tema} ({area})"
+
+    @staticmethod
+    def _habilidad_label(habilidad: str) -> str:
+        return habilidad
+
+    def _label_texts(self) -> List[str]:
+        """Todos los textos de etiqueta del temario, en orden estable"""
+        labels = set()
+        for area in self.temario.all_areas:
+            labels.add(self._area_label(area))
+            for subject in self.subjects + ['ALL']:
+                for tema in self._tema_candidates(subject, area):
+                    labels.add(self._tema_label(area, tema))
+        for habilidad in ABILITY_MAP['ALL']:
+            labels.add(self._habilidad_label(habilidad))
+        return sorted(labels)
+
+    def _ensure_label_matrix(self) -> None:
+        """Carga la matriz de etiquetas desde disco o la calcula y persiste"""
+        if self._label_matrix is not None:
+            return
+
+        labels = self._label_texts()
+        digest = hashlib.sha256(
+            "\n".join([self.embedding_model] + labels).encode("utf-8")
+        ).hexdigest()[:16]
+        cache_file = self.cache_dir / f"{digest}.npz"
+
+        if cache_file.exists():
+            logger.info(f"Matriz de etiquetas cargada desde {cache_file}")
+            matrix = np.load(cache_file)["matrix"]
+        else:
+            logger.info(f"Calculando embeddings para {len(labels)} etiquetas del temario")
+            matrix = self._encode(labels)
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            np.savez_compressed(cache_file, matrix=matrix, labels=np.array(labels))
+
+        self._label_index = {label: idx for idx, label in enumerate(labels)}
+        self._label_matrix = matrix
+
+    # ------------------------------------------------------------------
+    # Clasificación
+    # ------------------------------------------------------------------
+
+    def cache_fingerprint(self) -> Dict[str, any]:
+        fingerprint = super().cache_fingerprint()
+        fingerprint.update({
+            'embedding_model': self.embedding_model,
+            'temperature': self.temperature,
+        })
+        return fingerprint
+
+    def _classify_prepared(self, texts: List[str], subject: str) -> List[Dict[str, any]]:
+        """Una pasada del encoder por texto y un producto matricial contra todas las etiquetas"""
+        try:
+            self._ensure_label_matrix()
+            # Codificar de mayor a menor largo (menos relleno por lote) y restaurar el orden
+            order = self._length_order(texts)
+            embeddings = np.empty((len(texts), self._label_matrix.shape[1]), dtype=np.float32)
+            embeddings[order] = self._encode([texts[idx] for idx in order])
+        except Exception as e:
+            logger.error(f"Error en clasificación: {e}")
+            return self._error_results(texts, subject, e)
+        similarities = embeddings @ self._label_matrix.T
+
+        area_candidates = self._area_candidates(subject)
+        habilidad_candidates = self._habilidad_candidates(subject)
+        area_rows = [self._label_index[self._area_label(area)] for area in area_candidates]
+        habilidad_rows = [self._label_index[self._habilidad_label(h)] for h in habilidad_candidates]
+
+        classifications = []
+        for row in similarities:
+            area_result = self._softmax_result(area_candidates, row[area_rows])
+
+            tema_candidates = self._tema_candidates(subject, area_result['label'])
+            if len(tema_candidates) > 0:
+                tema_rows = [
+                    self._label_index[self._tema_label(area_result['label'], tema)]
+                    for tema in tema_candidates
+                ]
+                tema_result = self._softmax_result(tema_candidates, row[tema_rows])
+            else:
+                tema_result = {'label': area_result['label'], 'score': area_result['score']}
+
+            habilidad_result = self._softmax_result(habilidad_candidates, row[habilidad_rows])
+            classifications.append(
+                self._build_result(subject, area_result, tema_result, habilidad_result)
+            )
+
+        return classifications
+
+    def _softmax_result(self, candidates: List[str], similarities: np.ndarray) -> Dict[str, any]:
+        """Convierte cosenos en probabilidades y arma el resultado de una etapa"""
+        if not candidates:
+            return {'label': 'Sin clasificar', 'score': 0.0, 'all_scores': {}}
+
+        logits = similarities * self.temperature
+        probs = np.exp(logits - logits.max())
+        probs = probs / probs.sum()
+        order = np.argsort(-probs)
+        all_scores = {candidates[i]: float(probs[i]) for i in order}
+        best = candidates[order[0]]
+        return {'label': best, 'score': all_scores[best], 'all_scores': all_scores}
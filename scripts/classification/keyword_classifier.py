@@ -0,0 +1,217 @@
+"""
+Preclasificador por palabras clave
+==================================
+
+Primera etapa de la cascada de clasificación: puntúa cada pregunta contra
+listas de palabras clave por área (las de `paes_keywords`, compartidas con
+`pruebas/build_paes_questions_bank.py` y llevadas a los nombres del temario)
+más los términos del propio temario, con pesos tipo TF-IDF. Cada materia se compila en una sola expresión regular, por lo que una
+pregunta se puntúa en microsegundos.
+
+Si el margen entre la mejor y la segunda área (y habilidad) supera el umbral
+configurado, el resultado se acepta sin pasar por el modelo; las preguntas
+ambiguas siguen al transformer.
+"""
+
+import re
+import math
+import unicodedata
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from paes_keywords import AREA_KEYWORDS, HABILIDAD_KEYWORDS, LENGUAJE_TEMA_KEYWORDS, TEMARIO_AREAS
+
+# Subir al cambiar las listas o la forma de buscarlas: invalida la caché de la cascada
+KEYWORD_RULES_VERSION = 3
+
+
+def area_keywords(subject: str) -> Dict[str, List[str]]:
+    """Palabras clave de `paes_keywords` por área del temario de una materia"""
+    if subject == "L":
+        return LENGUAJE_TEMA_KEYWORDS
+    aliases = TEMARIO_AREAS.get(subject, {})
+    merged: Dict[str, List[str]] = {}
+    for area, keywords in AREA_KEYWORDS.get(subject, {}).items():
+        merged.setdefault(aliases.get(area, area), []).extend(keywords)
+    return merged
+
+
+# Palabras del temario demasiado genéricas como para discriminar
+_STOPWORDS = {
+    "para", "como", "entre", "sobre", "desde", "hasta", "donde", "cual", "cuales",
+    "texto", "textos", "este", "esta", "estos", "estas", "segun", "otros", "otras",
+}
+
+_WORD = re.compile(r"\w+")
+
+
+def fold_text(text: str) -> str:
+    """Minúsculas sin tildes (el temario está escrito sin tildes)"""
+    text = unicodedata.normalize("NFKD", (text or "").lower())
+    return "".join(char for char in text if not unicodedata.combining(char))
+
+
+def temario_terms(*phrases: str) -> List[str]:
+    """Palabras significativas (más de 3 letras) de nombres de área o tema"""
+    terms = []
+    for phrase in phrases:
+        for word in _WORD.findall(fold_text(phrase)):
+            if len(word) > 3 and word not in _STOPWORDS:
+                terms.append(word)
+    return terms
+
+
+class KeywordMatcher:
+    """
+    Puntuación de etiquetas por palabras clave con una sola regex
+
+    Cada término pesa su largo (como en `categorize_questions`) por su IDF
+    entre las etiquetas, de modo que los términos compartidos por varias
+    etiquetas casi no discriminan. Los términos se buscan como palabra
+    completa, admitiendo el plural ("dato" cubre "datos", pero "capa" no
+    coincide dentro de "capacidad").
+    """
+
+    def __init__(self, terms_by_label: Dict[str, Iterable[str]]):
+        self.labels = list(terms_by_label)
+        folded = {label: {fold_text(term) for term in terms if term} for label, terms in terms_by_label.items()}
+
+        document_frequency: Dict[str, int] = {}
+        for terms in folded.values():
+            for term in terms:
+                document_frequency[term] = document_frequency.get(term, 0) + 1
+
+        total = len(self.labels)
+        self._weights: Dict[str, List[Tuple[str, float]]] = {}
+        for label, terms in folded.items():
+            for term in terms:
+                idf = math.log((1 + total) / (1 + document_frequency[term])) + 1.0
+                self._weights.setdefault(term, []).append((label, len(term) * idf))
+
+        self._pattern = None
+        if self._weights:
+            alternatives = [
+                # Sin límite final para términos que terminan en símbolo ("y=", "f(x)")
+                re.escape(term) + (r"(?:e?s)?\b" if term[-1].isalnum() else "")
+                for term in sorted(self._weights, key=len, reverse=True)
+            ]
+            self._pattern = re.compile(r"\b(?:" + "|".join(alternatives) + ")")
+
+    def _term(self, matched: str) -> str:
+        """Término de la lista que produjo una coincidencia (quitando el plural)"""
+        if matched in self._weights:
+            return matched
+        if matched[:-1] in self._weights:
+            return matched[:-1]
+        return matched[:-2]
+
+    def score(self, folded_text: str) -> Tuple[Dict[str, float], int]:
+        """Puntaje por etiqueta y número de coincidencias en un texto ya normalizado"""
+        scores = dict.fromkeys(self.labels, 0.0)
+        matches = 0
+        if self._pattern is None:
+            return scores, matches
+        for match in self._pattern.finditer(folded_text):
+            matches += 1
+            for label, weight in self._weights[self._term(match.group(0))]:
+                scores[label] += weight
+        return scores, matches
+
+
+def ranked_result(scores: Dict[str, float]) -> Dict[str, any]:
+    """Etiqueta ganadora, puntuaciones normalizadas y margen entre las dos primeras"""
+    total = sum(scores.values())
+    if total <= 0:
+        return {'label': None, 'score': 0.0, 'margin': 0.0, 'all_scores': {}}
+
+    ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+    all_scores = {label: score / total for label, score in ranked if score > 0}
+    best = ranked[0][0]
+    second = ranked[1][1] / total if len(ranked) > 1 else 0.0
+    return {
+        'label': best,
+        'score': all_scores[best],
+        'margin': all_scores[best] - second,
+        'all_scores': all_scores,
+    }
+
+
+class KeywordClassifier:
+    """
+    Clasificador área/tema/habilidad por palabras clave sobre el temario cargado
+    """
+
+    def __init__(self,
+                 areas_by_subject: Dict[str, List[str]],
+                 temas_by_area: Dict[str, List[str]],
+                 habilidades_by_subject: Dict[str, List[str]],
+                 min_matches: int = 1):
+        """
+        Args:
+            areas_by_subject: Áreas del temario por materia
+            temas_by_area: Temas del temario por clave "<materia>_<área>"
+            habilidades_by_subject: Habilidades candidatas por materia
+            min_matches: Coincidencias mínimas para considerar una etiqueta
+        """
+        self.areas_by_subject = areas_by_subject
+        self.temas_by_area = temas_by_area
+        self.habilidades_by_subject = habilidades_by_subject
+        self.min_matches = min_matches
+        self._area_matchers: Dict[str, KeywordMatcher] = {}
+        self._tema_matchers: Dict[str, KeywordMatcher] = {}
+        self._habilidad_matchers: Dict[Tuple[str, ...], KeywordMatcher] = {}
+
+    def _area_matcher(self, subject: str) -> KeywordMatcher:
+        if subject not in self._area_matchers:
+            keywords = area_keywords(subject)
+            terms = {}
+            for area in self.areas_by_subject.get(subject, []):
+                temas = self.temas_by_area.get(f"{subject}_{area}", [])
+                terms[area] = list(keywords.get(area, [])) + temario_terms(area, *temas)
+            self._area_matchers[subject] = KeywordMatcher(terms)
+        return self._area_matchers[subject]
+
+    def _tema_matcher(self, subject: str, area: str) -> KeywordMatcher:
+        key = f"{subject}_{area}"
+        if key not in self._tema_matchers:
+            temas = self.temas_by_area.get(key, [])
+            self._tema_matchers[key] = KeywordMatcher({tema: temario_terms(tema) for tema in temas})
+        return self._tema_matchers[key]
+
+    def _habilidad_matcher(self, habilidades: List[str]) -> KeywordMatcher:
+        key = tuple(habilidades)
+        if key not in self._habilidad_matchers:
+            self._habilidad_matchers[key] = KeywordMatcher(
+                {habilidad: HABILIDAD_KEYWORDS.get(habilidad, []) for habilidad in habilidades}
+            )
+        return self._habilidad_matchers[key]
+
+    def classify(self, text: str, subject: str) -> Optional[Dict[str, Dict[str, any]]]:
+        """
+        Resultado por etapa (área, tema, habilidad) con su margen, o None si
+        el texto no tiene evidencia suficiente para alguna de ellas
+        """
+        if subject not in self.areas_by_subject:
+            return None
+
+        folded = fold_text(text)
+        area_scores, matches = self._area_matcher(subject).score(folded)
+        if matches < self.min_matches:
+            return None
+        area_result = ranked_result(area_scores)
+        if area_result['label'] is None:
+            return None
+
+        tema_candidates = self.temas_by_area.get(f"{subject}_{area_result['label']}", [])
+        if tema_candidates:
+            tema_result = ranked_result(self._tema_matcher(subject, area_result['label']).score(folded)[0])
+            if tema_result['label'] is None:
+                return None
+        else:
+            tema_result = dict(area_result)
+
+        habilidades = self.habilidades_by_subject.get(subject, [])
+        habilidad_result = ranked_result(self._habilidad_matcher(habilidades).score(folded)[0])
+        if habilidad_result['label'] is None:
+            return None
+
+        return {'area': area_result, 'tema': tema_result, 'habilidad': habilidad_result}
@@ -0,0 +1,98 @@
+"""
+Clasificador Taxonómico PAES sobre ONNX Runtime
+===============================================
+
+Backend opcional para CPU: exporta `model_name` a ONNX una sola vez, aplica
+cuantización dinámica int8 y sirve el pipeline zero-shot desde onnxruntime.
+El artefacto queda junto a la caché de Hugging Face
+(`$HF_HOME/paes_onnx/<modelo>-int8`) y se reutiliza en ejecuciones
+siguientes.
+
+Requiere `optimum[onnxruntime]`; se selecciona con `backend="onnx"`.
+"""
+
+import os
+import time
+import logging
+from pathlib import Path
+from typing import Optional
+
+from classification.taxonomy_classifier import TaxonomyClassifier
+
+logger = logging.getLogger(__name__)
+
+QUANTIZED_FILE = "model_quantized.onnx"
+
+
+def default_onnx_dir() -> Path:
+    """Carpeta de artefactos ONNX, hermana de la caché de Hugging Face"""
+    hf_home = os.environ.get("HF_HOME", Path.home() / ".cache" / "huggingface")
+    return Path(hf_home) / "paes_onnx"
+
+
+class OnnxTaxonomyClassifier(TaxonomyClassifier):
+    """
+    Clasificador zero-shot servido desde un modelo ONNX cuantizado a int8
+    """
+
+    def __init__(self, onnx_dir: Optional[str] = None, **kwargs):
+        """
+        Inicializa el clasificador
+
+        Args:
+            onnx_dir: Carpeta base de artefactos ONNX (por defecto junto a HF_HOME)
+            **kwargs: Argumentos de TaxonomyClassifier (temario_path, model_name, ...)
+        """
+        super().__init__(**kwargs)
+        if self.device >= 0:
+            logger.warning("El backend ONNX se ejecuta en CPU; se ignora device=%s", self.device)
+
+        base_dir = Path(onnx_dir) if onnx_dir else default_onnx_dir()
+        self.onnx_dir = base_dir / f"{self.model_name.replace('/', '--')}-int8"
+
+    @property
+    def classifier(self):
+        """Lazy loading del pipeline zero-shot sobre onnxruntime"""
+        if self._classifier is None:
+            from optimum.onnxruntime import ORTModelForSequenceClassification
+            from transformers import AutoTokenizer, pipeline
+
+            start = time.perf_counter()
+            model_dir = self._export_quantized()
+            logger.info(f"Cargando modelo ONNX: {model_dir / QUANTIZED_FILE}")
+            model = ORTModelForSequenceClassification.from_pretrained(model_dir, file_name=QUANTIZED_FILE)
+            tokenizer = AutoTokenizer.from_pretrained(model_dir)
+            self._classifier = pipeline(
+                "zero-shot-classification",
+                model=model,
+                tokenizer=tokenizer
+            )
+            self.load_seconds += time.perf_counter() - start
+            logger.info("Modelo ONNX cargado exitosamente")
+        return self._classifier
+
+    def _export_quantized(self) -> Path:
+        """Exporta y cuantiza el modelo la primera vez; luego reutiliza el artefacto"""
+        if (self.onnx_dir / QUANTIZED_FILE).exists():
+            return self.onnx_dir
+
+        from optimum.onnxruntime import ORTModelForSequenceClassification, ORTQuantizer
+        from optimum.onnxruntime.configuration import AutoQuantizationConfig
+        from transformers import AutoTokenizer
+
+        logger.info(f"Exportando {self.model_name} a ONNX (solo la primera vez)...")
+        export_dir = self.onnx_dir / "fp32"
+        model = ORTModelForSequenceClassification.from_pretrained(self.model_name, export=True)
+        tokenizer = AutoTokenizer.from_pretrained(self.model_name)
+        model.save_pretrained(export_dir)
+        tokenizer.save_pretrained(export_dir)
+
+        logger.info("Aplicando cuantización dinámica int8...")
+        quantizer = ORTQuantizer.from_pretrained(export_dir)
+        qconfig = AutoQuantizationConfig.avx2(is_static=False, per_channel=False)
+        quantizer.quantize(save_dir=self.onnx_dir, quantization_config=qconfig)
+        model.config.save_pretrained(self.onnx_dir)
+        tokenizer.save_pretrained(self.onnx_dir)
+
+        logger.info(f"Modelo cuantizado guardado en {self.onnx_dir}")
+        return self.onnx_dir
@@ -0,0 +1,309 @@
+#!/usr/bin/env python
+"""
+Servidor de clasificación residente
+===================================
+
+Mantiene un clasificador cargado y lo expone por HTTP en localhost, para
+que `classify_batch.py` (y el lado Node que lo invoca) no paguen en cada
+llamada la importación de transformers, la lectura del temario y la carga
+del modelo.
+
+Las peticiones concurrentes se agrupan en micro-lotes: el hilo de inferencia
+espera hasta `--window-ms` (o hasta `--max-batch` preguntas) y clasifica
+todo junto con `classify_batch`.
+
+API JSON:
+    GET  /health    estado y configuración del clasificador
+    GET  /metrics   peticiones, lotes, throughput y caché
+    POST /classify  {"questions": [...]} o una lista de preguntas
+
+Uso:
+    python scripts/classification/server.py --port 8765
+"""
+
+import sys
+import json
+import time
+import queue
+import logging
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlparse
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent
+PROJECT_ROOT = SCRIPTS_DIR.parent
+if str(SCRIPTS_DIR) not in sys.path:
+    sys.path.insert(0, str(SCRIPTS_DIR))
+
+from classification.taxonomy_classifier import (  # noqa: E402
+    CLASSIFIER_BACKENDS,
+    DEFAULT_CLASSIFICATION_CACHE,
+    TaxonomyClassifier,
+    get_classifier,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class _Job:
+    """Preguntas de una petición HTTP a la espera del hilo de inferencia"""
+
+    __slots__ = ("questions", "done", "error", "enqueued_at")
+
+    def __init__(self, questions: List[Dict[str, Any]]):
+        self.questions = questions
+        self.done = threading.Event()
+        self.error: Optional[str] = None
+        self.enqueued_at = time.perf_counter()
+
+
+class MicroBatcher:
+    """
+    Un único hilo de inferencia que agrupa las peticiones que llegan dentro de
+    una ventana corta; el modelo nunca se usa desde dos hilos a la vez.
+    """
+
+    def __init__(self, classifier: TaxonomyClassifier, window_ms: float = 20.0, max_batch: int = 64):
+        self.classifier = classifier
+        self.window = window_ms / 1000.0
+        self.max_batch = max_batch
+        self._queue: "queue.Queue[_Job]" = queue.Queue()
+        self._lock = threading.Lock()
+
+        self.started_at = time.time()
+        self.requests = 0
+        self.questions = 0
+        self.batches = 0
+        self.errors = 0
+        self.busy_seconds = 0.0
+        self.wait_seconds = 0.0
+
+        self._ready = threading.Event()
+        self._thread = threading.Thread(target=self._loop, name="classifier", daemon=True)
+        self._thread.start()
+        self._ready.wait()
+
+    def submit(self, questions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Encola preguntas y bloquea hasta que estén clasificadas"""
+        job = _Job(questions)
+        self._queue.put(job)
+        job.done.wait()
+        if job.error:
+            raise RuntimeError(job.error)
+        return job.questions
+
+    def _collect(self) -> List[_Job]:
+        """Primera petición en cola más las que lleguen dentro de la ventana"""
+        jobs = [self._queue.get()]
+        size = len(jobs[0].questions)
+        deadline = time.perf_counter() + self.window
+        while size < self.max_batch:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                job = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            jobs.append(job)
+            size += len(job.questions)
+        return jobs
+
+    def _loop(self) -> None:
+        # La conexión SQLite de la caché queda ligada al hilo que la abre
+        self.classifier.cache
+        self._ready.set()
+
+        while True:
+            jobs = self._collect()
+            batch = [question for job in jobs for question in job.questions]
+
+            start = time.perf_counter()
+            errors = self._classify_jobs(jobs, batch)
+            elapsed = time.perf_counter() - start
+
+            with self._lock:
+                self.requests += len(jobs)
+                self.questions += len(batch)
+                self.batches += 1
+                self.busy_seconds += elapsed
+                self.wait_seconds += sum(start - job.enqueued_at for job in jobs)
+                self.errors += sum(1 for error in errors if error)
+
+            for job, error in zip(jobs, errors):
+                job.error = error
+                job.done.set()
+
+    def _classify_jobs(self, jobs: List[_Job], batch: List[Dict[str, Any]]) -> List[Optional[str]]:
+        """
+        Clasifica el micro-lote completo; si falla, reintenta cada petición por
+        separado para que una entrada problemática no haga fallar a las demás.
+        Devuelve el error de cada petición (None si se clasificó).
+        """
+        try:
+            self.classifier.classify_batch(batch, show_progress=False)
+            return [None] * len(jobs)
+        except Exception as e:  # pragma: no cover - depende del modelo
+            if len(jobs) == 1:
+                logger.exception("Error clasificando micro-lote")
+                return [str(e)]
+            logger.warning("Error clasificando micro-lote de %d peticiones (%s); se reintentan por separado",
+                           len(jobs), e)
+
+        errors: List[Optional[str]] = []
+        for job in jobs:
+            try:
+                self.classifier.classify_batch(job.questions, show_progress=False)
+                errors.append(None)
+            except Exception as e:  # pragma: no cover - depende del modelo
+                logger.exception("Error clasificando petición de %d preguntas", len(job.questions))
+                errors.append(str(e))
+        return errors
+
+    def metrics(self) -> Dict[str, Any]:
+        """Contadores acumulados desde el arranque"""
+        with self._lock:
+            uptime = time.time() - self.started_at
+            metrics = {
+                "uptime_seconds": uptime,
+                "requests": self.requests,
+                "questions": self.questions,
+                "batches": self.batches,
+                "errors": self.errors,
+                "queued_requests": self._queue.qsize(),
+                "avg_batch_size": self.questions / self.batches if self.batches else 0.0,
+                "avg_queue_wait_ms": 1000 * self.wait_seconds / self.requests if self.requests else 0.0,
+                "busy_seconds": self.busy_seconds,
+                "questions_per_second": self.questions / self.busy_seconds if self.busy_seconds else 0.0,
+                "model_load_seconds": self.classifier.load_seconds,
+            }
+        if self.classifier.cache is not None:
+            metrics["cache"] = self.classifier.cache.stats()
+        if self.classifier.cascade_threshold is not None:
+            metrics["cascade"] = self.classifier.cascade_summary()
+        return metrics
+
+
+def make_handler(batcher: MicroBatcher, config: Dict[str, Any]) -> type:
+    """Handler HTTP ligado a un micro-batcher y a la configuración servida"""
+
+    class ClassificationHandler(BaseHTTPRequestHandler):
+        def _send_json(self, status: int, payload: Any) -> None:
+            body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self) -> None:
+            path = urlparse(self.path).path
+            if path == "/health":
+                self._send_json(200, {
+                    "status": "ok",
+                    "backend": config["backend"],
+                    "config": config,
+                    "uptime_seconds": time.time() - batcher.started_at,
+                })
+            elif path == "/metrics":
+                self._send_json(200, batcher.metrics())
+            else:
+                self._send_json(404, {"error": f"Ruta desconocida: {path}"})
+
+        def do_POST(self) -> None:
+            path = urlparse(self.path).path
+            if path != "/classify":
+                self._send_json(404, {"error": f"Ruta desconocida: {path}"})
+                return
+
+            try:
+                length = int(self.headers.get("Content-Length", 0))
+                payload = json.loads(self.rfile.read(length).decode("utf-8"))
+            except (ValueError, UnicodeDecodeError) as e:
+                self._send_json(400, {"error": f"JSON inválido: {e}"})
+                return
+
+            questions = payload.get("questions") if isinstance(payload, dict) else payload
+            if not isinstance(questions, list):
+                self._send_json(400, {"error": "El cuerpo debe ser una lista de preguntas o {\"questions\": [...]}"})
+                return
+
+            try:
+                self._send_json(200, batcher.submit(questions))
+            except RuntimeError as e:
+                self._send_json(500, {"error": str(e)})
+
+        def log_message(self, format: str, *args: Any) -> None:
+            logger.debug("%s - %s", self.address_string(), format % args)
+
+    return ClassificationHandler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Servidor local de clasificación PAES")
+    parser.add_argument("--host", default="127.0.0.1", help="Interfaz donde escuchar (solo local por defecto)")
+    parser.add_argument("--port", type=int, default=8765, help="Puerto HTTP")
+    parser.add_argument("--temario", type=Path, default=PROJECT_ROOT / "content" / "temario_paes_vs.csv",
+                        help="Ruta al CSV del temario PAES")
+    parser.add_argument("--model", default="MoritzLaurer/mDeBERTa-v3-base-mnli-xnli",
+                        help="Modelo zero-shot de Hugging Face")
+    parser.add_argument("--device", type=int, default=-1, help="Dispositivo para Transformers (-1=CPU, 0=GPU)")
+    parser.add_argument("--backend", choices=CLASSIFIER_BACKENDS, default="nli", help="Backend de clasificación")
+    parser.add_argument("--embedding-model",
+                        default="sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2",
+                        help="Encoder de Hugging Face para --backend embedding")
+    parser.add_argument("--mode", choices=["hierarchical", "flat"], default="hierarchical",
+                        help="hierarchical (recomendado): área → tema → habilidad; flat: una sola llamada NLI conjunta, con más pasadas del modelo por pregunta")
+    parser.add_argument("--cache", type=Path, default=DEFAULT_CLASSIFICATION_CACHE,
+                        help="Archivo SQLite con clasificaciones memorizadas")
+    parser.add_argument("--no-cache", action="store_true", help="Clasificar siempre con el modelo, sin caché")
+    parser.add_argument("--batch-size", type=int, default=16, help="Pares (pregunta, hipótesis) por forward del modelo")
+    parser.add_argument("--cascade-threshold", type=float, default=None,
+                        help="Margen sobre el que se acepta la clasificación por palabras clave")
+    parser.add_argument("--cascade-sample", type=float, default=0.05,
+                        help="Fracción de la cascada contrastada con el modelo")
+    parser.add_argument("--window-ms", type=float, default=20.0,
+                        help="Ventana para agrupar peticiones concurrentes en un micro-lote")
+    parser.add_argument("--max-batch", type=int, default=64, help="Preguntas máximas por micro-lote")
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+        handlers=[logging.StreamHandler()]
+    )
+
+    config = {
+        "backend": args.backend,
+        "temario_path": str(args.temario.resolve()),
+        "model_name": args.model,
+        "device": args.device,
+        "batch_size": args.batch_size,
+        "mode": args.mode,
+        "cache_path": None if args.no_cache else str(args.cache),
+        "cascade_threshold": args.cascade_threshold,
+        "cascade_sample_rate": args.cascade_sample,
+    }
+    if args.backend == "embedding":
+        config["embedding_model"] = args.embedding_model
+
+    classifier = get_classifier(**config)
+    classifier.classifier  # cargar el modelo antes de aceptar peticiones
+    logger.info("Clasificador listo en %.1fs", classifier.load_seconds)
+
+    batcher = MicroBatcher(classifier, window_ms=args.window_ms, max_batch=args.max_batch)
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(batcher, config))
+    logger.info("Servidor de clasificación escuchando en http://%s:%d", args.host, args.port)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        logger.info("Deteniendo servidor")
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -11,14 +11,15 @@ Basado en el temario oficial PAES (temario_paes_vs.csv)
 """
 
 import json
+import hashlib
 import logging
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
-import pandas as pd
-from transformers import pipeline
-from tqdm import tqdm
+from typing import Any, Dict, List, Optional, Tuple
 import time
 
+from classification.cache import DEFAULT_CACHE_DIR, DEFAULT_CLASSIFICATION_CACHE  # noqa: F401 - reexportados
+from temario import load_temario
+
 # Configuración de logging
 logging.basicConfig(
     level=logging.INFO,
@@ -39,6 +40,22 @@ ABILITY_MAP = {
     "ALL": ["Resolver problemas", "Modelar", "Representar", "Argumentar", "Evaluar", "Interpretar", "Localizar"]
 }
 
+# Plantillas de hipótesis para cada etapa
+AREA_TEMPLATE = "Esta pregunta se relaciona con el área de {}"
+TEMA_TEMPLATE = "El tema específico de esta pregunta es {}"
+HABILIDAD_TEMPLATE = "Para resolver esta pregunta se necesita {}"
+
+# Hipótesis conjunta área/tema usada por el modo "flat"
+FLAT_TEMA_TEMPLATE = "Esta pregunta trata sobre {tema}, dentro del área de {area}"
+
+CLASSIFICATION_MODES = ("hierarchical", "flat")
+
+# Tokens reservados a la hipótesis (y tokens especiales) dentro del largo máximo del modelo
+HYPOTHESIS_RESERVE_TOKENS = 48
+# Ninguna opción se recorta por debajo de este largo antes de recortar el enunciado
+MIN_OPTION_TOKENS = 8
+OPTION_PREFIX = "Opción: "
+
 
 class TaxonomyClassifier:
     """
@@ -48,7 +65,13 @@ class TaxonomyClassifier:
     def __init__(self, 
                  temario_path: str = "content/temario_paes_vs.csv",
                  model_name: str = "MoritzLaurer/mDeBERTa-v3-base-mnli-xnli",
-                 device: int = -1):
+                 device: int = -1,
+                 batch_size: int = 16,
+                 chunk_size: int = 256,
+                 mode: str = "hierarchical",
+                 cache_path: Optional[str] = None,
+                 cascade_threshold: Optional[float] = None,
+                 cascade_sample_rate: float = 0.05):
         """
         Inicializa el clasificador
         
@@ -56,16 +79,55 @@ class TaxonomyClassifier:
             temario_path: Ruta al archivo CSV del temario
             model_name: Modelo de Hugging Face a usar
             device: -1 para CPU, 0+ para GPU
+            batch_size: Pares (pregunta, hipótesis) por forward del modelo
+            chunk_size: Preguntas agrupadas por llamada en classify_batch
+            mode: "hierarchical" (área → tema → habilidad en secuencia, el
+                modo recomendado) o "flat" (todos los pares área/tema y
+                habilidades en una sola llamada NLI). Flat evita la espera
+                entre etapas pero hace más pasadas del modelo por pregunta:
+                22 contra 12-14 en M2 y 32 contra 14-16 en M1 con
+                content/temario_paes_vs.csv
+            cache_path: Archivo SQLite donde memorizar clasificaciones
+                (None la desactiva)
+            cascade_threshold: Margen mínimo (0-1) entre la mejor y la segunda
+                etiqueta del preclasificador por palabras clave para aceptar
+                su resultado sin el modelo (None desactiva la cascada)
+            cascade_sample_rate: Fracción de preguntas aceptadas por palabras
+                clave que igual se clasifican con el modelo para medir el
+                acuerdo entre ambos
         """
+        if mode not in CLASSIFICATION_MODES:
+            raise ValueError(f"Modo de clasificación desconocido: {mode}")
+
         self.temario_path = Path(temario_path)
         self.model_name = model_name
         self.device = device
+        self.batch_size = batch_size
+        self.chunk_size = chunk_size
+        self.mode = mode
+        self.cache_path = cache_path
+        self._cache = None
+        self.cascade_threshold = cascade_threshold
+        self.cascade_sample_rate = cascade_sample_rate
+        self._keyword_classifier = None
+        self.cascade_stats = {'total': 0, 'short_circuited': 0, 'sampled': 0, 'agreed': 0}
+        
+        # Segundos dedicados a cargar temario y modelo
+        self.load_seconds = 0.0
         
         # Cargar temario
+        start = time.perf_counter()
         self._load_temario()
+        self.load_seconds += time.perf_counter() - start
         
         # Inicializar pipeline (lazy loading)
         self._classifier = None
+        self._tokenizer = None
+        
+        # Largo en tokens de cada texto ajustado al modelo, para ordenar los lotes
+        self._premise_lengths: Dict[str, int] = {}
+        # Enunciado y opciones de cada texto completo, para ajustarlo solo si va al modelo
+        self._premise_pieces: Dict[str, Tuple[str, List[str]]] = {}
         
     def _load_temario(self):
         """Carga y procesa el temario PAES"""
@@ -73,42 +135,94 @@ class TaxonomyClassifier:
             raise FileNotFoundError(f"No se encuentra el archivo de temario: {self.temario_path}")
             
         logger.info(f"Cargando temario desde: {self.temario_path}")
-        self.df_temario = pd.read_csv(self.temario_path)
-        
-        # Limpiar espacios en blanco
-        self.df_temario['Subject'] = self.df_temario['Subject'].str.strip().str.upper()
-        self.df_temario['Area_tematica'] = self.df_temario['Area_tematica'].str.strip()
-        self.df_temario['Tema'] = self.df_temario['Tema'].str.strip()
+        self.temario = load_temario(self.temario_path)
+        self.temario_hash = self.temario.sha256
         
-        # Crear estructura de datos para búsqueda eficiente
-        self.subjects = sorted(self.df_temario['Subject'].unique())
+        # Vistas del índice usadas por los candidatos y el preclasificador
+        self.subjects = list(self.temario.subject_codes)
         self.areas_by_subject = {}
         self.temas_by_area = {}
         
         for subject in self.subjects:
-            df_subject = self.df_temario[self.df_temario['Subject'] == subject]
-            areas = sorted(df_subject['Area_tematica'].unique())
+            areas = list(self.temario.areas(subject))
             self.areas_by_subject[subject] = areas
             
             for area in areas:
-                df_area = df_subject[df_subject['Area_tematica'] == area]
-                temas = sorted(df_area['Tema'].unique())
-                self.temas_by_area[f"{subject}_{area}"] = temas
+                self.temas_by_area[f"{subject}_{area}"] = list(self.temario.temas(subject, area))
                 
-        logger.info(f"Temario cargado: {len(self.subjects)} materias, {len(self.df_temario)} entradas")
+        logger.info(f"Temario cargado: {len(self.subjects)} materias, {self.temario.row_count} entradas")
         
     @property
     def classifier(self):
         """Lazy loading del modelo de clasificación"""
         if self._classifier is None:
             logger.info(f"Cargando modelo: {self.model_name}")
+            start = time.perf_counter()
+            # transformers se importa recién aquí: cargar el temario o consultar
+            # la caché no debe pagar su importación
+            from transformers import pipeline
             self._classifier = pipeline(
                 "zero-shot-classification",
                 model=self.model_name,
                 device=self.device
             )
+            self.load_seconds += time.perf_counter() - start
             logger.info("Modelo cargado exitosamente")
         return self._classifier
+
+    @property
+    def tokenizer(self):
+        """Tokenizer del modelo; se carga sin el modelo para preparar entradas"""
+        if self._tokenizer is None:
+            if self._classifier is not None:
+                self._tokenizer = self._classifier.tokenizer
+            else:
+                from transformers import AutoTokenizer
+                self._tokenizer = AutoTokenizer.from_pretrained(self.model_name)
+        return self._tokenizer
+
+    @property
+    def max_premise_tokens(self) -> int:
+        """Tokens disponibles para enunciado + opciones junto a la hipótesis más larga"""
+        model_max = self.tokenizer.model_max_length
+        if not model_max or model_max > 4096:  # algunos tokenizers no declaran un máximo real
+            model_max = 512
+        return model_max - HYPOTHESIS_RESERVE_TOKENS
+
+    @property
+    def cache(self):
+        """Caché de clasificaciones, abierta bajo demanda si se configuró `cache_path`"""
+        if self._cache is None and self.cache_path:
+            from classification.cache import ClassificationCache
+            fingerprint = json.dumps(self.cache_fingerprint(), sort_keys=True, ensure_ascii=False)
+            self._cache = ClassificationCache(Path(self.cache_path), fingerprint)
+        return self._cache
+
+    @property
+    def keyword_classifier(self):
+        """Preclasificador por palabras clave de la cascada, construido bajo demanda"""
+        if self._keyword_classifier is None:
+            from classification.keyword_classifier import KeywordClassifier
+            self._keyword_classifier = KeywordClassifier(
+                self.areas_by_subject,
+                self.temas_by_area,
+                {subject: self._habilidad_candidates(subject) for subject in self.subjects},
+            )
+        return self._keyword_classifier
+
+    def cache_fingerprint(self) -> Dict[str, Any]:
+        """Todo lo que, además del texto, determina el resultado de una clasificación"""
+        from classification.keyword_classifier import KEYWORD_RULES_VERSION
+
+        return {
+            'backend': type(self).__name__,
+            'model_name': self.model_name,
+            'mode': self.mode,
+            'temario': self.temario_hash,
+            'templates': [AREA_TEMPLATE, TEMA_TEMPLATE, HABILIDAD_TEMPLATE, FLAT_TEMA_TEMPLATE],
+            'cascade_threshold': self.cascade_threshold,
+            'keyword_rules': KEYWORD_RULES_VERSION if self.cascade_threshold is not None else None,
+        }
         
     def classify_question(self, 
                          question_text: str, 
@@ -125,6 +239,22 @@ class TaxonomyClassifier:
         Returns:
             Diccionario con clasificación y confianza
         """
+        self._premise_lengths.clear()
+        self._premise_pieces.clear()
+        subject, full_text = self._prepare_input(question_text, subject, options)
+        return self._classify_texts([full_text], subject)[0]
+
+    def _prepare_input(self,
+                       question_text: str,
+                       subject: str,
+                       options: Optional[List[str]] = None) -> Tuple[str, str]:
+        """
+        Normaliza la materia y arma el texto completo (enunciado + opciones)
+
+        El texto no se recorta: es la clave de la caché y la entrada de la
+        cascada de palabras clave. Solo los textos que llegan al modelo se
+        tokenizan y ajustan a su largo máximo (`_fit_for_model`).
+        """
         subject = subject.upper()
         
         # Validar materia
@@ -133,51 +263,102 @@ class TaxonomyClassifier:
             subject = 'ALL'
             
         # Preparar texto completo para clasificación
-        full_text = question_text
-        if options:
-            options_text = " ".join([f"Opción: {opt}" for opt in options])
-            full_text = f"{question_text} {options_text}"
-            
-        # 1. Clasificar área temática
-        if subject in self.areas_by_subject:
-            area_candidates = self.areas_by_subject[subject]
-        else:
-            # Si no hay áreas específicas, usar todas las del temario
-            area_candidates = sorted(self.df_temario['Area_tematica'].unique())
-            
-        area_result = self._classify_with_template(
-            full_text,
-            area_candidates,
-            "Esta pregunta se relaciona con el área de {}"
+        options = list(options or [])
+        full_text = " ".join([question_text] + [f"{OPTION_PREFIX}{opt}" for opt in options])
+        self._premise_pieces[full_text] = (question_text, options)
+        return subject, full_text
+
+    def _fit_for_model(self, texts: List[str]) -> List[str]:
+        """Ajusta al largo del modelo los textos completos que se le van a enviar"""
+        fitted_texts = []
+        for text in texts:
+            question_text, options = self._premise_pieces.get(text, (text, []))
+            fitted, n_tokens = self._fit_premise(question_text, options)
+            self._premise_lengths[fitted] = n_tokens
+            fitted_texts.append(fitted)
+        return fitted_texts
+
+    def _fit_premise(self, question_text: str, options: List[str]) -> Tuple[str, int]:
+        """
+        Arma "enunciado Opción: a Opción: b ..." de modo que quepa en el modelo
+        junto a la hipótesis y devuelve también su largo en tokens.
+
+        Enunciado y opciones se tokenizan una sola vez (con offsets); si no
+        caben, las opciones largas se recortan a un tope común (las cortas
+        quedan intactas) y, si aún no alcanza, se conserva el final del
+        enunciado, donde suele estar la pregunta. Los recortes se hacen sobre
+        los offsets de los tokens, sin volver a tokenizar.
+        """
+        pieces = [question_text] + [f"{OPTION_PREFIX}{opt}" for opt in options]
+        tokenizer = self.tokenizer
+        if not getattr(tokenizer, "is_fast", False):
+            full_text = " ".join(pieces)
+            return full_text, len(full_text) // 4
+
+        encoded = tokenizer(pieces, add_special_tokens=False, return_offsets_mapping=True)
+        offsets = encoded["offset_mapping"]
+        lengths = [len(piece_offsets) for piece_offsets in offsets]
+        budget = self.max_premise_tokens
+
+        if sum(lengths) > budget and len(pieces) > 1:
+            cap = self._option_cap(lengths[1:], budget - lengths[0])
+            for idx in range(1, len(pieces)):
+                if lengths[idx] > cap:
+                    pieces[idx] = pieces[idx][:offsets[idx][cap - 1][1]]
+                    lengths[idx] = cap
+
+        overflow = sum(lengths) - budget
+        if overflow > 0 and lengths[0] > overflow:
+            pieces[0] = pieces[0][offsets[0][overflow][0]:]
+            lengths[0] -= overflow
+
+        return " ".join(pieces), sum(lengths)
+
+    @staticmethod
+    def _option_cap(option_lengths: List[int], budget: int) -> int:
+        """Mayor tope común por opción que hace caber las opciones en `budget`"""
+        cap = max(option_lengths)
+        while cap > MIN_OPTION_TOKENS and sum(min(length, cap) for length in option_lengths) > budget:
+            cap -= 1
+        return max(cap, MIN_OPTION_TOKENS)
+
+    def _length_order(self, texts: List[str]) -> List[int]:
+        """
+        Índices de `texts` de mayor a menor largo en tokens: lotes
+        consecutivos del pipeline quedan con largos parecidos y se rellenan
+        menos
+        """
+        return sorted(
+            range(len(texts)),
+            key=lambda idx: self._premise_lengths.get(texts[idx], len(texts[idx]) // 4),
+            reverse=True,
         )
-        
-        # 2. Clasificar tema específico
-        tema_key = f"{subject}_{area_result['label']}"
+
+    def _area_candidates(self, subject: str) -> List[str]:
+        """Áreas temáticas candidatas para una materia"""
+        if subject in self.areas_by_subject:
+            return self.areas_by_subject[subject]
+        # Si no hay áreas específicas, usar todas las del temario
+        return list(self.temario.all_areas)
+
+    def _tema_candidates(self, subject: str, area: str) -> List[str]:
+        """Temas candidatos dada la materia y el área elegida"""
+        tema_key = f"{subject}_{area}"
         if tema_key in self.temas_by_area:
-            tema_candidates = self.temas_by_area[tema_key]
-        else:
-            # Buscar temas de esa área sin importar la materia
-            df_area = self.df_temario[self.df_temario['Area_tematica'] == area_result['label']]
-            tema_candidates = sorted(df_area['Tema'].unique())
-            
-        if len(tema_candidates) > 0:
-            tema_result = self._classify_with_template(
-                full_text,
-                tema_candidates,
-                "El tema específico de esta pregunta es {}"
-            )
-        else:
-            tema_result = {'label': area_result['label'], 'score': area_result['score']}
-            
-        # 3. Clasificar habilidad
-        habilidades = ABILITY_MAP.get(subject, ABILITY_MAP['ALL'])
-        habilidad_result = self._classify_with_template(
-            full_text,
-            habilidades,
-            "Para resolver esta pregunta se necesita {}"
-        )
-        
-        # Construir resultado
+            return self.temas_by_area[tema_key]
+        # Buscar temas de esa área sin importar la materia
+        return list(self.temario.temas_for_area(area))
+
+    def _habilidad_candidates(self, subject: str) -> List[str]:
+        """Habilidades candidatas para una materia"""
+        return ABILITY_MAP.get(subject, ABILITY_MAP['ALL'])
+
+    @staticmethod
+    def _build_result(subject: str,
+                      area_result: Dict[str, any],
+                      tema_result: Dict[str, any],
+                      habilidad_result: Dict[str, any]) -> Dict[str, any]:
+        """Construye el diccionario de clasificación a partir de las tres etapas"""
         result = {
             'subject': subject,
             'area_tematica': area_result['label'],
@@ -193,9 +374,16 @@ class TaxonomyClassifier:
                 'habilidades': habilidad_result.get('all_scores', {})
             }
         }
-        
+        errors = [stage['error'] for stage in (area_result, tema_result, habilidad_result) if stage.get('error')]
+        if errors:
+            result['error'] = errors[0]
         return result
         
+    def _error_results(self, texts: List[str], subject: str, error: Exception) -> List[Dict[str, any]]:
+        """Un resultado con 'error' por texto: no se memoriza y el llamador ve la falla"""
+        failed = {'label': 'Sin clasificar', 'score': 0.0, 'all_scores': {}, 'error': str(error)}
+        return [self._build_result(subject, failed, failed, failed) for _ in texts]
+        
     def _classify_with_template(self, 
                                text: str, 
                                candidates: List[str], 
@@ -211,28 +399,46 @@ class TaxonomyClassifier:
         Returns:
             Diccionario con resultado de clasificación
         """
+        return self._classify_many([text], candidates, template)[0]
+
+    def _classify_many(self,
+                       texts: List[str],
+                       candidates: List[str],
+                       template: str) -> List[Dict[str, any]]:
+        """
+        Clasificación zero-shot de varios textos con las mismas etiquetas,
+        enviados al pipeline como una lista en lotes de `batch_size`
+        """
         if not candidates:
-            return {'label': 'Sin clasificar', 'score': 0.0, 'all_scores': {}}
+            return [{'label': 'Sin clasificar', 'score': 0.0, 'all_scores': {}} for _ in texts]
             
         try:
-            result = self.classifier(
-                text,
+            order = self._length_order(texts)
+            results = self.classifier(
+                [texts[idx] for idx in order],
                 candidate_labels=candidates,
-                hypothesis_template=template
+                hypothesis_template=template,
+                batch_size=self.batch_size
             )
+            if isinstance(results, dict):
+                results = [results]
             
-            # Crear diccionario de todos los scores
-            all_scores = dict(zip(result['labels'], result['scores']))
-            
-            return {
-                'label': result['labels'][0],
-                'score': result['scores'][0],
-                'all_scores': all_scores
-            }
+            classifications: List[Optional[Dict[str, any]]] = [None] * len(texts)
+            for idx, result in zip(order, results):
+                classifications[idx] = {
+                    'label': result['labels'][0],
+                    'score': result['scores'][0],
+                    # Crear diccionario de todos los scores
+                    'all_scores': dict(zip(result['labels'], result['scores']))
+                }
+            return classifications
             
         except Exception as e:
             logger.error(f"Error en clasificación: {e}")
-            return {'label': candidates[0] if candidates else 'Error', 'score': 0.0, 'all_scores': {}}
+            return [
+                {'label': candidates[0] if candidates else 'Error', 'score': 0.0, 'all_scores': {}, 'error': str(e)}
+                for _ in texts
+            ]
             
     def classify_batch(self, 
                       questions: List[Dict[str, any]], 
@@ -240,6 +446,12 @@ class TaxonomyClassifier:
         """
         Clasifica múltiples preguntas en batch
         
+        Las preguntas se agrupan por materia (y por área para la etapa de
+        temas) de modo que cada etapa envía al modelo listas de textos con el
+        mismo conjunto de candidatos, ordenadas por largo en tokens para
+        minimizar el relleno. El resultado por pregunta es el mismo que el de
+        `classify_question`.
+        
         Args:
             questions: Lista de preguntas (deben tener 'content' y 'subject')
             show_progress: Mostrar barra de progreso
@@ -247,38 +459,266 @@ class TaxonomyClassifier:
         Returns:
             Lista de preguntas con clasificación agregada
         """
-        classified_questions = []
-        
-        iterator = tqdm(questions, desc="Clasificando preguntas") if show_progress else questions
-        
-        for question in iterator:
+        self._premise_lengths.clear()
+        self._premise_pieces.clear()
+
+        # Agrupar por materia normalizada
+        groups: Dict[str, List[Tuple[Dict[str, any], str]]] = {}
+        for question in questions:
             try:
-                # Obtener texto y materia
-                text = question.get('content', '')
-                subject = question.get('subject', 'ALL')
-                options = question.get('options', [])
-                
-                # Clasificar
-                classification = self.classify_question(text, subject, options)
-                
-                # Agregar clasificación a la pregunta
-                question['ai_classification'] = classification
-                question['area_tematica'] = classification['area_tematica']
-                question['tema'] = classification['tema']
-                question['habilidad'] = classification['habilidad']
-                question['classification_confidence'] = classification['overall_confidence']
-                
-                classified_questions.append(question)
-                
+                subject, full_text = self._prepare_input(
+                    question.get('content', ''),
+                    question.get('subject', 'ALL'),
+                    question.get('options', [])
+                )
+                groups.setdefault(subject, []).append((question, full_text))
             except Exception as e:
                 logger.error(f"Error clasificando pregunta {question.get('id', 'unknown')}: {e}")
                 question['ai_classification'] = {'error': str(e)}
-                classified_questions.append(question)
-                
-            # Pequeña pausa para no sobrecargar
-            time.sleep(0.1)
-            
-        return classified_questions
+
+        from tqdm import tqdm
+        progress = tqdm(total=len(questions), desc="Clasificando preguntas", disable=not show_progress)
+        progress.update(len(questions) - sum(len(items) for items in groups.values()))
+
+        for subject, items in groups.items():
+            # Trozos de largo homogéneo; cada pregunta recibe su propio resultado,
+            # así que el orden original de `questions` no cambia
+            items.sort(key=lambda item: len(item[1]), reverse=True)
+            for start in range(0, len(items), self.chunk_size):
+                chunk = items[start:start + self.chunk_size]
+                self._classify_chunk(subject, chunk)
+                progress.update(len(chunk))
+
+        progress.close()
+        return questions
+
+    def _classify_chunk(self, subject: str, items: List[Tuple[Dict[str, any], str]]) -> None:
+        """Clasifica en lote un grupo de preguntas de la misma materia"""
+        texts = [full_text for _, full_text in items]
+        for (question, _), classification in zip(items, self._classify_texts(texts, subject)):
+            self._assign_classification(question, classification)
+
+    def _classify_texts(self, texts: List[str], subject: str) -> List[Dict[str, any]]:
+        """
+        Clasifica textos ya preparados de una misma materia. Con caché activa
+        solo se envían al modelo los textos sin resultado memorizado.
+        """
+        cache = self.cache
+        if cache is None:
+            return self._classify_cascade(texts, subject)
+
+        keys = [cache.make_key(subject, text) for text in texts]
+        found = cache.get_many(keys)
+
+        pending = {key: text for key, text in zip(keys, texts) if key not in found}
+        if pending:
+            fresh = dict(zip(pending, self._classify_cascade(list(pending.values()), subject)))
+            cache.put_many({key: result for key, result in fresh.items() if 'error' not in result})
+            found.update(fresh)
+
+        return [dict(found[key]) for key in keys]
+
+    def _classify_cascade(self, texts: List[str], subject: str) -> List[Dict[str, any]]:
+        """
+        Cascada palabras clave → modelo: las preguntas cuyo margen de área y
+        de habilidad supera `cascade_threshold` se resuelven sin el modelo y
+        solo las ambiguas (más una muestra para medir acuerdo) se le envían
+        """
+        if self.cascade_threshold is None:
+            return self._classify_with_model(texts, subject)
+
+        results: List[Optional[Dict[str, any]]] = [None] * len(texts)
+        ambiguous: List[int] = []
+        sampled: List[int] = []
+        for idx, text in enumerate(texts):
+            keyword_result = self._keyword_result(text, subject)
+            if keyword_result is None:
+                ambiguous.append(idx)
+                continue
+            results[idx] = keyword_result
+            if self._in_cascade_sample(text):
+                sampled.append(idx)
+
+        to_model = ambiguous + sampled
+        if to_model:
+            model_results = self._classify_with_model([texts[i] for i in to_model], subject)
+            for idx, model_result in zip(to_model, model_results):
+                if results[idx] is None:
+                    results[idx] = model_result
+                    continue
+                self.cascade_stats['sampled'] += 1
+                if (results[idx]['area_tematica'] == model_result['area_tematica']
+                        and results[idx]['tema'] == model_result['tema']):
+                    self.cascade_stats['agreed'] += 1
+
+        self.cascade_stats['total'] += len(texts)
+        self.cascade_stats['short_circuited'] += len(texts) - len(ambiguous)
+        return results
+
+    def _classify_with_model(self, texts: List[str], subject: str) -> List[Dict[str, any]]:
+        """Ajusta los textos al modelo (aquí se carga el tokenizer) y los clasifica"""
+        try:
+            fitted = self._fit_for_model(texts)
+        except Exception as e:
+            logger.error(f"Error preparando textos para el modelo: {e}")
+            return self._error_results(texts, subject, e)
+        return self._classify_prepared(fitted, subject)
+
+    def _keyword_result(self, text: str, subject: str) -> Optional[Dict[str, any]]:
+        """Resultado del preclasificador si sus márgenes superan el umbral"""
+        stages = self.keyword_classifier.classify(text, subject)
+        if stages is None:
+            return None
+        if min(stages['area']['margin'], stages['habilidad']['margin']) < self.cascade_threshold:
+            return None
+
+        result = self._build_result(subject, stages['area'], stages['tema'], stages['habilidad'])
+        result['source'] = 'keywords'
+        return result
+
+    def _in_cascade_sample(self, text: str) -> bool:
+        """Muestra determinista (por hash del texto) de preguntas a contrastar con el modelo"""
+        if self.cascade_sample_rate <= 0:
+            return False
+        bucket = int(hashlib.sha256(text.encode("utf-8")).hexdigest()[:8], 16) / 0xFFFFFFFF
+        return bucket < self.cascade_sample_rate
+
+    def cascade_summary(self) -> Dict[str, Any]:
+        """Fracción resuelta por palabras clave y tasa de acuerdo con el modelo en la muestra"""
+        stats = self.cascade_stats
+        return {
+            **stats,
+            'short_circuit_rate': stats['short_circuited'] / stats['total'] if stats['total'] else 0.0,
+            'agreement_rate': stats['agreed'] / stats['sampled'] if stats['sampled'] else None,
+        }
+
+    def _classify_prepared(self, texts: List[str], subject: str) -> List[Dict[str, any]]:
+        """Clasifica con el modelo textos ya preparados de una misma materia"""
+        if self.mode == "flat":
+            return self._classify_flat(texts, subject)
+
+        # 1. Áreas: mismos candidatos para todo el grupo
+        area_results = self._classify_many(texts, self._area_candidates(subject), AREA_TEMPLATE)
+
+        # 2. Temas: un lote por cada área elegida
+        tema_results: List[Optional[Dict[str, any]]] = [None] * len(texts)
+        by_area: Dict[str, List[int]] = {}
+        for idx, area_result in enumerate(area_results):
+            by_area.setdefault(area_result['label'], []).append(idx)
+
+        for area, indices in by_area.items():
+            tema_candidates = self._tema_candidates(subject, area)
+            if len(tema_candidates) > 0:
+                results = self._classify_many([texts[i] for i in indices], tema_candidates, TEMA_TEMPLATE)
+            else:
+                results = [
+                    {'label': area_results[i]['label'], 'score': area_results[i]['score']}
+                    for i in indices
+                ]
+            for idx, result in zip(indices, results):
+                tema_results[idx] = result
+
+        # 3. Habilidades: mismos candidatos para todo el grupo
+        habilidad_results = self._classify_many(texts, self._habilidad_candidates(subject), HABILIDAD_TEMPLATE)
+
+        return [
+            self._build_result(subject, area_result, tema_result, habilidad_result)
+            for area_result, tema_result, habilidad_result in zip(area_results, tema_results, habilidad_results)
+        ]
+
+    @staticmethod
+    def _assign_classification(question: Dict[str, any], classification: Dict[str, any]) -> None:
+        """Agrega la clasificación a la pregunta"""
+        question['ai_classification'] = classification
+        question['area_tematica'] = classification['area_tematica']
+        question['tema'] = classification['tema']
+        question['habilidad'] = classification['habilidad']
+        question['classification_confidence'] = classification['overall_confidence']
+
+    def _flat_hypotheses(self, subject: str) -> Dict[str, Tuple[str, str, str]]:
+        """
+        Hipótesis del modo flat para una materia: una por cada par
+        (área, tema) y una por habilidad, mapeadas a (tipo, área, etiqueta)
+        """
+        hypotheses: Dict[str, Tuple[str, str, str]] = {}
+        for area in self._area_candidates(subject):
+            temas = self._tema_candidates(subject, area) or [area]
+            for tema in temas:
+                hypotheses[FLAT_TEMA_TEMPLATE.format(tema=tema, area=area)] = ('tema', area, tema)
+        for habilidad in self._habilidad_candidates(subject):
+            hypotheses[HABILIDAD_TEMPLATE.format(habilidad)] = ('habilidad', '', habilidad)
+        return hypotheses
+
+    def _classify_flat(self, texts: List[str], subject: str) -> List[Dict[str, any]]:
+        """
+        Clasifica con una sola llamada NLI por lote: cada texto se puntúa
+        contra todos los pares (área, tema) y todas las habilidades a la vez
+        (multi_label, puntuaciones de implicación independientes). El área es
+        la de mayor puntuación entre sus temas, el tema el mejor dentro de esa
+        área, y las confianzas se normalizan dentro de cada nivel.
+
+        El cross-encoder hace una pasada por par (texto, hipótesis), así que
+        cada texto cuesta len(_flat_hypotheses) pasadas: la suma de temas de
+        todas las áreas más las habilidades. El modo jerárquico solo puntúa
+        los temas del área elegida (áreas + temas de un área + habilidades),
+        por lo que siempre hace menos pasadas; con content/temario_paes_vs.csv
+        son 22 contra 12-14 en M2, 32 contra 14-16 en M1 y 19 contra 13 en L.
+        Flat conviene solo cuando importa la latencia de una pregunta (una
+        llamada en vez de tres en serie), no el rendimiento de un lote.
+        """
+        hypotheses = self._flat_hypotheses(subject)
+
+        try:
+            order = self._length_order(texts)
+            ordered_results = self.classifier(
+                [texts[idx] for idx in order],
+                candidate_labels=list(hypotheses),
+                hypothesis_template="{}",
+                multi_label=True,
+                batch_size=self.batch_size
+            )
+            if isinstance(ordered_results, dict):
+                ordered_results = [ordered_results]
+            results = [None] * len(texts)
+            for idx, result in zip(order, ordered_results):
+                results[idx] = result
+        except Exception as e:
+            logger.error(f"Error en clasificación: {e}")
+            return self._error_results(texts, subject, e)
+
+        classifications = []
+        for result in results:
+            pair_scores: Dict[str, Dict[str, float]] = {}
+            habilidad_scores: Dict[str, float] = {}
+            for hypothesis, score in zip(result['labels'], result['scores']):
+                kind, area, label = hypotheses[hypothesis]
+                if kind == 'tema':
+                    pair_scores.setdefault(area, {})[label] = score
+                else:
+                    habilidad_scores[label] = score
+
+            area_scores = {area: max(temas.values()) for area, temas in pair_scores.items()}
+            area_result = self._normalised_result(area_scores)
+            tema_result = self._normalised_result(pair_scores.get(area_result['label'], {}))
+            habilidad_result = self._normalised_result(habilidad_scores)
+            classifications.append(self._build_result(subject, area_result, tema_result, habilidad_result))
+
+        return classifications
+
+    @staticmethod
+    def _normalised_result(scores: Dict[str, float]) -> Dict[str, any]:
+        """Etiqueta ganadora y puntuaciones normalizadas a suma 1, ordenadas de mayor a menor"""
+        if not scores:
+            return {'label': 'Sin clasificar', 'score': 0.0, 'all_scores': {}}
+
+        total = sum(scores.values())
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+        all_scores = {
+            label: (score / total if total > 0 else 1.0 / len(scores))
+            for label, score in ranked
+        }
+        label = ranked[0][0]
+        return {'label': label, 'score': all_scores[label], 'all_scores': all_scores}
         
     def get_taxonomy_summary(self) -> Dict[str, any]:
         """
@@ -305,6 +745,43 @@ class TaxonomyClassifier:
         return summary
 
 
+# Clasificadores ya construidos en este proceso, por configuración
+_CLASSIFIER_REGISTRY: Dict[Tuple[Tuple[str, Any], ...], TaxonomyClassifier] = {}
+
+
+CLASSIFIER_BACKENDS = ("nli", "embedding", "onnx")
+
+
+def _backend_class(backend: str) -> type:
+    """Clase de clasificador para un backend (los alternativos se importan bajo demanda)"""
+    if backend == "nli":
+        return TaxonomyClassifier
+    if backend == "embedding":
+        from classification.embedding_classifier import EmbeddingTaxonomyClassifier
+        return EmbeddingTaxonomyClassifier
+    if backend == "onnx":
+        from classification.onnx_classifier import OnnxTaxonomyClassifier
+        return OnnxTaxonomyClassifier
+    raise ValueError(f"Backend de clasificación desconocido: {backend}")
+
+
+def get_classifier(backend: str = "nli", **kwargs: Any) -> TaxonomyClassifier:
+    """
+    Devuelve el clasificador del proceso para una configuración dada,
+    construyéndolo solo la primera vez.
+
+    Evita releer el temario y recargar el modelo por cada PDF cuando un mismo
+    worker procesa varios archivos.
+    """
+    if "temario_path" in kwargs:
+        kwargs["temario_path"] = str(Path(kwargs["temario_path"]).resolve())
+    key = (("backend", backend),) + tuple(sorted(kwargs.items()))
+
+    if key not in _CLASSIFIER_REGISTRY:
+        _CLASSIFIER_REGISTRY[key] = _backend_class(backend)(**kwargs)
+    return _CLASSIFIER_REGISTRY[key]
+
+
 def main():
     """Función principal para pruebas"""
     import argparse
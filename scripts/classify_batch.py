@@ -4,17 +4,29 @@ Script auxiliar para clasificación batch de preguntas
 =====================================================
 
 Lee preguntas desde stdin, las clasifica y devuelve el resultado por stdout
+
+Si hay un servidor de clasificación (`classification/server.py`) corriendo
+con la misma configuración, las preguntas se le envían en vez de cargar el
+modelo en este proceso.
+
+Con `--stream` la entrada JSONL se lee de a micro-lotes y cada pregunta
+clasificada se escribe (y se vacía a disco) apenas termina su lote; si el
+archivo de `--output` ya existe se retoma después del último id escrito.
 """
 
 import sys
 import json
 import os
+import time
+from itertools import islice
 from pathlib import Path
 
 # Agregar el directorio scripts al path
 sys.path.insert(0, str(Path(__file__).parent))
 
-from classification.taxonomy_classifier import TaxonomyClassifier
+# Solo el cliente se importa al inicio: transformers se carga únicamente si
+# hay que clasificar en este proceso
+from classification.client import DEFAULT_SERVER_URL, ClassificationClient
 
 
 def parse_args():
@@ -32,17 +44,235 @@ def parse_args():
     parser.add_argument("--model", default="MoritzLaurer/mDeBERTa-v3-base-mnli-xnli",
                         help="Modelo zero-shot de Hugging Face")
     parser.add_argument("--device", type=int, default=-1, help="Dispositivo para Transformers (-1=CPU, 0=GPU)")
+    parser.add_argument("--backend", choices=["nli", "embedding", "onnx"], default="nli",
+                        help="nli: zero-shot con --model; embedding: similitud coseno con --embedding-model; onnx: --model cuantizado int8 en onnxruntime")
+    parser.add_argument("--embedding-model",
+                        default="sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2",
+                        help="Encoder de Hugging Face para --backend embedding")
+    parser.add_argument("--mode", choices=["hierarchical", "flat"], default="hierarchical",
+                        help="hierarchical (recomendado): área → tema → habilidad; flat: una sola llamada NLI conjunta, con más pasadas del modelo por pregunta")
+    parser.add_argument("--cache", type=Path, default=None,
+                        help="Archivo SQLite con clasificaciones memorizadas por texto de pregunta "
+                             "(por defecto ~/.cache/paes_classifier/classifications.sqlite)")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Clasificar siempre con el modelo, sin caché")
+    parser.add_argument("--cascade-threshold", type=float, default=None,
+                        help="Aceptar la clasificación por palabras clave cuando su margen supere este valor (0-1) y enviar al modelo solo las preguntas ambiguas")
+    parser.add_argument("--cascade-sample", type=float, default=0.05,
+                        help="Fracción de preguntas resueltas por palabras clave que también se clasifican con el modelo para medir acuerdo")
+    parser.add_argument("--batch-size", type=int, default=16,
+                        help="Pares (pregunta, hipótesis) por forward del modelo")
+    parser.add_argument("--server", default=DEFAULT_SERVER_URL,
+                        help="URL del servidor de clasificación a usar si está corriendo (o $PAES_CLASSIFIER_URL)")
+    parser.add_argument("--no-server", action="store_true",
+                        help="Clasificar siempre en este proceso aunque haya un servidor activo")
+    parser.add_argument("--stream", action="store_true",
+                        help="Leer JSONL de a micro-lotes y escribir cada resultado al terminar (memoria constante, reanudable)")
+    parser.add_argument("--chunk-size", type=int, default=64,
+                        help="Preguntas por micro-lote en modo --stream")
     parser.add_argument("--summary", action="store_true",
                         help="Imprimir un resumen de áreas/temas tras clasificar")
     parser.add_argument("--format", choices=["json", "jsonl"], default="json",
                         help="Formato de escritura cuando se usa --output")
     return parser.parse_args()
 
+def write_results(args, classified_questions):
+    """Imprime el resumen opcional y escribe el resultado en --output o stdout"""
+    if args.summary:
+        areas = {}
+        for q in classified_questions:
+            area = q.get("area_tematica", "Sin área")
+            areas[area] = areas.get(area, 0) + 1
+        print("Resumen por área temática:")
+        for area, count in sorted(areas.items(), key=lambda item: item[1], reverse=True):
+            print(f"  - {area}: {count}")
+
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        if args.format == "jsonl":
+            args.output.write_text(
+                "\n".join(json.dumps(q, ensure_ascii=False) for q in classified_questions),
+                encoding="utf-8"
+            )
+        else:
+            args.output.write_text(json.dumps(classified_questions, ensure_ascii=False, indent=2), encoding="utf-8")
+        print(f"Resultados guardados en {args.output}")
+    else:
+        print(json.dumps(classified_questions, ensure_ascii=False))
+
+def open_classifier(args):
+    """
+    Devuelve la función que clasifica una lista de preguntas: el servidor si
+    está corriendo con la misma configuración, o un clasificador local
+    """
+    classifier_kwargs = {
+        "temario_path": str(args.temario),
+        "model_name": args.model,
+        "device": args.device,
+        "batch_size": args.batch_size,
+        "mode": args.mode,
+        "cascade_threshold": args.cascade_threshold,
+        "cascade_sample_rate": args.cascade_sample,
+    }
+    if args.backend == "embedding":
+        classifier_kwargs["embedding_model"] = args.embedding_model
+
+    client = None if args.no_server else ClassificationClient(args.server)
+    if client is not None and client.serves({"backend": args.backend, **classifier_kwargs}):
+        print(f"Usando servidor de clasificación en {args.server}", file=sys.stderr)
+        return client.classify, None
+
+    from classification.taxonomy_classifier import DEFAULT_CLASSIFICATION_CACHE, get_classifier
+
+    classifier_kwargs["cache_path"] = None if args.no_cache else str(args.cache or DEFAULT_CLASSIFICATION_CACHE)
+    classifier = get_classifier(backend=args.backend, **classifier_kwargs)
+
+    def classify(questions):
+        return classifier.classify_batch(
+            questions,
+            show_progress=not args.output and not args.stream  # mostrar progreso si se emplea via CLI interactivo
+        )
+
+    return classify, classifier
+
+
+def report_stats(args, classifier, total, elapsed):
+    """Throughput, caché y cascada por stderr"""
+    throughput = total / elapsed if elapsed > 0 else 0.0
+    print(
+        f"Clasificadas {total} preguntas en {elapsed:.1f}s ({throughput:.2f} preguntas/s)",
+        file=sys.stderr
+    )
+    if classifier is None:
+        return
+    if classifier.cache is not None:
+        stats = classifier.cache.stats()
+        print(
+            f"Caché de clasificación: {stats['hits']} aciertos, {stats['misses']} fallos "
+            f"({stats['hit_rate']:.1%})",
+            file=sys.stderr
+        )
+    if args.cascade_threshold is not None:
+        cascade = classifier.cascade_summary()
+        agreement = (
+            f"{cascade['agreement_rate']:.1%} en {cascade['sampled']} muestreadas"
+            if cascade['agreement_rate'] is not None else "sin muestra"
+        )
+        print(
+            f"Cascada por palabras clave: {cascade['short_circuited']}/{cascade['total']} resueltas sin modelo "
+            f"({cascade['short_circuit_rate']:.1%}); acuerdo con el modelo: {agreement}",
+            file=sys.stderr
+        )
+
+
+def iter_jsonl(handle):
+    """Preguntas de un flujo JSONL, una por línea, sin leerlo completo"""
+    for line_number, line in enumerate(handle, start=1):
+        if not line.strip():
+            continue
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Línea {line_number} no es JSON válido: {e}") from e
+
+
+def resume_point(output):
+    """
+    Cantidad de registros completos ya escritos en `output` y el id del
+    último. Una última línea incompleta (caída a mitad de escritura) se
+    descarta truncando el archivo.
+    """
+    if not output.exists():
+        return 0, None
+
+    written = 0
+    last_line = None
+    valid_bytes = 0
+    with open(output, "rb") as f:
+        for raw in f:
+            if not raw.endswith(b"\n"):
+                break
+            valid_bytes += len(raw)
+            if raw.strip():
+                written += 1
+                last_line = raw
+
+    if valid_bytes < output.stat().st_size:
+        with open(output, "r+b") as f:
+            f.truncate(valid_bytes)
+
+    last_id = json.loads(last_line).get("id") if last_line else None
+    return written, last_id
+
+
+def stream(args, classify):
+    """Clasifica JSONL de a micro-lotes escribiendo cada resultado al terminar su lote"""
+    skip, last_id = (0, None)
+    if args.output:
+        skip, last_id = resume_point(args.output)
+        if skip:
+            print(f"Reanudando después de {skip} preguntas (último id: {last_id})", file=sys.stderr)
+
+    source = open(args.input, encoding="utf-8") if args.input else sys.stdin
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        sink = open(args.output, "a", encoding="utf-8")
+    else:
+        sink = sys.stdout
+
+    total = 0
+    start = time.perf_counter()
+    try:
+        records = iter_jsonl(source)
+        if skip:
+            last_skipped = None
+            for last_skipped in islice(records, skip):
+                pass
+            if last_id is not None and (last_skipped or {}).get("id") != last_id:
+                raise ValueError(
+                    f"La entrada no coincide con {args.output}: se esperaba el id {last_id} "
+                    f"en la posición {skip} y se encontró {(last_skipped or {}).get('id')}"
+                )
+
+        while True:
+            batch = list(islice(records, args.chunk_size))
+            if not batch:
+                break
+            for item in batch:
+                item.setdefault("subject", args.subject)
+
+            for classified in classify(batch):
+                sink.write(json.dumps(classified, ensure_ascii=False) + "\n")
+            sink.flush()
+            if args.output:
+                os.fsync(sink.fileno())
+            total += len(batch)
+    finally:
+        if args.input:
+            source.close()
+        if args.output:
+            sink.close()
+
+    return total, time.perf_counter() - start
+
+
 def main():
     """Función principal"""
     args = parse_args()
 
     try:
+        if args.stream:
+            if args.input and args.input.suffix.lower() != ".jsonl":
+                raise ValueError("--stream requiere una entrada JSONL")
+            if args.input and not args.input.exists():
+                raise FileNotFoundError(f"No existe el archivo de entrada: {args.input}")
+            classify, classifier = open_classifier(args)
+            total, elapsed = stream(args, classify)
+            report_stats(args, classifier, total, elapsed)
+            if args.output:
+                print(f"Resultados guardados en {args.output}", file=sys.stderr)
+            return
+
         if args.input:
             if not args.input.exists():
                 raise FileNotFoundError(f"No existe el archivo de entrada: {args.input}")
@@ -60,41 +290,16 @@ def main():
         if not isinstance(questions, list):
             raise ValueError("El formato de entrada debe ser una lista de preguntas")
 
-        classifier = TaxonomyClassifier(
-            temario_path=str(args.temario),
-            model_name=args.model,
-            device=args.device
-        )
-
         for question in questions:
             question.setdefault("subject", args.subject)
 
-        classified_questions = classifier.classify_batch(
-            questions,
-            show_progress=not args.output  # mostrar progreso si se emplea via CLI interactivo
-        )
+        classify, classifier = open_classifier(args)
 
-        if args.summary:
-            areas = {}
-            for q in classified_questions:
-                area = q.get("area_tematica", "Sin área")
-                areas[area] = areas.get(area, 0) + 1
-            print("Resumen por área temática:")
-            for area, count in sorted(areas.items(), key=lambda item: item[1], reverse=True):
-                print(f"  - {area}: {count}")
+        start = time.perf_counter()
+        classified_questions = classify(questions)
+        report_stats(args, classifier, len(classified_questions), time.perf_counter() - start)
 
-        if args.output:
-            args.output.parent.mkdir(parents=True, exist_ok=True)
-            if args.format == "jsonl":
-                args.output.write_text(
-                    "\n".join(json.dumps(q, ensure_ascii=False) for q in classified_questions),
-                    encoding="utf-8"
-                )
-            else:
-                args.output.write_text(json.dumps(classified_questions, ensure_ascii=False, indent=2), encoding="utf-8")
-            print(f"Resultados guardados en {args.output}")
-        else:
-            print(json.dumps(classified_questions, ensure_ascii=False))
+        write_results(args, classified_questions)
 
     except Exception as e:
         print(f"Error en classify_batch.py: {str(e)}", file=sys.stderr)
@@ -18,6 +18,8 @@ from openai import AsyncOpenAI
 import logging
 from pathlib import Path
 
+from temario import load_temario
+
 # Configuración de logging
 logging.basicConfig(
     level=logging.INFO,
@@ -75,36 +77,8 @@ class QuestionGenerator:
         
     def _load_temario(self) -> Dict[str, Dict]:
         """Carga el temario desde el archivo CSV."""
-        temario = {}
-        
         try:
-            with open(TEMARIO_CSV, "r", encoding="utf-8") as f:
-                content = f.read()
-                lines = [line for line in content.split('\n') if line.strip()]
-                
-                header = [h.strip() for h in lines[0].split(';')]
-                
-                for line in lines[1:]:
-                    values = [v.strip() for v in line.split(';')]
-                    if len(values) >= len(header):
-                        record = {header[i]: values[i] for i in range(len(header))}
-                        
-                        subject = record.get("Subject")
-                        area = record.get("Área Temática")
-                        tema = record.get("Tema")
-                        subtema = record.get("Subtema")
-                        
-                        if not all([subject, area, tema]):
-                            continue
-                            
-                        if subject not in temario:
-                            temario[subject] = {}
-                        if area not in temario[subject]:
-                            temario[subject][area] = {}
-                        if tema not in temario[subject][area]:
-                            temario[subject][area][tema] = []
-                        if subtema:
-                            temario[subject][area][tema].append(subtema)
+            temario = load_temario(TEMARIO_CSV).as_nested()
             
             logger.info(f"Temario cargado: {', '.join(temario.keys())} asignaturas")
             return temario
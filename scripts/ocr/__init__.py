@@ -9,6 +9,18 @@ Este módulo proporciona herramientas para procesar PDFs PAES:
 - Asociación pregunta-imagen
 """
 
-from .pdf_processor import PDFProcessor
+__all__ = ['PDFDocument', 'PDFProcessor']
 
-__all__ = ['PDFProcessor']
\ No newline at end of file
+_EXPORTS = {
+    'PDFDocument': 'document',
+    'PDFProcessor': 'pdf_processor',
+}
+
+
+def __getattr__(name):
+    # Importación diferida: ocr.manifest u ocr.ocr_cache no deben cargar
+    # PyMuPDF, Tesseract ni el clasificador al importar el paquete
+    if name in _EXPORTS:
+        from importlib import import_module
+        return getattr(import_module(f".{_EXPORTS[name]}", __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
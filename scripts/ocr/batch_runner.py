@@ -2,16 +2,16 @@
 
 from __future__ import annotations
 
+import os
 import sys
 import json
 from concurrent.futures import ProcessPoolExecutor, as_completed
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, Iterable, Optional
+from typing import Dict, Iterable, List, Optional
 
 import click
 from rich.console import Console
-from rich.progress import Progress
 
 CURRENT_DIR = Path(__file__).resolve().parent
 SCRIPTS_DIR = CURRENT_DIR.parent
@@ -20,7 +20,16 @@ for candidate in (SCRIPTS_DIR, PROJECT_ROOT):
     if str(candidate) not in sys.path:
         sys.path.insert(0, str(candidate))
 
-from ocr.pdf_processor import PDFProcessor, infer_subject_from_name  # noqa: E402
+from ocr.manifest import Manifest, config_hash, file_sha256  # noqa: E402
+from ocr.ocr_cache import OCRCache  # noqa: E402
+from ocr.pdf_processor import (  # noqa: E402
+    DEFAULT_CLASSIFICATION_CACHE,
+    DEFAULT_OCR_CACHE,
+    PIPELINE_VERSION,
+    PDFProcessor,
+    get_classifier,
+    infer_subject_from_name,
+)
 
 console = Console()
 
@@ -35,23 +44,110 @@ class PipelineConfig:
     temario: Path
     model: str
     device: int
+    classifier_mode: str = "hierarchical"
+    classifier_backend: str = "nli"
+    embedding_model: Optional[str] = None
+    classification_cache: Optional[Path] = None
+    cascade_threshold: Optional[float] = None
+    cascade_sample_rate: float = 0.05
+    dpi: int = 300
+    use_text_layer: bool = True
+    page_jobs: int = 1
+    ocr_cache: Optional[Path] = DEFAULT_OCR_CACHE
+    ocr_cache_size: int = 512
+    image_store: Optional[Path] = None
+    image_phash_distance: Optional[int] = None
+    table_prefilter: bool = True
 
 
 def _build_classifier_kwargs(cfg: PipelineConfig, subject: Optional[str]) -> Optional[Dict[str, object]]:
     if not cfg.auto_classify or not subject:
         return None
-    return {
+    kwargs = {
+        "backend": cfg.classifier_backend,
         "temario_path": str(cfg.temario),
         "model_name": cfg.model,
         "device": cfg.device,
+        "mode": cfg.classifier_mode,
+        "cache_path": str(cfg.classification_cache) if cfg.classification_cache else None,
+        "cascade_threshold": cfg.cascade_threshold,
+        "cascade_sample_rate": cfg.cascade_sample_rate,
+    }
+    if cfg.classifier_backend == "embedding" and cfg.embedding_model:
+        kwargs["embedding_model"] = cfg.embedding_model
+    return kwargs
+
+
+def _pdf_subject(pdf_path: Path, cfg: PipelineConfig) -> Optional[str]:
+    return cfg.subject or infer_subject_from_name(pdf_path)
+
+
+def _init_worker(cfg: PipelineConfig, subject: Optional[str]) -> None:
+    """
+    Inicializador del pool: carga el clasificador una sola vez por proceso
+
+    `subject` es la materia de algún PDF pendiente que se va a clasificar;
+    sin ella (clasificación desactivada o materias no inferibles) no se
+    carga el modelo.
+    """
+    classifier_kwargs = _build_classifier_kwargs(cfg, subject)
+    if classifier_kwargs is not None:
+        get_classifier(**classifier_kwargs).classifier
+
+
+def _output_file(pdf_path: Path, cfg: PipelineConfig) -> Path:
+    return cfg.output / pdf_path.stem / "preguntas.json"
+
+
+def _pdf_config_hash(pdf_path: Path, cfg: PipelineConfig, temario_hash: Optional[str]) -> str:
+    """Hash de los parámetros que determinan el preguntas.json de un PDF"""
+    subject = _pdf_subject(pdf_path, cfg)
+    classify = cfg.auto_classify and subject is not None
+    return config_hash({
+        "pipeline_version": PIPELINE_VERSION,
+        "skip": cfg.skip,
+        "subject": subject,
+        "auto_classify": classify,
+        "model": cfg.model if classify else None,
+        "classifier_mode": cfg.classifier_mode if classify else None,
+        "classifier_backend": cfg.classifier_backend if classify else None,
+        "embedding_model": cfg.embedding_model if classify and cfg.classifier_backend == "embedding" else None,
+        "cascade_threshold": cfg.cascade_threshold if classify else None,
+        "temario": temario_hash if classify else None,
+        "dpi": cfg.dpi,
+        "use_text_layer": cfg.use_text_layer,
+        "image_store": str(cfg.image_store) if cfg.image_store else None,
+        "image_phash_distance": cfg.image_phash_distance,
+        "table_prefilter": cfg.table_prefilter,
+    })
+
+
+def _load_existing(pdf_path: Path, cfg: PipelineConfig) -> Dict[str, object]:
+    """Reutiliza el preguntas.json vigente de un PDF sin cambios"""
+    result = json.loads(_output_file(pdf_path, cfg).read_text(encoding="utf-8"))
+    return {
+        "pdf": pdf_path.name,
+        "subject": result.get("subject"),
+        "result": result,
+        "cached": True,
     }
 
 
 def _process_single(pdf_path: Path, cfg: PipelineConfig) -> Dict[str, object]:
-    subject = cfg.subject or infer_subject_from_name(pdf_path)
+    subject = _pdf_subject(pdf_path, cfg)
     classifier_kwargs = _build_classifier_kwargs(cfg, subject)
 
-    processor = PDFProcessor(output_dir=str(cfg.output))
+    processor = PDFProcessor(
+        output_dir=str(cfg.output),
+        dpi=cfg.dpi,
+        use_text_layer=cfg.use_text_layer,
+        page_jobs=cfg.page_jobs,
+        ocr_cache_path=str(cfg.ocr_cache) if cfg.ocr_cache else None,
+        ocr_cache_max_mb=cfg.ocr_cache_size,
+        image_store_dir=str(cfg.image_store) if cfg.image_store else None,
+        image_phash_distance=cfg.image_phash_distance,
+        table_prefilter=cfg.table_prefilter,
+    )
     result = processor.process_pdf(
         pdf_path=str(pdf_path),
         subject=subject,
@@ -63,6 +159,14 @@ def _process_single(pdf_path: Path, cfg: PipelineConfig) -> Dict[str, object]:
         "pdf": pdf_path.name,
         "subject": subject,
         "result": result,
+        "worker": os.getpid(),
+        "model_load_seconds": (
+            get_classifier(**classifier_kwargs).load_seconds if classifier_kwargs else 0.0
+        ),
+        "cascade": (
+            get_classifier(**classifier_kwargs).cascade_summary()
+            if classifier_kwargs and cfg.cascade_threshold is not None else None
+        ),
     }
 
 
@@ -93,8 +197,44 @@ def _iter_pdfs(source: Path, pattern: str) -> Iterable[Path]:
               help="Modelo zero-shot de Hugging Face")
 @click.option("--device", type=int, default=-1, show_default=True,
               help="Dispositivo para Transformers (-1=CPU, 0=GPU)")
+@click.option("--classifier-mode", type=click.Choice(["hierarchical", "flat"]), default="hierarchical",
+              show_default=True, help="Clasificación área → tema → habilidad (recomendado) o una sola llamada NLI conjunta, con más pasadas del modelo por pregunta")
+@click.option("--backend", "classifier_backend", type=click.Choice(["nli", "embedding", "onnx"]), default="nli",
+              show_default=True, help="Backend de clasificación: zero-shot NLI, similitud de embeddings o NLI cuantizado en ONNX")
+@click.option("--embedding-model", default="sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2",
+              show_default=True, help="Encoder de Hugging Face para --backend embedding")
+@click.option("--classification-cache", type=click.Path(path_type=Path), default=DEFAULT_CLASSIFICATION_CACHE,
+              help="Archivo SQLite con clasificaciones memorizadas por texto de pregunta")
+@click.option("--no-classification-cache", is_flag=True, default=False,
+              help="Clasificar siempre con el modelo, sin caché")
+@click.option("--cascade-threshold", type=float, default=None,
+              help="Margen (0-1) sobre el que se acepta la clasificación por palabras clave sin usar el modelo")
+@click.option("--cascade-sample", "cascade_sample_rate", type=float, default=0.05, show_default=True,
+              help="Fracción de preguntas resueltas por palabras clave que se contrastan con el modelo")
 @click.option("--jobs", type=int, default=1, show_default=True,
               help="Número de procesos en paralelo")
+@click.option("--page-jobs", type=int, default=1, show_default=True,
+              help="Procesos para OCR de páginas en paralelo dentro de cada PDF")
+@click.option("--dpi", type=int, default=300, show_default=True,
+              help="Resolución de rasterizado para OCR")
+@click.option("--text-layer/--force-ocr", "use_text_layer", default=True, show_default=True,
+              help="Usar la capa de texto nativa del PDF y aplicar OCR solo a las páginas que fallen")
+@click.option("--ocr-cache", type=click.Path(path_type=Path), default=DEFAULT_OCR_CACHE,
+              help="Archivo SQLite de la caché OCR")
+@click.option("--ocr-cache-size", type=int, default=512, show_default=True,
+              help="Tamaño máximo de la caché OCR en MB (expulsión LRU)")
+@click.option("--no-ocr-cache", is_flag=True, default=False,
+              help="No leer ni escribir la caché OCR")
+@click.option("--clear-ocr-cache", is_flag=True, default=False,
+              help="Vaciar la caché OCR antes de procesar")
+@click.option("--image-store", type=click.Path(path_type=Path), default=None,
+              help="Carpeta compartida de imágenes deduplicadas (por defecto <output>/assets)")
+@click.option("--image-phash-distance", type=click.IntRange(0, 7), default=None,
+              help="Reutilizar imágenes casi idénticas cuyo dHash difiera en a lo más N bits")
+@click.option("--table-prefilter/--no-table-prefilter", default=True, show_default=True,
+              help="Ejecutar pdfplumber solo en páginas con trazos que puedan formar una tabla")
+@click.option("--force", is_flag=True, default=False,
+              help="Reprocesar todos los PDFs aunque el manifiesto indique que no cambiaron")
 @click.option("--export-summary", type=click.Path(path_type=Path), default=None,
               help="Ruta opcional para guardar un resumen JSON del procesamiento")
 def run_pipeline(
@@ -107,11 +247,33 @@ def run_pipeline(
     temario: Path,
     model: str,
     device: int,
+    classifier_mode: str,
+    classifier_backend: str,
+    embedding_model: str,
+    classification_cache: Optional[Path],
+    no_classification_cache: bool,
+    cascade_threshold: Optional[float],
+    cascade_sample_rate: float,
     jobs: int,
+    page_jobs: int,
+    dpi: int,
+    use_text_layer: bool,
+    ocr_cache: Path,
+    ocr_cache_size: int,
+    no_ocr_cache: bool,
+    clear_ocr_cache: bool,
+    image_store: Optional[Path],
+    image_phash_distance: Optional[int],
+    table_prefilter: bool,
+    force: bool,
     export_summary: Optional[Path],
 ) -> None:
     output_path.mkdir(parents=True, exist_ok=True)
 
+    if clear_ocr_cache:
+        OCRCache(ocr_cache).clear()
+        console.print(f"[blue]Caché OCR vaciada: {ocr_cache}[/blue]")
+
     cfg = PipelineConfig(
         source=source_path,
         output=output_path,
@@ -121,6 +283,20 @@ def run_pipeline(
         temario=temario,
         model=model,
         device=device,
+        classifier_mode=classifier_mode,
+        classifier_backend=classifier_backend,
+        embedding_model=embedding_model,
+        classification_cache=None if no_classification_cache else classification_cache,
+        cascade_threshold=cascade_threshold,
+        cascade_sample_rate=cascade_sample_rate,
+        dpi=dpi,
+        use_text_layer=use_text_layer,
+        page_jobs=page_jobs,
+        ocr_cache=None if no_ocr_cache else ocr_cache,
+        ocr_cache_size=ocr_cache_size,
+        image_store=image_store,
+        image_phash_distance=image_phash_distance,
+        table_prefilter=table_prefilter,
     )
 
     pdf_files = list(_iter_pdfs(source_path, pattern))
@@ -128,39 +304,102 @@ def run_pipeline(
         console.print(f"[yellow]No se encontraron PDFs en {source_path} con patrón {pattern}.[/yellow]")
         raise SystemExit(1)
 
-    console.print(f"[bold]Procesando {len(pdf_files)} PDFs desde {source_path}[/bold]")
+    manifest = Manifest(output_path / ".manifest.json")
+    temario_hash = file_sha256(temario) if auto_classify and temario.exists() else None
+    cfg_hashes = {pdf: _pdf_config_hash(pdf, cfg, temario_hash) for pdf in pdf_files}
 
     results = []
+    pending: List[Path] = []
+    for pdf in pdf_files:
+        if not force and manifest.is_current(pdf, cfg_hashes[pdf], _output_file(pdf, cfg)):
+            results.append(_load_existing(pdf, cfg))
+        else:
+            pending.append(pdf)
+
+    console.print(
+        f"[bold]Procesando {len(pending)} de {len(pdf_files)} PDFs desde {source_path} "
+        f"({len(pdf_files) - len(pending)} sin cambios)[/bold]"
+    )
+
+    def _record(item: Dict[str, object], pdf: Path) -> None:
+        results.append(item)
+        manifest.record(pdf, cfg_hashes[pdf], _output_file(pdf, cfg))
+        manifest.save()
+
+    from rich.progress import Progress
+
     with Progress(console=console) as progress:
-        task = progress.add_task("Procesando", total=len(pdf_files))
+        task = progress.add_task("Procesando", total=len(pending))
 
         if jobs == 1:
-            for pdf in pdf_files:
+            for pdf in pending:
                 progress.update(task, description=f"{pdf.name}")
-                results.append(_process_single(pdf, cfg))
+                _record(_process_single(pdf, cfg), pdf)
                 progress.advance(task)
         else:
-            with ProcessPoolExecutor(max_workers=jobs) as pool:
+            # Precargar el modelo solo si algún PDF pendiente se va a clasificar
+            preload_subject = next(filter(None, (_pdf_subject(pdf, cfg) for pdf in pending)), None)
+            with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker,
+                                     initargs=(cfg, preload_subject)) as pool:
                 futures = {
-                    pool.submit(_process_single, pdf, cfg): pdf for pdf in pdf_files
+                    pool.submit(_process_single, pdf, cfg): pdf for pdf in pending
                 }
                 for future in as_completed(futures):
                     try:
-                        results.append(future.result())
+                        _record(future.result(), futures[future])
                     except Exception as exc:  # pragma: no cover
                         console.print(f"[red]Error procesando {futures[future].name}: {exc}[/red]")
                     finally:
                         progress.advance(task)
 
+    manifest.save()
+
     total_questions = sum(item["result"]["total_questions"] for item in results)
     total_images = sum(item["result"]["total_images"] for item in results)
     total_tables = sum(item["result"]["total_tables"] for item in results)
 
     console.print("\n[green]Resumen:[/green]")
     console.print(f"  • PDFs procesados: {len(results)}")
+    console.print(f"  • Manifiesto: {len(pdf_files) - len(pending)} sin cambios (hit), {len(pending)} reprocesados (miss)")
     console.print(f"  • Preguntas extraídas: {total_questions}")
     console.print(f"  • Imágenes detectadas: {total_images}")
     console.print(f"  • Tablas detectadas: {total_tables}")
+    load_by_worker = {
+        item["worker"]: item["model_load_seconds"] for item in results if item.get("model_load_seconds")
+    }
+    if load_by_worker:
+        console.print(
+            f"  • Carga de modelo: {sum(load_by_worker.values()):.1f}s en {len(load_by_worker)} proceso(s)"
+        )
+    if cascade_threshold is not None:
+        # Las estadísticas de cada worker son acumulativas: basta la última por proceso
+        cascade_by_worker = {item["worker"]: item["cascade"] for item in results if item.get("cascade")}
+        total = sum(stats["total"] for stats in cascade_by_worker.values())
+        short_circuited = sum(stats["short_circuited"] for stats in cascade_by_worker.values())
+        sampled = sum(stats["sampled"] for stats in cascade_by_worker.values())
+        agreed = sum(stats["agreed"] for stats in cascade_by_worker.values())
+        console.print(
+            f"  • Cascada por palabras clave: {short_circuited}/{total} sin modelo"
+            + (f", acuerdo con el modelo {agreed / sampled:.1%} en {sampled} muestreadas" if sampled else "")
+        )
+    if not no_ocr_cache:
+        fresh = [item["result"].get("metadata", {}) for item in results if not item.get("cached")]
+        cache_hits = sum(metadata.get("ocr_cache_hits", 0) for metadata in fresh)
+        ocr_pages = sum(metadata.get("text_sources", {}).get("ocr", 0) for metadata in fresh)
+        console.print(f"  • Páginas OCR desde caché: {cache_hits}/{ocr_pages}")
+    fresh_images = [item["result"] for item in results if not item.get("cached")]
+    total_images = sum(result.get("total_images", 0) for result in fresh_images)
+    if total_images:
+        reused = sum(result.get("metadata", {}).get("reused_images", 0) for result in fresh_images)
+        console.print(f"  • Imágenes reutilizadas del almacén: {reused}/{total_images}")
+    table_stats = [result.get("metadata", {}).get("table_extraction") for result in fresh_images]
+    table_stats = [stats for stats in table_stats if stats]
+    if table_stats:
+        console.print(
+            f"  • Tablas: pdfplumber en {sum(stats['candidate_pages'] for stats in table_stats)}"
+            f"/{sum(stats['pages'] for stats in table_stats)} páginas, "
+            f"{sum(stats['extraction_seconds'] for stats in table_stats):.1f} s"
+        )
 
     if export_summary:
         export_summary.parent.mkdir(parents=True, exist_ok=True)
@@ -0,0 +1,87 @@
+"""
+Benchmark OCR de una pasada vs. dos pasadas
+===========================================
+
+Compara el OCR histórico (`image_to_string` + `image_to_data`) con la pasada
+única de `PDFProcessor._ocr_page` sobre un PDF de `pruebas/` y verifica que
+el texto y `words_data` resultantes coincidan.
+
+Uso:
+    python scripts/ocr/benchmark_ocr.py pruebas/2023-22-12-29-clavijero-paes-m1.pdf --pages 5
+"""
+
+import sys
+import time
+import argparse
+from pathlib import Path
+
+import pytesseract
+
+CURRENT_DIR = Path(__file__).resolve().parent
+SCRIPTS_DIR = CURRENT_DIR.parent
+if str(SCRIPTS_DIR) not in sys.path:
+    sys.path.insert(0, str(SCRIPTS_DIR))
+
+from ocr.document import PDFDocument  # noqa: E402
+from ocr.pdf_processor import PDFProcessor  # noqa: E402
+
+
+def _normalise(text: str) -> str:
+    """Compara textos ignorando diferencias de espacios en blanco"""
+    return " ".join(text.split())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de OCR de una pasada por página")
+    parser.add_argument("pdf", type=Path, help="PDF a utilizar en la comparación")
+    parser.add_argument("--pages", type=int, default=3, help="Número de páginas a comparar")
+    parser.add_argument("--skip", type=int, default=0, help="Páginas iniciales a omitir")
+    parser.add_argument("--dpi", type=int, default=300, help="Resolución de rasterizado")
+    args = parser.parse_args()
+
+    processor = PDFProcessor(output_dir="./temp/benchmark", dpi=args.dpi)
+
+    two_pass_time = 0.0
+    single_pass_time = 0.0
+    text_matches = 0
+    words_matches = 0
+    compared = 0
+
+    with PDFDocument(args.pdf) as document:
+        total_pages = min(document.page_count, args.skip + args.pages)
+        for page_num in range(args.skip, total_pages):
+            page_img = document.render(page_num, args.dpi)
+            start = time.perf_counter()
+            legacy_text = pytesseract.image_to_string(page_img, lang='spa')
+            legacy_data = pytesseract.image_to_data(page_img, lang='spa', output_type=pytesseract.Output.DICT)
+            two_pass_time += time.perf_counter() - start
+
+            start = time.perf_counter()
+            text, data = processor._ocr_page(page_img)
+            single_pass_time += time.perf_counter() - start
+
+            compared += 1
+            same_text = _normalise(legacy_text) == _normalise(text)
+            same_words = legacy_data == data
+            text_matches += same_text
+            words_matches += same_words
+            print(f"Página {page_num}: texto {'OK' if same_text else 'DIFERENTE'}, "
+                  f"words_data {'OK' if same_words else 'DIFERENTE'}")
+            page_img.close()
+
+    if not compared:
+        print("No hay páginas para comparar")
+        return
+
+    print("\nResumen:")
+    print(f"  - Páginas comparadas: {compared}")
+    print(f"  - Dos pasadas: {two_pass_time:.2f}s ({two_pass_time / compared:.2f}s/página)")
+    print(f"  - Una pasada: {single_pass_time:.2f}s ({single_pass_time / compared:.2f}s/página)")
+    if single_pass_time:
+        print(f"  - Aceleración: {two_pass_time / single_pass_time:.2f}x")
+    print(f"  - Texto coincidente: {text_matches}/{compared}")
+    print(f"  - words_data coincidente: {words_matches}/{compared}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Documento PDF compartido entre extractores
+==========================================
+
+Lee el archivo una sola vez y expone las páginas a los extractores de texto,
+imágenes y tablas:
+
+- PyMuPDF resuelve xref y árbol de páginas una vez para texto, rasterizado e
+  imágenes (reemplaza a pdf2image/poppler)
+- pdfplumber se abre sobre los mismos bytes en memoria solo si se piden tablas
+- cada imagen (xref) se extrae una sola vez aunque se repita en varias páginas
+
+Las bibliotecas PDF se importan al abrir el primer documento, no al importar
+el módulo.
+"""
+
+from __future__ import annotations
+
+import io
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Optional
+
+if TYPE_CHECKING:
+    import fitz  # PyMuPDF
+    import pdfplumber
+    from PIL import Image
+
+
+class PDFDocument:
+    """Contexto por PDF: un único parseo reutilizado por todas las etapas"""
+
+    def __init__(self, pdf_path: Path):
+        """
+        Abre el documento
+
+        Args:
+            pdf_path: Ruta al archivo PDF
+        """
+        import fitz  # PyMuPDF
+
+        self.path = Path(pdf_path)
+        self._data = self.path.read_bytes()
+        self.doc = fitz.open(stream=self._data, filetype="pdf")
+        self._plumber: Optional[pdfplumber.PDF] = None
+        # Recurso del almacén de imágenes ya resuelto para cada xref
+        self.image_assets: Dict[int, Dict[str, Any]] = {}
+
+    def __enter__(self) -> "PDFDocument":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    @property
+    def page_count(self) -> int:
+        return self.doc.page_count
+
+    def page(self, page_num: int) -> fitz.Page:
+        """Página PyMuPDF (índice base 0)"""
+        return self.doc[page_num]
+
+    def render(self, page_num: int, dpi: int) -> Image.Image:
+        """Rasteriza una sola página a una imagen RGB para OCR"""
+        from PIL import Image
+
+        pix = self.page(page_num).get_pixmap(dpi=dpi, alpha=False)
+        image = Image.frombytes("RGB", (pix.width, pix.height), pix.samples)
+        del pix
+        return image
+
+    def plumber_page(self, page_num: int) -> pdfplumber.page.Page:
+        """Página pdfplumber; el documento se abre la primera vez que se necesita"""
+        if self._plumber is None:
+            import pdfplumber
+            self._plumber = pdfplumber.open(io.BytesIO(self._data))
+        return self._plumber.pages[page_num]
+
+    def close(self) -> None:
+        if self._plumber is not None:
+            self._plumber.close()
+            self._plumber = None
+        self.doc.close()
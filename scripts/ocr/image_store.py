@@ -0,0 +1,205 @@
+"""
+Almacén deduplicado de imágenes extraídas
+=========================================
+
+Guarda cada imagen una sola vez, bajo el SHA-256 de sus bytes, en una carpeta
+compartida por todos los PDFs:
+
+    <raíz>/<sha[:2]>/<sha>.<ext>
+
+El id de la imagen es un UUID5 derivado del hash: logos, encabezados DEMRE y
+figuras reutilizadas entre páginas o entre años tienen el mismo id y el mismo
+archivo en cada preguntas.json, y se suben una sola vez al bucket
+`question-images`.
+
+Con `phash_distance` también se agrupan las casi-duplicadas (otra
+compresión, otro tamaño): se calcula un dHash de 64 bits y una imagen a esa
+distancia de Hamming o menos de otra ya guardada reutiliza ese recurso. La
+búsqueda usa 8 bandas de 8 bits: dos hashes a distancia ≤ 7 coinciden al
+menos en una banda completa, así que basta comparar contra esos candidatos.
+"""
+
+import os
+import time
+import uuid
+import sqlite3
+import hashlib
+import logging
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Espacio de nombres de los ids estables de imágenes
+IMAGE_NAMESPACE = uuid.uuid5(uuid.NAMESPACE_URL, "simulador-paes/question-images")
+
+PHASH_BANDS = 8
+PHASH_BAND_BITS = 64 // PHASH_BANDS
+MAX_PHASH_DISTANCE = PHASH_BANDS - 1
+
+
+def image_id(sha256: str) -> str:
+    """Id estable de una imagen a partir del hash de su contenido"""
+    return str(uuid.uuid5(IMAGE_NAMESPACE, sha256))
+
+
+def dhash(image) -> int:
+    """dHash de 64 bits: compara cada píxel con su vecino derecho en una miniatura de 9×8"""
+    from PIL import Image
+
+    pixels = image.convert("L").resize((9, 8), Image.LANCZOS).tobytes()
+    value = 0
+    for row in range(8):
+        for col in range(8):
+            value = (value << 1) | (pixels[row * 9 + col] > pixels[row * 9 + col + 1])
+    return value
+
+
+def _signed(value: int) -> int:
+    """SQLite guarda enteros de 64 bits con signo"""
+    return value - (1 << 64) if value >= 1 << 63 else value
+
+
+def _bands(value: int):
+    mask = (1 << PHASH_BAND_BITS) - 1
+    return [(band, (value >> (band * PHASH_BAND_BITS)) & mask) for band in range(PHASH_BANDS)]
+
+
+class ImageStore:
+    """Imágenes direccionadas por contenido con índice SQLite compartido entre procesos"""
+
+    def __init__(self, root: Path, phash_distance: Optional[int] = None):
+        """
+        Abre (o crea) el almacén
+
+        Args:
+            root: Carpeta compartida de imágenes
+            phash_distance: Distancia de Hamming máxima (0-7) entre dHash para
+                reutilizar una imagen casi idéntica (None solo deduplica
+                bytes idénticos)
+        """
+        if phash_distance is not None and not 0 <= phash_distance <= MAX_PHASH_DISTANCE:
+            raise ValueError(f"phash_distance debe estar entre 0 y {MAX_PHASH_DISTANCE}")
+
+        self.root = Path(root)
+        self.phash_distance = phash_distance
+        self.written = 0
+        self.reused = 0
+        self.near_duplicates = 0
+        self.root.mkdir(parents=True, exist_ok=True)
+
+        # Varios procesos (--jobs) comparten el índice
+        self._conn = sqlite3.connect(str(self.root / "index.sqlite"), timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS images (
+                sha256 TEXT PRIMARY KEY,
+                canonical TEXT NOT NULL,
+                filename TEXT NOT NULL,
+                width INTEGER,
+                height INTEGER,
+                size INTEGER NOT NULL,
+                phash INTEGER,
+                created REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS phash_bands (
+                band INTEGER NOT NULL,
+                value INTEGER NOT NULL,
+                sha256 TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_phash_bands ON phash_bands(band, value);
+            """
+        )
+        self._conn.commit()
+
+    def _asset(self, canonical: str, filename: str, reused: bool) -> Dict[str, Any]:
+        return {
+            "id": image_id(canonical),
+            "sha256": canonical,
+            "filename": filename,
+            "path": str(self.root / canonical[:2] / filename),
+            "reused": reused,
+        }
+
+    def _near_duplicate(self, phash: int):
+        """Imagen guardada con dHash a `phash_distance` o menos, si existe"""
+        candidates = set()
+        for band, value in _bands(phash):
+            candidates.update(
+                row[0] for row in self._conn.execute(
+                    "SELECT sha256 FROM phash_bands WHERE band = ? AND value = ?", (band, value)
+                )
+            )
+        best = None
+        for sha256 in candidates:
+            row = self._conn.execute(
+                "SELECT canonical, filename, phash FROM images WHERE sha256 = ?", (sha256,)
+            ).fetchone()
+            distance = bin((row[2] & ((1 << 64) - 1)) ^ phash).count("1")
+            if distance <= self.phash_distance and (best is None or distance < best[0]):
+                best = (distance, row[0], row[1])
+        return best
+
+    def put(self, data: bytes, ext: str, image=None, size: Optional[Tuple[int, int]] = None) -> Dict[str, Any]:
+        """
+        Guarda una imagen (si no estaba) y devuelve su recurso compartido
+
+        Args:
+            data: Bytes de la imagen tal como vienen en el PDF
+            ext: Extensión del formato (png, jpeg, ...)
+            image: La misma imagen abierta con PIL (necesaria para el dHash)
+            size: (ancho, alto) en píxeles, si se conoce sin decodificar
+
+        Returns:
+            id, sha256 y archivo del recurso; `reused` indica si ya existía
+        """
+        sha256 = hashlib.sha256(data).hexdigest()
+        row = self._conn.execute("SELECT canonical, filename FROM images WHERE sha256 = ?", (sha256,)).fetchone()
+        if row is not None:
+            self.reused += 1
+            return self._asset(row[0], row[1], reused=True)
+
+        width, height = size or (image.size if image is not None else (None, None))
+        phash = dhash(image) if self.phash_distance is not None and image is not None else None
+        if phash is not None:
+            match = self._near_duplicate(phash)
+            if match is not None:
+                # Alias: la próxima vez estos mismos bytes resuelven sin calcular el dHash
+                _, canonical, filename = match
+                self._conn.execute(
+                    "INSERT OR IGNORE INTO images VALUES (?, ?, ?, ?, ?, ?, NULL, ?)",
+                    (sha256, canonical, filename, width, height, len(data), time.time()),
+                )
+                self._conn.commit()
+                self.reused += 1
+                self.near_duplicates += 1
+                return self._asset(canonical, filename, reused=True)
+
+        filename = f"{sha256}.{ext}"
+        path = self.root / sha256[:2] / filename
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_bytes(data)
+        tmp_path.replace(path)
+
+        with self._conn:
+            inserted = self._conn.execute(
+                "INSERT OR IGNORE INTO images VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (sha256, sha256, filename, width, height, len(data),
+                 _signed(phash) if phash is not None else None, time.time()),
+            ).rowcount
+            if inserted and phash is not None:
+                self._conn.executemany(
+                    "INSERT INTO phash_bands (band, value, sha256) VALUES (?, ?, ?)",
+                    [(band, value, sha256) for band, value in _bands(phash)],
+                )
+        self.written += 1
+        return self._asset(sha256, filename, reused=False)
+
+    def stats(self) -> Dict[str, int]:
+        """Imágenes escritas y reutilizadas por este proceso"""
+        return {"written": self.written, "reused": self.reused, "near_duplicates": self.near_duplicates}
+
+    def close(self) -> None:
+        self._conn.close()
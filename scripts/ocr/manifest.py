@@ -0,0 +1,85 @@
+"""
+Manifiesto de procesamiento incremental
+=======================================
+
+Registra, para cada PDF procesado, tamaño, mtime y hash de contenido de la
+fuente junto al hash de la configuración del pipeline que produjo su
+`preguntas.json`. El batch runner solo vuelve a procesar los PDFs cuya
+fuente o configuración relevante cambió.
+"""
+
+import json
+import hashlib
+from pathlib import Path
+from typing import Any, Dict
+
+
+def file_sha256(path: Path, chunk_size: int = 1024 * 1024) -> str:
+    """Hash SHA-256 del contenido de un archivo, leído por bloques"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def config_hash(config: Dict[str, Any]) -> str:
+    """Hash estable de los parámetros que afectan al resultado de un PDF"""
+    payload = json.dumps(config, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class Manifest:
+    """Manifiesto JSON guardado junto a los resultados"""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        if self.path.exists():
+            self.entries = json.loads(self.path.read_text(encoding="utf-8")).get("entries", {})
+
+    @staticmethod
+    def _key(pdf_path: Path) -> str:
+        return str(Path(pdf_path).resolve())
+
+    def is_current(self, pdf_path: Path, cfg_hash: str, output_file: Path) -> bool:
+        """
+        Indica si el resultado existente sigue vigente.
+
+        Si tamaño y mtime coinciden no se lee el PDF; si difieren se compara
+        el hash de contenido (p. ej. tras copiar el archivo) antes de declararlo
+        cambiado.
+        """
+        entry = self.entries.get(self._key(pdf_path))
+        if entry is None or entry["config_hash"] != cfg_hash or not output_file.exists():
+            return False
+
+        stat = pdf_path.stat()
+        if entry["size"] == stat.st_size and entry["mtime_ns"] == stat.st_mtime_ns:
+            return True
+
+        if entry["size"] != stat.st_size or entry["sha256"] != file_sha256(pdf_path):
+            return False
+
+        entry["mtime_ns"] = stat.st_mtime_ns
+        return True
+
+    def record(self, pdf_path: Path, cfg_hash: str, output_file: Path) -> None:
+        """Registra el resultado recién generado para un PDF"""
+        stat = pdf_path.stat()
+        self.entries[self._key(pdf_path)] = {
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "sha256": file_sha256(pdf_path),
+            "config_hash": cfg_hash,
+            "output": str(output_file),
+        }
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+        tmp_path.write_text(
+            json.dumps({"version": 1, "entries": self.entries}, ensure_ascii=False, indent=2),
+            encoding="utf-8",
+        )
+        tmp_path.replace(self.path)
@@ -0,0 +1,113 @@
+"""
+Caché persistente de resultados OCR
+===================================
+
+Guarda el texto y `words_data` de cada página en SQLite, comprimidos con zlib,
+bajo una clave derivada del contenido rasterizado de la página, el dpi, el
+idioma y la versión de Tesseract. Volver a procesar un PDF sin cambios evita
+llamar a Tesseract.
+
+El tamaño total se limita a `max_bytes`; al superarlo se eliminan las
+entradas menos usadas recientemente (LRU).
+"""
+
+import json
+import time
+import zlib
+import sqlite3
+import hashlib
+import logging
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class OCRCache:
+    """Caché OCR en disco con expulsión LRU"""
+
+    def __init__(self, path: Path, max_bytes: int = 512 * 1024 * 1024):
+        """
+        Abre (o crea) la caché
+
+        Args:
+            path: Archivo SQLite de la caché
+            max_bytes: Tamaño máximo de los resultados comprimidos
+        """
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        # Varios procesos (--jobs / --page-jobs) comparten el archivo
+        self._conn = sqlite3.connect(str(self.path), timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS ocr_pages (
+                key TEXT PRIMARY KEY,
+                payload BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                last_access REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_ocr_pages_access ON ocr_pages(last_access)")
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(page_bytes: bytes, dpi: int, lang: str, tesseract_version: str) -> str:
+        """Clave de contenido para una página rasterizada y su configuración OCR"""
+        digest = hashlib.sha256(page_bytes)
+        digest.update(f"|{dpi}|{lang}|{tesseract_version}".encode("utf-8"))
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Devuelve el resultado guardado o None, actualizando su último acceso"""
+        row = self._conn.execute("SELECT payload FROM ocr_pages WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+
+        self._conn.execute("UPDATE ocr_pages SET last_access = ? WHERE key = ?", (time.time(), key))
+        self._conn.commit()
+        self.hits += 1
+        return json.loads(zlib.decompress(row[0]).decode("utf-8"))
+
+    def put(self, key: str, value: Dict[str, Any]) -> None:
+        """Guarda un resultado y aplica el límite de tamaño"""
+        payload = zlib.compress(json.dumps(value, ensure_ascii=False).encode("utf-8"))
+        self._conn.execute(
+            "INSERT OR REPLACE INTO ocr_pages (key, payload, size, last_access) VALUES (?, ?, ?, ?)",
+            (key, payload, len(payload), time.time()),
+        )
+        self._conn.commit()
+        self._evict()
+
+    def _evict(self) -> None:
+        """Elimina entradas LRU hasta quedar bajo `max_bytes`"""
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM ocr_pages").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        freed = 0
+        evicted = []
+        for key, size in self._conn.execute("SELECT key, size FROM ocr_pages ORDER BY last_access"):
+            if total - freed <= self.max_bytes:
+                break
+            evicted.append((key,))
+            freed += size
+
+        self._conn.executemany("DELETE FROM ocr_pages WHERE key = ?", evicted)
+        self._conn.commit()
+        logger.info("Caché OCR: %d entradas expulsadas (%.1f MB)", len(evicted), freed / 1024 / 1024)
+
+    def clear(self) -> None:
+        """Vacía la caché"""
+        self._conn.execute("DELETE FROM ocr_pages")
+        self._conn.commit()
+        self._conn.execute("VACUUM")
+
+    def close(self) -> None:
+        self._conn.close()
@@ -7,27 +7,33 @@ Extrae preguntas, texto e imágenes de PDFs PAES
 
 Características:
 - OCR con Tesseract para texto
-- Extracción de imágenes con PyMuPDF
-- Detección de tablas con pdfplumber
-- Asociación pregunta-imagen por proximidad
+- Extracción de imágenes con PyMuPDF a un almacén deduplicado por contenido
+- Detección de tablas con pdfplumber, solo en páginas con trazos de tabla
+- Asociación pregunta-imagen/tabla por posición vertical
 """
 
+from __future__ import annotations
+
 import os
 import re
 import sys
 import json
+import time
 import uuid
+from bisect import bisect_left, bisect_right
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Dict, Any, Optional, Tuple
+from typing import TYPE_CHECKING, List, Dict, Any, Optional, Tuple
 import logging
-
-import pytesseract
-from pdf2image import convert_from_path
-import pdfplumber
-import fitz  # PyMuPDF
-from PIL import Image
 import io
-from tqdm import tqdm
+
+# pytesseract, PyMuPDF, PIL, tqdm y transformers se importan en el primer uso:
+# `--help`, la lectura de la caché o recorrer directorios no los necesitan
+if TYPE_CHECKING:
+    from concurrent.futures import Future
+
+    import fitz  # PyMuPDF
+    from PIL import Image
 
 # Permitir importar módulos hermanos (classification, etc.) cuando se ejecuta como script
 CURRENT_DIR = Path(__file__).resolve().parent
@@ -37,10 +43,11 @@ for candidate in (SCRIPTS_DIR, PROJECT_ROOT):
     if str(candidate) not in sys.path:
         sys.path.insert(0, str(candidate))
 
-try:
-    from classification.taxonomy_classifier import TaxonomyClassifier
-except ImportError:  # pragma: no cover - fallback para ejecuciones empaquetadas
-    TaxonomyClassifier = None
+from clean_question_banks import REPLACEMENTS  # noqa: E402
+from classification.cache import DEFAULT_CLASSIFICATION_CACHE  # noqa: E402
+from ocr.document import PDFDocument  # noqa: E402
+from ocr.image_store import ImageStore  # noqa: E402
+from ocr.ocr_cache import OCRCache  # noqa: E402
 
 # Configuración de logging
 logging.basicConfig(
@@ -49,6 +56,30 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+DEFAULT_OCR_CACHE = PROJECT_ROOT / "temp" / "ocr_cache.sqlite"
+
+# Subir al cambiar la extracción o el formato de preguntas.json: el batch runner
+# lo incluye en el hash del manifiesto y reprocesa los resultados anteriores
+PIPELINE_VERSION = 2
+
+
+def get_classifier(**kwargs: Any):
+    """Clasificador del proceso para una configuración (ver `classification.get_classifier`)"""
+    try:
+        from classification.taxonomy_classifier import get_classifier as registry_get_classifier
+    except ImportError as e:  # pragma: no cover - fallback para ejecuciones empaquetadas
+        raise RuntimeError(
+            "TaxonomyClassifier no disponible. Verifica dependencias en scripts/requirements.txt"
+        ) from e
+    return registry_get_classifier(**kwargs)
+
+
+@lru_cache(maxsize=1)
+def _tesseract_version() -> str:
+    """Versión de Tesseract (forma parte de la clave de la caché OCR)"""
+    import pytesseract
+    return str(pytesseract.get_tesseract_version())
+
 
 class PDFProcessor:
     """Procesador principal de PDFs con OCR y extracción de imágenes"""
@@ -56,17 +87,70 @@ class PDFProcessor:
     # Patrones regex para detectar preguntas y opciones
     QUESTION_REGEX = re.compile(r"^(\d{1,3})\.\s+(.*)$", re.DOTALL)
     OPTION_REGEX = re.compile(r"^[A-E]\)\s+(.*)$")
+    # Separador de bloques de texto; también une las páginas, así ningún bloque las cruza
+    BLOCK_SEPARATOR = "\n\n"
+    # Marcador "N." como primera palabra de una línea (OCR o capa de texto)
+    ANCHOR_REGEX = re.compile(r"^(\d{1,3})\.")
+
+    # Idioma de Tesseract
+    OCR_LANG = 'spa'
+
+    # Umbrales para aceptar la capa de texto nativa de una página
+    TEXT_LAYER_MIN_CHARS = 100
+    TEXT_LAYER_MAX_GARBAGE_RATIO = 0.05
+
+    # Bordes mínimos (horizontales, verticales) para que pdfplumber arme una celda
+    TABLE_MIN_EDGES = (2, 2)
+
+    # Lado mínimo (px) de una imagen para extraerla; las menores son glifos o decoración
+    MIN_IMAGE_SIZE = 50
     
-    def __init__(self, output_dir: str = "./output", temp_dir: str = "./temp/images"):
+    def __init__(
+        self,
+        output_dir: str = "./output",
+        temp_dir: str = "./temp/images",
+        dpi: int = 300,
+        use_text_layer: bool = True,
+        page_jobs: int = 1,
+        ocr_cache_path: Optional[str] = str(DEFAULT_OCR_CACHE),
+        ocr_cache_max_mb: int = 512,
+        image_store_dir: Optional[str] = None,
+        image_phash_distance: Optional[int] = None,
+        table_prefilter: bool = True,
+    ):
         """
         Inicializa el procesador
         
         Args:
             output_dir: Directorio para guardar resultados
             temp_dir: Directorio temporal para imágenes
+            dpi: Resolución usada para rasterizar páginas antes del OCR
+            use_text_layer: Usar la capa de texto del PDF y aplicar OCR solo
+                a las páginas donde esta no sea confiable
+            page_jobs: Procesos para rasterizar y aplicar OCR a páginas de un
+                mismo PDF en paralelo (1 = secuencial)
+            ocr_cache_path: Archivo SQLite de la caché OCR (None la desactiva)
+            ocr_cache_max_mb: Tamaño máximo de la caché OCR en MB
+            image_store_dir: Almacén de imágenes compartido entre PDFs
+                (por defecto `<output_dir>/assets`)
+            image_phash_distance: Distancia de Hamming máxima del dHash para
+                reutilizar imágenes casi idénticas (None solo deduplica
+                imágenes idénticas byte a byte)
+            table_prefilter: Ejecutar pdfplumber solo en las páginas cuyos
+                trazos vectoriales pueden formar una tabla
         """
         self.output_dir = Path(output_dir)
         self.temp_dir = Path(temp_dir)
+        self.dpi = dpi
+        self.use_text_layer = use_text_layer
+        self.page_jobs = max(1, page_jobs)
+        self.ocr_cache_path = ocr_cache_path
+        self.ocr_cache_max_mb = ocr_cache_max_mb
+        self._ocr_cache: Optional[OCRCache] = None
+        self.image_store_dir = Path(image_store_dir) if image_store_dir else self.output_dir / "assets"
+        self.image_phash_distance = image_phash_distance
+        self._image_store: Optional[ImageStore] = None
+        self.table_prefilter = table_prefilter
         self.output_dir.mkdir(parents=True, exist_ok=True)
         self.temp_dir.mkdir(parents=True, exist_ok=True)
         
@@ -96,17 +180,10 @@ class PDFProcessor:
         pdf_output_dir = self.output_dir / pdf_path.stem
         pdf_output_dir.mkdir(exist_ok=True)
         
-        # Extraer texto con OCR
-        logger.info("Extrayendo texto con OCR...")
-        text_data = self._extract_text_ocr(pdf_path, skip_pages)
-        
-        # Extraer imágenes
-        logger.info("Extrayendo imágenes...")
-        images = self._extract_images(pdf_path, pdf_output_dir / "images", skip_pages)
-        
-        # Extraer tablas
-        logger.info("Extrayendo tablas...")
-        tables = self._extract_tables(pdf_path, skip_pages)
+        # Extraer texto, imágenes y tablas en una sola pasada sobre el documento
+        logger.info("Extrayendo texto, imágenes y tablas...")
+        with PDFDocument(pdf_path) as document:
+            text_data, images, tables, table_stats = self._extract_pages(document, skip_pages)
         
         # Parsear preguntas del texto
         logger.info("Parseando preguntas...")
@@ -123,9 +200,9 @@ class PDFProcessor:
                 classifier_kwargs or {}
             )
         
-        # Asociar imágenes con preguntas
-        logger.info("Asociando imágenes con preguntas...")
-        questions = self._associate_images_to_questions(questions, images, text_data)
+        # Asociar imágenes y tablas con preguntas
+        logger.info("Asociando imágenes y tablas con preguntas...")
+        questions = self._associate_images_to_questions(questions, images, text_data, tables)
         
         # Generar resultado
         result = {
@@ -134,15 +211,29 @@ class PDFProcessor:
             "total_pages": len(text_data),
             "total_questions": len(questions),
             "total_images": len(images),
+            "unique_images": len({img['id'] for img in images}),
             "total_tables": len(tables),
             "questions": questions,
             "images": images,
             "tables": tables,
             "metadata": {
                 "processed_date": str(Path.ctime(Path())),
+                "pipeline_version": PIPELINE_VERSION,
                 "skip_pages": skip_pages,
                 "subject": subject,
-                "auto_classified": auto_classify
+                "auto_classified": auto_classify,
+                "text_sources": {
+                    source: sum(1 for page in text_data if page.get('source') == source)
+                    for source in ("text_layer", "ocr")
+                },
+                "ocr_cache_hits": sum(1 for page in text_data if page.get('ocr_cached')),
+                "image_store": str(self.image_store_dir),
+                "reused_images": sum(1 for img in images if img.get('reused')),
+                "table_extraction": table_stats,
+                "keyword_classified": sum(
+                    1 for question in questions
+                    if question.get('ai_classification', {}).get('source') == 'keywords'
+                )
             }
         }
         
@@ -155,224 +246,720 @@ class PDFProcessor:
         
         return result
     
-    def _extract_text_ocr(self, pdf_path: Path, skip_pages: int = 0) -> List[Dict[str, Any]]:
-        """Extrae texto usando OCR con información de página"""
-        pages_data = []
-        
-        # Convertir PDF a imágenes
-        pages = convert_from_path(str(pdf_path), dpi=300)
-        
-        for i, page_img in enumerate(tqdm(pages, desc="Procesando páginas con OCR")):
-            if i < skip_pages:
-                continue
-                
-            # OCR en español
-            text = pytesseract.image_to_string(page_img, lang='spa')
-            
-            # También obtener datos con coordenadas para mejor asociación
-            data = pytesseract.image_to_data(page_img, lang='spa', output_type=pytesseract.Output.DICT)
-            
-            pages_data.append({
-                'page_num': i,
+    def _extract_pages(
+        self,
+        document: PDFDocument,
+        skip_pages: int = 0,
+    ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]], List[Dict[str, Any]], Dict[str, Any]]:
+        """
+        Recorre el documento una vez y entrega cada página a los extractores
+        de texto, imágenes y tablas.
+
+        Con `page_jobs > 1` las páginas que requieren OCR y las páginas
+        candidatas a tener tablas se envían a un pool de procesos mientras
+        este proceso sigue con imágenes; los resultados se reordenan por
+        página al final. Además de páginas, imágenes y tablas devuelve los
+        tiempos de la extracción de tablas.
+        """
+        pages_by_num: Dict[int, Dict[str, Any]] = {}
+        ocr_futures: Dict[int, Future] = {}
+        table_futures: Dict[int, Future] = {}
+        tables_by_page: Dict[int, List[Dict[str, Any]]] = {}
+        images_info = []
+        table_stats = {
+            "prefilter": self.table_prefilter,
+            "pages": 0,
+            "candidate_pages": 0,
+            "skipped_pages": [],
+            "prefilter_seconds": 0.0,
+            "extraction_seconds": 0.0,
+        }
+
+        executor = None
+        if self.page_jobs > 1:
+            from concurrent.futures import ProcessPoolExecutor
+
+            executor = ProcessPoolExecutor(
+                max_workers=self.page_jobs,
+                initializer=_init_page_worker,
+                initargs=(str(document.path), self._worker_kwargs()),
+            )
+
+        from tqdm import tqdm
+
+        try:
+            for page_num in tqdm(range(skip_pages, document.page_count), desc="Procesando páginas"):
+                if executor is None:
+                    pages_by_num[page_num] = self._extract_text(document, page_num)
+                else:
+                    page_data = None
+                    if self.use_text_layer:
+                        page_data = self._extract_text_layer(document.page(page_num))
+                    if page_data is None:
+                        ocr_futures[page_num] = executor.submit(_ocr_page_worker, page_num)
+                    else:
+                        pages_by_num[page_num] = page_data
+
+                images_info.extend(self._extract_images(document, page_num))
+
+                table_stats["pages"] += 1
+                start = time.perf_counter()
+                candidate = not self.table_prefilter or self._is_table_candidate(document.page(page_num))
+                table_stats["prefilter_seconds"] += time.perf_counter() - start
+                if not candidate:
+                    table_stats["skipped_pages"].append(page_num)
+                else:
+                    table_stats["candidate_pages"] += 1
+                    if executor is None:
+                        tables_by_page[page_num], elapsed = _timed_extract_tables(self, document, page_num)
+                        table_stats["extraction_seconds"] += elapsed
+                    else:
+                        table_futures[page_num] = executor.submit(_table_page_worker, page_num)
+
+            for page_num, future in tqdm(ocr_futures.items(), desc="Esperando OCR paralelo",
+                                         disable=not ocr_futures):
+                pages_by_num[page_num] = future.result()
+            for page_num, future in table_futures.items():
+                tables_by_page[page_num], elapsed = future.result()
+                table_stats["extraction_seconds"] += elapsed
+        finally:
+            if executor is not None:
+                executor.shutdown(cancel_futures=True)
+
+        pages_data = [pages_by_num[page_num] for page_num in sorted(pages_by_num)]
+        tables_info = [table for page_num in sorted(tables_by_page) for table in tables_by_page[page_num]]
+
+        ocr_pages = sum(1 for page in pages_data if page['source'] == 'ocr')
+        logger.info(
+            "Capa de texto utilizable en %d páginas; %d requirieron OCR",
+            len(pages_data) - ocr_pages,
+            ocr_pages,
+        )
+        logger.info(
+            "Tablas: pdfplumber en %d/%d páginas, %.2f s (pre-filtro %.2f s)",
+            table_stats["candidate_pages"],
+            table_stats["pages"],
+            table_stats["extraction_seconds"],
+            table_stats["prefilter_seconds"],
+        )
+        if table_stats["skipped_pages"]:
+            logger.info(
+                "Páginas sin trazos de tabla (se omitió pdfplumber): %s",
+                ", ".join(str(page_num) for page_num in table_stats["skipped_pages"]),
+            )
+
+        return pages_data, images_info, tables_info, table_stats
+
+    def _worker_kwargs(self) -> Dict[str, Any]:
+        """Configuración para reconstruir el procesador dentro de un worker de páginas"""
+        return {
+            "output_dir": str(self.output_dir),
+            "temp_dir": str(self.temp_dir),
+            "dpi": self.dpi,
+            "use_text_layer": self.use_text_layer,
+            "ocr_cache_path": self.ocr_cache_path,
+            "ocr_cache_max_mb": self.ocr_cache_max_mb,
+            "image_store_dir": str(self.image_store_dir),
+            "image_phash_distance": self.image_phash_distance,
+            "table_prefilter": self.table_prefilter,
+        }
+
+    def _extract_text(self, document: PDFDocument, page_num: int) -> Dict[str, Any]:
+        """Extrae el texto de una página desde la capa nativa, con OCR si esta falla"""
+        if self.use_text_layer:
+            page_data = self._extract_text_layer(document.page(page_num))
+            if page_data is not None:
+                return page_data
+        return self._extract_text_ocr(document, page_num)
+
+    def _extract_text_layer(self, page: "fitz.Page") -> Optional[Dict[str, Any]]:
+        """
+        Lee la capa de texto de una página en el mismo formato que el OCR.
+
+        Las coordenadas se escalan a `dpi` para que `words_data` sea
+        intercambiable con la salida de `image_to_data`. Devuelve None si la
+        capa está vacía o tiene demasiados glifos basura.
+        """
+        scale = self.dpi / 72
+        words_data: Dict[str, List[Any]] = {
+            key: [] for key in (
+                'level', 'page_num', 'block_num', 'par_num', 'line_num', 'word_num',
+                'left', 'top', 'width', 'height', 'conf', 'text'
+            )
+        }
+
+        for x0, y0, x1, y1, word, block_no, line_no, word_no in page.get_text("words"):
+            for old, new in REPLACEMENTS.items():
+                word = word.replace(old, new)
+            words_data['level'].append(5)
+            words_data['page_num'].append(page.number + 1)
+            words_data['block_num'].append(block_no + 1)
+            words_data['par_num'].append(1)
+            words_data['line_num'].append(line_no + 1)
+            words_data['word_num'].append(word_no + 1)
+            words_data['left'].append(int(x0 * scale))
+            words_data['top'].append(int(y0 * scale))
+            words_data['width'].append(int((x1 - x0) * scale))
+            words_data['height'].append(int((y1 - y0) * scale))
+            words_data['conf'].append(100)
+            words_data['text'].append(word)
+
+        text = self._words_to_text(words_data)
+        char_count, garbage_ratio = self._text_layer_quality(text)
+        if char_count < self.TEXT_LAYER_MIN_CHARS or garbage_ratio > self.TEXT_LAYER_MAX_GARBAGE_RATIO:
+            logger.debug(
+                "Página %d sin capa de texto confiable (%d caracteres, %.1f%% basura)",
+                page.number,
+                char_count,
+                garbage_ratio * 100,
+            )
+            return None
+
+        return {
+            'page_num': page.number,
+            'text': text,
+            'words_data': words_data,
+            'page_height': int(page.rect.height * scale),
+            'page_width': int(page.rect.width * scale),
+            'source': 'text_layer'
+        }
+
+    @staticmethod
+    def _text_layer_quality(text: str) -> Tuple[int, float]:
+        """
+        Mide la calidad de una capa de texto: caracteres visibles y proporción
+        de glifos basura (uso privado como los de fuentes Symbol no cubiertos
+        por REPLACEMENTS, caracteres de reemplazo o de control).
+        """
+        visible = [char for char in text if not char.isspace()]
+        if not visible:
+            return 0, 0.0
+
+        garbage = sum(
+            1 for char in visible
+            if '\ue000' <= char <= '\uf8ff' or char == '\ufffd' or ord(char) < 32
+        )
+        return len(visible), garbage / len(visible)
+
+    def _extract_text_ocr(self, document: PDFDocument, page_num: int) -> Dict[str, Any]:
+        """Extrae texto de una página usando OCR con información de página"""
+        page_img = document.render(page_num, self.dpi)
+        try:
+            cache = self.ocr_cache
+            cached = None
+            if cache is not None:
+                cache_key = OCRCache.make_key(
+                    page_img.tobytes(), self.dpi, self.OCR_LANG, _tesseract_version()
+                )
+                cached = cache.get(cache_key)
+
+            if cached is not None:
+                text, data = cached['text'], cached['words_data']
+            else:
+                text, data = self._ocr_page(page_img)
+                if cache is not None:
+                    cache.put(cache_key, {'text': text, 'words_data': data})
+
+            return {
+                'page_num': page_num,
                 'text': text,
                 'words_data': data,
                 'page_height': page_img.height,
-                'page_width': page_img.width
-            })
-            
-        return pages_data
-    
-    def _extract_images(self, pdf_path: Path, output_dir: Path, skip_pages: int = 0) -> List[Dict[str, Any]]:
-        """Extrae imágenes del PDF con sus coordenadas"""
-        output_dir.mkdir(parents=True, exist_ok=True)
+                'page_width': page_img.width,
+                'source': 'ocr',
+                'ocr_cached': cached is not None
+            }
+        finally:
+            page_img.close()
+
+    @property
+    def ocr_cache(self) -> Optional[OCRCache]:
+        """Caché OCR abierta bajo demanda (una conexión por proceso)"""
+        if self._ocr_cache is None and self.ocr_cache_path:
+            self._ocr_cache = OCRCache(
+                Path(self.ocr_cache_path),
+                max_bytes=self.ocr_cache_max_mb * 1024 * 1024,
+            )
+        return self._ocr_cache
+
+    @property
+    def image_store(self) -> ImageStore:
+        """Almacén de imágenes, abierto en el primer uso"""
+        if self._image_store is None:
+            self._image_store = ImageStore(self.image_store_dir, phash_distance=self.image_phash_distance)
+        return self._image_store
+
+    def _ocr_page(self, page_img: Image.Image) -> Tuple[str, Dict[str, List[Any]]]:
+        """
+        Ejecuta una sola pasada de Tesseract sobre la página.
+
+        `image_to_data` ya trae cada palabra con su bloque, párrafo y línea,
+        así que el texto se reconstruye desde ahí en vez de volver a llamar a
+        `image_to_string`.
+        """
+        import pytesseract
+        data = pytesseract.image_to_data(page_img, lang=self.OCR_LANG, output_type=pytesseract.Output.DICT)
+        return self._words_to_text(data), data
+
+    @staticmethod
+    def _words_to_text(words_data: Dict[str, List[Any]]) -> str:
+        """Reconstruye el texto de página con el mismo formato que `image_to_string`"""
+        paragraphs: List[List[List[str]]] = []
+        current_par = None
+        current_line = None
+
+        for level, block, par, line, word in zip(
+            words_data['level'],
+            words_data['block_num'],
+            words_data['par_num'],
+            words_data['line_num'],
+            words_data['text'],
+        ):
+            word = str(word).strip()
+            if int(level) != 5 or not word:
+                continue
+
+            if (block, par) != current_par:
+                paragraphs.append([])
+                current_par = (block, par)
+                current_line = None
+            if (block, par, line) != current_line:
+                paragraphs[-1].append([])
+                current_line = (block, par, line)
+            paragraphs[-1][-1].append(word)
+
+        return "\n\n".join(
+            "\n".join(" ".join(words) for words in lines) for lines in paragraphs
+        )
+
+    @staticmethod
+    def _word_offsets(words_data: Dict[str, List[Any]]) -> Tuple[List[int], List[int]]:
+        """
+        Offset de cada palabra en el texto que arma `_words_to_text` (mismas
+        reglas de separación) junto a su índice en `words_data`
+        """
+        offsets: List[int] = []
+        indices: List[int] = []
+        position = 0
+        current_par = None
+
+        for index, (level, block, par, word) in enumerate(zip(
+            words_data['level'],
+            words_data['block_num'],
+            words_data['par_num'],
+            words_data['text'],
+        )):
+            word = str(word).strip()
+            if int(level) != 5 or not word:
+                continue
+
+            if (block, par) != current_par:
+                position += 2 if current_par is not None else 0
+                current_par = (block, par)
+            else:
+                position += 1  # salto de línea o espacio
+
+            offsets.append(position)
+            indices.append(index)
+            position += len(word)
+
+        return offsets, indices
+
+    def _extract_images(self, document: PDFDocument, page_num: int) -> List[Dict[str, Any]]:
+        """
+        Extrae imágenes de una página con sus coordenadas
+
+        El filtro de tamaño y el tipo se deciden con el ancho y alto que ya
+        trae `get_images(full=True)`, y cada xref se extrae una sola vez por
+        documento: los bytes solo se leen para las imágenes que pasan el
+        filtro y aparecen por primera vez.
+
+        Cada aparición conserva su página y posición, pero el archivo y el id
+        son los del recurso compartido en `image_store`: una imagen repetida
+        (en la misma página, en otras páginas o en otros PDFs) se escribe y
+        se sube una sola vez.
+        """
         images_info = []
         
         try:
-            doc = fitz.open(str(pdf_path))
+            page = document.page(page_num)
+            image_list = page.get_images(full=True)
             
-            for page_num, page in enumerate(doc):
-                if page_num < skip_pages:
-                    continue
-                    
-                image_list = page.get_images(full=True)
+            if not image_list:
+                return images_info
                 
-                if not image_list:
-                    continue
+            logger.info(f"Página {page_num}: {len(image_list)} imágenes encontradas")
+            
+            for img_index, img in enumerate(image_list):
+                try:
+                    # (xref, smask, ancho, alto, ...)
+                    xref, width, height = img[0], img[2], img[3]
                     
-                logger.info(f"Página {page_num}: {len(image_list)} imágenes encontradas")
-                
-                for img_index, img in enumerate(image_list):
-                    try:
-                        # Extraer imagen
-                        xref = img[0]
-                        base_image = doc.extract_image(xref)
-                        image_bytes = base_image["image"]
-                        
-                        # Verificar tamaño mínimo
-                        image_pil = Image.open(io.BytesIO(image_bytes))
-                        width, height = image_pil.size
-                        
-                        if width < 50 or height < 50:
-                            continue
-                            
-                        # Obtener coordenadas
-                        rect = page.get_image_bbox(img)
-                        
-                        # Guardar imagen
-                        image_ext = base_image["ext"]
-                        image_name = f"page_{page_num}_img_{img_index}.{image_ext}"
-                        image_path = output_dir / image_name
-                        
-                        with open(image_path, "wb") as f:
-                            f.write(image_bytes)
-                            
-                        # Registrar información
-                        images_info.append({
-                            "id": str(uuid.uuid4()),
-                            "page": page_num,
-                            "filename": image_name,
-                            "path": str(image_path),
-                            "coordinates": {
-                                "x0": rect.x0,
-                                "y0": rect.y0,
-                                "x1": rect.x1,
-                                "y1": rect.y1,
-                                "center_y": (rect.y0 + rect.y1) / 2
-                            },
-                            "size": {
-                                "width": width,
-                                "height": height
-                            },
-                            "type": self._classify_image_type(width, height)
-                        })
+                    # Verificar tamaño mínimo
+                    if width < self.MIN_IMAGE_SIZE or height < self.MIN_IMAGE_SIZE:
+                        continue
                         
-                    except Exception as e:
-                        logger.error(f"Error procesando imagen {img_index} en página {page_num}: {e}")
+                    # Extraer y guardar la imagen solo la primera vez que aparece el xref
+                    asset = document.image_assets.get(xref)
+                    if asset is None:
+                        asset = self._store_image(document, xref)
+                        document.image_assets[xref] = asset
+                    else:
+                        asset = dict(asset, reused=True)
                         
-            doc.close()
-            
+                    # Obtener coordenadas
+                    rect = page.get_image_bbox(img)
+                    
+                    # Registrar información
+                    images_info.append({
+                        "id": asset["id"],
+                        "sha256": asset["sha256"],
+                        "page": page_num,
+                        "filename": asset["filename"],
+                        "path": asset["path"],
+                        "reused": asset["reused"],
+                        "coordinates": {
+                            "x0": rect.x0,
+                            "y0": rect.y0,
+                            "x1": rect.x1,
+                            "y1": rect.y1,
+                            "center_y": (rect.y0 + rect.y1) / 2
+                        },
+                        "size": {
+                            "width": width,
+                            "height": height
+                        },
+                        "type": self._classify_image_type(width, height)
+                    })
+                    
+                except Exception as e:
+                    logger.error(f"Error procesando imagen {img_index} en página {page_num}: {e}")
+                    
         except Exception as e:
-            logger.error(f"Error extrayendo imágenes: {e}")
+            logger.error(f"Error extrayendo imágenes de la página {page_num}: {e}")
             
         return images_info
+
+    def _store_image(self, document: PDFDocument, xref: int) -> Dict[str, Any]:
+        """Extrae los bytes de un xref y los guarda (o reutiliza) en el almacén de imágenes"""
+        base_image = document.doc.extract_image(xref)
+        image_bytes = base_image["image"]
+        size = (base_image["width"], base_image["height"])
+
+        # Solo el dHash de casi-duplicadas necesita decodificar la imagen
+        image_pil = None
+        if self.image_phash_distance is not None:
+            from PIL import Image
+            image_pil = Image.open(io.BytesIO(image_bytes))
+
+        return self.image_store.put(image_bytes, base_image["ext"], image=image_pil, size=size)
     
-    def _extract_tables(self, pdf_path: Path, skip_pages: int = 0) -> List[Dict[str, Any]]:
-        """Extrae tablas del PDF usando pdfplumber"""
+    def _is_table_candidate(self, page: "fitz.Page") -> bool:
+        """
+        Pre-filtro barato de tablas con los trazos vectoriales de PyMuPDF
+
+        pdfplumber (estrategia "lines", la por defecto) arma las celdas solo
+        con los bordes dibujados, así que hasta una tabla de una sola celda
+        necesita dos bordes horizontales y dos verticales. Los bordes se
+        cuentan segmento a segmento como los arma pdfplumber: una línea es
+        horizontal solo si sus extremos tienen exactamente la misma altura
+        (cualquier otra cuenta como vertical), un rectángulo aporta dos de
+        cada tipo y un cuadrilátero cada lado horizontal o vertical (los
+        inclinados no son bordes). Las curvas de Bézier no se cuentan: son
+        figuras, no bordes de celda. Es una aproximación (PyMuPDF y
+        pdfplumber no leen los trazos de forma idéntica), por eso las
+        páginas descartadas quedan en el log y `table_prefilter=False` la
+        desactiva.
+        """
+        min_horizontal, min_vertical = self.TABLE_MIN_EDGES
+        horizontal = vertical = 0
+        for drawing in page.get_drawings():
+            for item in drawing["items"]:
+                kind = item[0]
+                if kind == "l":
+                    if item[1].y == item[2].y:
+                        horizontal += 1
+                    else:
+                        vertical += 1
+                elif kind == "re":
+                    horizontal += 2
+                    vertical += 2
+                elif kind == "qu":
+                    quad = item[1]
+                    for start, end in ((quad.ul, quad.ur), (quad.ur, quad.lr), (quad.lr, quad.ll), (quad.ll, quad.ul)):
+                        if start.y == end.y:
+                            horizontal += 1
+                        elif start.x == end.x:
+                            vertical += 1
+            if horizontal >= min_horizontal and vertical >= min_vertical:
+                return True
+        return False
+
+    def _extract_tables(self, document: PDFDocument, page_num: int) -> List[Dict[str, Any]]:
+        """Extrae tablas de una página usando pdfplumber"""
         tables_info = []
         
         try:
-            with pdfplumber.open(str(pdf_path)) as pdf:
-                for i, page in enumerate(pdf.pages):
-                    if i < skip_pages:
-                        continue
-                        
-                    tables = page.extract_tables()
+            tables = document.plumber_page(page_num).find_tables()
+            
+            for j, found in enumerate(tables):
+                table = found.extract()
+                if table and len(table) > 1:  # Verificar que la tabla tenga contenido
+                    x0, top, x1, bottom = found.bbox
+                    tables_info.append({
+                        "id": str(uuid.uuid4()),
+                        "page": page_num,
+                        "table_index": j,
+                        "rows": len(table),
+                        "cols": len(table[0]) if table[0] else 0,
+                        "content": table,
+                        "coordinates": {"x0": x0, "top": top, "x1": x1, "bottom": bottom}
+                    })
                     
-                    for j, table in enumerate(tables):
-                        if table and len(table) > 1:  # Verificar que la tabla tenga contenido
-                            tables_info.append({
-                                "id": str(uuid.uuid4()),
-                                "page": i,
-                                "table_index": j,
-                                "rows": len(table),
-                                "cols": len(table[0]) if table[0] else 0,
-                                "content": table
-                            })
-                            
         except Exception as e:
-            logger.error(f"Error extrayendo tablas: {e}")
+            logger.error(f"Error extrayendo tablas de la página {page_num}: {e}")
             
         return tables_info
     
     def _parse_questions(self, pages_data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """Parsea preguntas del texto extraído"""
+        """
+        Parsea preguntas del texto extraído en una sola pasada
+
+        Une el texto de todas las páginas y lo recorre una vez, bloque a
+        bloque (separados por líneas en blanco, igual que `split('\n\n')`
+        página a página); el primer carácter de cada bloque decide si se
+        prueba QUESTION_REGEX u OPTION_REGEX. El enunciado se acumula en una
+        lista y se une al cerrar la pregunta.
+
+        Cada pregunta registra su `span` (página y offset de inicio y de fin en
+        el texto de cada página) y su `bbox` por página, incluidas las
+        páginas a las que continúa.
+        """
+        page_starts = []
+        offset = 0
+        for page_data in pages_data:
+            page_starts.append(offset)
+            offset += len(page_data['text']) + len(self.BLOCK_SEPARATOR)
+        document = self.BLOCK_SEPARATOR.join(page_data['text'] for page_data in pages_data)
+
         questions = []
         current_question = None
-        question_counter = 0
-        
-        for page_data in pages_data:
-            page_num = page_data['page_num']
-            text = page_data['text']
-            
-            # Dividir en bloques por líneas vacías
-            blocks = [b.strip() for b in text.split('\n\n') if b.strip()]
-            
-            for block in blocks:
-                # Buscar inicio de pregunta
-                match = self.QUESTION_REGEX.match(block)
-                
-                if match:
-                    # Si había una pregunta anterior, guardarla
-                    if current_question:
-                        questions.append(current_question)
-                        
-                    # Crear nueva pregunta
-                    num, content = match.groups()
-                    question_counter += 1
-                    
-                    current_question = {
-                        "id": str(uuid.uuid4()),
-                        "question_number": int(num),
-                        "content": content.strip(),
-                        "options": [],
-                        "page": page_num,
-                        "has_visual_content": False,
-                        "images": [],
-                        "tables": []
-                    }
-                    
-                elif current_question:
-                    # Buscar opciones
-                    option_match = self.OPTION_REGEX.match(block)
-                    
-                    if option_match:
-                        current_question["options"].append(block.strip())
-                    else:
-                        # Podría ser continuación del enunciado
-                        current_question["content"] += " " + block.strip()
-                        
+        content_parts: List[str] = []
+        # Índice de página → [inicio, fin] de la pregunta actual en el texto de esa página
+        extents: Dict[int, List[int]] = {}
+        word_offsets: Dict[int, Tuple[List[int], List[int]]] = {}
+
+        position = 0
+        while position <= len(document):
+            block_end = document.find(self.BLOCK_SEPARATOR, position)
+            if block_end < 0:
+                block_end = len(document)
+            raw = document[position:block_end]
+            block = raw.strip()
+            start = position + len(raw) - len(raw.lstrip())
+            position = block_end + len(self.BLOCK_SEPARATOR)
+            if not block:
+                continue
+            page_index = bisect_right(page_starts, start) - 1
+
+            # Buscar inicio de pregunta
+            first = block[0]
+            question_match = self.QUESTION_REGEX.match(block) if first.isdigit() else None
+
+            if question_match:
+                # Si había una pregunta anterior, guardarla
+                if current_question:
+                    questions.append(self._finish_question(
+                        current_question, content_parts, extents, pages_data, word_offsets
+                    ))
+
+                # Crear nueva pregunta
+                num, content = question_match.groups()
+                current_question = {
+                    "id": str(uuid.uuid4()),
+                    "question_number": int(num),
+                    "content": "",
+                    "options": [],
+                    "page": pages_data[page_index]['page_num'],
+                    "has_visual_content": False,
+                    "images": [],
+                    "tables": []
+                }
+                content_parts = [content.strip()]
+                extents = {}
+            elif current_question is None:
+                continue
+            elif 'A' <= first <= 'E' and self.OPTION_REGEX.match(block):
+                current_question["options"].append(block)
+            else:
+                # Podría ser continuación del enunciado
+                content_parts.append(block)
+
+            local_start = start - page_starts[page_index]
+            local_end = local_start + len(block)
+            if page_index in extents:
+                extents[page_index][1] = local_end
+            else:
+                extents[page_index] = [local_start, local_end]
+
         # Guardar última pregunta
         if current_question:
-            questions.append(current_question)
-            
+            questions.append(self._finish_question(
+                current_question, content_parts, extents, pages_data, word_offsets
+            ))
+
         return questions
-    
-    def _associate_images_to_questions(self, questions: List[Dict], images: List[Dict], 
-                                     pages_data: List[Dict]) -> List[Dict]:
-        """Asocia imágenes a preguntas basándose en proximidad"""
-        
-        # Agrupar imágenes por página
-        images_by_page = {}
+
+    def _finish_question(
+        self,
+        question: Dict[str, Any],
+        content_parts: List[str],
+        extents: Dict[int, List[int]],
+        pages_data: List[Dict[str, Any]],
+        word_offsets: Dict[int, Tuple[List[int], List[int]]],
+    ) -> Dict[str, Any]:
+        """Une el enunciado y agrega `span` y `bbox` (puntos PDF) a una pregunta terminada"""
+        question["content"] = " ".join(content_parts)
+
+        page_indices = list(extents)
+        question["span"] = {
+            "start_page": pages_data[page_indices[0]]['page_num'],
+            "start": extents[page_indices[0]][0],
+            "end_page": pages_data[page_indices[-1]]['page_num'],
+            "end": extents[page_indices[-1]][1],
+        }
+
+        scale = self.dpi / 72
+        question["bbox"] = []
+        for page_index, (start, end) in extents.items():
+            words = pages_data[page_index].get('words_data')
+            if not words:
+                continue
+            if page_index not in word_offsets:
+                word_offsets[page_index] = self._word_offsets(words)
+            starts, indices = word_offsets[page_index]
+            selected = indices[bisect_left(starts, start):bisect_left(starts, end)]
+            if not selected:
+                continue
+            question["bbox"].append({
+                "page": pages_data[page_index]['page_num'],
+                "x0": min(int(words['left'][i]) for i in selected) / scale,
+                "top": min(int(words['top'][i]) for i in selected) / scale,
+                "x1": max(int(words['left'][i]) + int(words['width'][i]) for i in selected) / scale,
+                "bottom": max(int(words['top'][i]) + int(words['height'][i]) for i in selected) / scale,
+            })
+
+        return question
+
+    def _associate_images_to_questions(
+        self,
+        questions: List[Dict],
+        images: List[Dict],
+        pages_data: List[Dict],
+        tables: Optional[List[Dict]] = None,
+    ) -> List[Dict]:
+        """
+        Asocia imágenes y tablas a la pregunta cuyo tramo vertical las contiene
+
+        En cada página una pregunta ocupa desde la caja de su marcador "N."
+        (palabras del OCR o de la capa de texto) hasta el marcador siguiente;
+        lo que queda sobre el primer marcador continúa la última pregunta de
+        las páginas anteriores. Con los inicios de tramo ordenados, cada imagen
+        (por su `center_y`) y cada tabla se asigna con una búsqueda binaria.
+        Si en una página no se localiza ningún marcador, todo su contenido
+        visual se asigna a cada una de sus preguntas.
+        """
+        questions_by_page: Dict[int, List[Dict]] = {}
+        for question in questions:
+            questions_by_page.setdefault(question['page'], []).append(question)
+        pages_by_num = {page['page_num']: page for page in pages_data}
+
+        # Por página: inicios de tramo (en puntos PDF) y las preguntas dueñas de cada uno
+        intervals: Dict[int, Tuple[List[float], List[List[Dict]]]] = {}
+        previous = None
+        for page_num in sorted(set(pages_by_num) | set(questions_by_page)):
+            page_questions = questions_by_page.get(page_num, [])
+            anchors = self._question_anchors(pages_by_num.get(page_num), page_questions)
+
+            starts: List[float] = []
+            owners: List[List[Dict]] = []
+            if page_questions and not anchors:
+                # Sin marcadores localizados se asigna por página
+                starts.append(float('-inf'))
+                owners.append(page_questions)
+            elif previous is not None:
+                # Continuación de la pregunta anterior: sobre el primer marcador
+                # o en páginas sin preguntas
+                starts.append(float('-inf'))
+                owners.append([previous])
+            for y, question in anchors:
+                starts.append(y)
+                owners.append([question])
+            intervals[page_num] = (starts, owners)
+            if page_questions:
+                previous = page_questions[-1]
+
+        def owners_at(page: int, y: float) -> List[Dict]:
+            starts, owners = intervals.get(page, ((), ()))
+            index = bisect_right(starts, y) - 1
+            return owners[index] if index >= 0 else []
+
+        for question in questions:
+            question['images'] = []
+            question['tables'] = []
+
         for img in images:
-            page = img['page']
-            if page not in images_by_page:
-                images_by_page[page] = []
-            images_by_page[page].append(img)
-            
-        # Para cada pregunta, buscar imágenes cercanas
+            for question in owners_at(img['page'], img['coordinates']['center_y']):
+                if img['id'] not in question['images']:
+                    question['images'].append(img['id'])
+
+        for table in tables or []:
+            coordinates = table.get('coordinates')
+            center_y = (coordinates['top'] + coordinates['bottom']) / 2 if coordinates else float('-inf')
+            for question in owners_at(table['page'], center_y):
+                question['tables'].append(table)
+
         for question in questions:
-            page = question['page']
-            
-            if page in images_by_page:
-                # Las imágenes en la misma página probablemente pertenecen a la pregunta
-                page_images = images_by_page[page]
-                
-                # Simple heurística: si hay pocas preguntas en la página,
-                # asociar todas las imágenes a la pregunta
-                questions_in_page = [q for q in questions if q['page'] == page]
-                
-                if len(questions_in_page) == 1:
-                    # Solo una pregunta en la página, todas las imágenes son suyas
-                    question['images'] = [img['id'] for img in page_images]
-                    question['has_visual_content'] = True
-                else:
-                    # Múltiples preguntas, usar proximidad vertical
-                    # (esto es una simplificación, se puede mejorar)
-                    question['images'] = []
-                    question['has_visual_content'] = len(question['images']) > 0
-                    
+            question['has_visual_content'] = bool(question['images'] or question['tables'])
+
         return questions
-    
+
+    def _question_anchors(
+        self,
+        page_data: Optional[Dict[str, Any]],
+        page_questions: List[Dict],
+    ) -> List[Tuple[float, Dict]]:
+        """
+        Posición vertical (puntos PDF) del marcador "N." de cada pregunta de la página
+
+        Recorre las palabras una vez en orden de lectura buscando, al inicio
+        de una línea, el número de una pregunta posterior a la última
+        localizada: una lista numerada dentro del enunciado no retrocede el
+        tramo, y un marcador ilegible solo deja sin ancla a su pregunta (su
+        tramo queda en la anterior).
+        """
+        if not page_data or not page_questions or not page_data.get('words_data'):
+            return []
+
+        words = page_data['words_data']
+        scale = self.dpi / 72
+        positions = {question['question_number']: index for index, question in enumerate(page_questions)}
+        anchors: List[Tuple[float, Dict]] = []
+        last = -1
+
+        for word_num, top, text in zip(words['word_num'], words['top'], words['text']):
+            if int(word_num) != 1:
+                continue
+            match = self.ANCHOR_REGEX.match(str(text))
+            index = positions.get(int(match.group(1))) if match else None
+            if index is not None and index > last:
+                anchors.append((int(top) / scale, page_questions[index]))
+                last = index
+                if last == len(page_questions) - 1:
+                    break
+
+        return sorted(anchors, key=lambda anchor: anchor[0])
+
     def _classify_image_type(self, width: int, height: int) -> str:
         """Clasifica el tipo de imagen basándose en sus dimensiones"""
         aspect_ratio = width / height if height > 0 else 1
@@ -394,34 +981,60 @@ class PDFProcessor:
     ) -> None:
         """Enriquece preguntas con clasificación taxonómica."""
 
-        if TaxonomyClassifier is None:
-            raise RuntimeError(
-                "TaxonomyClassifier no disponible. Verifica dependencias en scripts/requirements.txt"
-            )
+        classifier = get_classifier(**classifier_kwargs)
 
-        classifier = TaxonomyClassifier(**classifier_kwargs)
+        # Clasificar todo el PDF en lote (y con caché, si está configurada)
+        batch = [
+            {
+                "id": question.get("id"),
+                "content": question.get("content", ""),
+                "options": question.get("options", []),
+                "subject": subject,
+            }
+            for question in questions
+        ]
+        classifier.classify_batch(batch, show_progress=False)
 
-        for question in questions:
-            try:
-                classification = classifier.classify_question(
-                    question_text=question.get("content", ""),
-                    subject=subject,
-                    options=question.get("options", [])
-                )
+        for question, classified in zip(questions, batch):
+            classification = classified.get("ai_classification", {})
+            question["ai_classification"] = classification
+            if "error" in classification and "area_tematica" not in classification:
+                continue
+            question["area_tematica"] = classification.get("area_tematica")
+            question["tema"] = classification.get("tema")
+            question["habilidad"] = classification.get("habilidad")
+            question["classification_confidence"] = classification.get("overall_confidence")
+
+
+# Estado por proceso de los workers de OCR por página
+_PAGE_WORKER: Dict[str, Any] = {}
+
+
+def _init_page_worker(pdf_path: str, processor_kwargs: Dict[str, Any]) -> None:
+    """Inicializador del pool: abre el PDF una sola vez por proceso"""
+    _PAGE_WORKER["processor"] = PDFProcessor(**processor_kwargs)
+    _PAGE_WORKER["document"] = PDFDocument(Path(pdf_path))
 
-                question["ai_classification"] = classification
-                question["area_tematica"] = classification.get("area_tematica")
-                question["tema"] = classification.get("tema")
-                question["habilidad"] = classification.get("habilidad")
-                question["classification_confidence"] = classification.get("overall_confidence")
-            except Exception as exc:  # pragma: no cover - logging defensivo
-                logger.error(
-                    "Error clasificando pregunta %s: %s",
-                    question.get("id", "unknown"),
-                    exc,
-                )
-                question.setdefault("ai_classification", {})
-                question["ai_classification"]["error"] = str(exc)
+
+def _ocr_page_worker(page_num: int) -> Dict[str, Any]:
+    """Rasteriza y aplica OCR a una página dentro de un worker del pool"""
+    return _PAGE_WORKER["processor"]._extract_text_ocr(_PAGE_WORKER["document"], page_num)
+
+
+def _table_page_worker(page_num: int) -> Tuple[List[Dict[str, Any]], float]:
+    """Extrae las tablas de una página candidata dentro de un worker del pool"""
+    return _timed_extract_tables(_PAGE_WORKER["processor"], _PAGE_WORKER["document"], page_num)
+
+
+def _timed_extract_tables(
+    processor: PDFProcessor,
+    document: PDFDocument,
+    page_num: int,
+) -> Tuple[List[Dict[str, Any]], float]:
+    """Tablas de una página y segundos que tomó pdfplumber"""
+    start = time.perf_counter()
+    tables = processor._extract_tables(document, page_num)
+    return tables, time.perf_counter() - start
 
 
 SUBJECT_MAP = {
@@ -464,13 +1077,44 @@ def main():
     parser.add_argument("--temario", default=str(PROJECT_ROOT / "content" / "temario_paes_vs.csv"), help="Ruta al CSV del temario PAES")
     parser.add_argument("--model", default="MoritzLaurer/mDeBERTa-v3-base-mnli-xnli", help="Modelo HuggingFace para clasificación zero-shot")
     parser.add_argument("--device", type=int, default=-1, help="Dispositivo para transformers (-1=CPU, 0=GPU)")
+    parser.add_argument("--classifier-mode", choices=["hierarchical", "flat"], default="hierarchical", help="Clasificación área → tema → habilidad (recomendado) o una sola llamada NLI conjunta, con más pasadas del modelo por pregunta")
+    parser.add_argument("--backend", choices=["nli", "embedding", "onnx"], default="nli", help="Backend de clasificación: zero-shot NLI, similitud de embeddings o NLI cuantizado en ONNX")
+    parser.add_argument("--embedding-model", default="sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2", help="Encoder de Hugging Face para --backend embedding")
+    parser.add_argument("--classification-cache", default=DEFAULT_CLASSIFICATION_CACHE, help="Archivo SQLite con clasificaciones memorizadas")
+    parser.add_argument("--no-classification-cache", action="store_true", help="Clasificar siempre con el modelo, sin caché")
+    parser.add_argument("--cascade-threshold", type=float, default=None, help="Margen (0-1) sobre el que se acepta la clasificación por palabras clave sin usar el modelo")
+    parser.add_argument("--cascade-sample", type=float, default=0.05, help="Fracción de preguntas resueltas por palabras clave que se contrastan con el modelo")
+    parser.add_argument("--dpi", type=int, default=300, help="Resolución de rasterizado para OCR")
+    parser.add_argument("--page-jobs", type=int, default=1, help="Procesos para OCR de páginas en paralelo dentro de un PDF")
+    parser.add_argument("--ocr-cache", default=str(DEFAULT_OCR_CACHE), help="Archivo SQLite de la caché OCR")
+    parser.add_argument("--ocr-cache-size", type=int, default=512, help="Tamaño máximo de la caché OCR en MB")
+    parser.add_argument("--no-ocr-cache", action="store_true", help="No leer ni escribir la caché OCR")
+    parser.add_argument("--clear-ocr-cache", action="store_true", help="Vaciar la caché OCR antes de procesar")
+    parser.add_argument("--image-store", help="Carpeta compartida de imágenes deduplicadas (por defecto <output>/assets)")
+    parser.add_argument("--image-phash-distance", type=int, default=None, help="Reutilizar imágenes casi idénticas cuyo dHash difiera en a lo más N bits (0-7)")
+    parser.add_argument("--no-table-prefilter", action="store_true", help="Ejecutar pdfplumber en todas las páginas, sin pre-filtro de trazos (para comparar tiempos)")
+    parser.add_argument("--force-ocr", action="store_true", help="Ignorar la capa de texto del PDF y aplicar OCR a todas las páginas")
 
     args = parser.parse_args()
 
     if not args.pdf and not args.input_dir:
         parser.error("Debe indicar un PDF o un directorio con --input-dir")
 
-    processor = PDFProcessor(output_dir=args.output)
+    processor = PDFProcessor(
+        output_dir=args.output,
+        dpi=args.dpi,
+        use_text_layer=not args.force_ocr,
+        page_jobs=args.page_jobs,
+        ocr_cache_path=None if args.no_ocr_cache else args.ocr_cache,
+        ocr_cache_max_mb=args.ocr_cache_size,
+        image_store_dir=args.image_store,
+        image_phash_distance=args.image_phash_distance,
+        table_prefilter=not args.no_table_prefilter,
+    )
+
+    if args.clear_ocr_cache:
+        OCRCache(Path(args.ocr_cache)).clear()
+        logger.info("Caché OCR vaciada: %s", args.ocr_cache)
 
     def process_single(pdf_path: Path, subject_hint: Optional[str]) -> Dict[str, Any]:
         subject = args.subject or subject_hint
@@ -480,10 +1124,17 @@ def main():
         classifier_kwargs = None
         if args.auto_classify and subject:
             classifier_kwargs = {
+                "backend": args.backend,
                 "temario_path": args.temario,
                 "model_name": args.model,
                 "device": args.device,
+                "mode": args.classifier_mode,
+                "cache_path": None if args.no_classification_cache else args.classification_cache,
+                "cascade_threshold": args.cascade_threshold,
+                "cascade_sample_rate": args.cascade_sample,
             }
+            if args.backend == "embedding":
+                classifier_kwargs["embedding_model"] = args.embedding_model
 
         return processor.process_pdf(
             pdf_path=str(pdf_path),
@@ -511,7 +1162,8 @@ def main():
 
     print("\nResumen del procesamiento:")
     for name, result in summary:
-        print(f"- {name}: {result['total_questions']} preguntas, {result['total_images']} imágenes, {result['total_tables']} tablas")
+        print(f"- {name}: {result['total_questions']} preguntas, {result['total_images']} imágenes ({result['unique_images']} únicas), {result['total_tables']} tablas "
+              f"({result['metadata']['table_extraction']['extraction_seconds']:.1f} s en tablas)")
 
 
 if __name__ == "__main__":
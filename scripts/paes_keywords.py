@@ -0,0 +1,290 @@
+"""
+Palabras clave PAES
+===================
+
+Fuente única de las listas de palabras clave por materia que usan el
+constructor del banco de preguntas (`pruebas/build_paes_questions_bank.py`)
+y el preclasificador por palabras clave
+(`classification/keyword_classifier.py`).
+
+- `AREA_KEYWORDS`: palabras por materia y área, con los nombres de área que
+  usa el banco de preguntas; `TEMARIO_AREAS` traduce los que difieren del
+  temario (`content/temario_paes_vs.csv`)
+- `LENGUAJE_TEMA_KEYWORDS`: pistas para elegir el tema de Lenguaje (solo
+  el preclasificador; el banco conserva sus propias regex de subcadena)
+- `HABILIDAD_KEYWORDS`: palabras por habilidad
+
+`AREA_KEYWORDS` es la tabla histórica del banco, que cuenta cada palabra
+como subcadena: sus entradas no se corrigen ni se amplían aquí, porque eso
+cambiaría las etiquetas del banco. El preclasificador busca palabras
+enteras (admitiendo el plural), así que las raíces como "octet" solo
+aportan en el banco.
+"""
+
+from typing import Dict, List
+
+# Palabras clave por materia y área (Historia, Química, Matemáticas y Lenguaje).
+# En Lenguaje las "áreas" del banco son las habilidades Evaluar/Interpretar/Localizar.
+AREA_KEYWORDS: Dict[str, Dict[str, List[str]]] = {
+    "CQ": {
+        "Estructura atómica": [
+            "átomo", "protón", "neutrón", "electrón", "orbital", "modelo atómico",
+            "bohr", "cuántico", "número atómico", "masa atómica", "isótopo",
+            "configuración electrónica", "nivel de energía", "capa", "subcapa",
+            "orbital", "spin", "tabla periódica", "grupo", "período", "metal",
+            "no metal", "gas noble", "elemento"
+        ],
+        "Enlaces químicos": [
+            "enlace", "covalente", "iónico", "metálico", "puente de hidrógeno",
+            "electronegatividad", "polar", "apolar", "dipolo", "molécular",
+            "lewis", "octet", "valencia", "par solitario", "hibridación"
+        ],
+        "Reacciones químicas": [
+            "reacción", "estequiometría", "mol", "reactivo", "producto", "rendimiento",
+            "limitante", "exceso", "balance", "oxidación", "reducción", "redox",
+            "neutralización", "ácido", "base", "sal", "precipitación", "combustión",
+            "síntesis", "descomposición", "intercambio", "equilibrio", "constante",
+            "le chatelier", "concentración", "presión", "temperatura", "catalizador"
+        ],
+        "Química orgánica": [
+            "orgánico", "carbono", "hidrocarburo", "alcano", "alqueno", "alquino",
+            "aromático", "benceno", "alcohol", "fenol", "éter", "aldehído", "cetona",
+            "ácido carboxílico", "éster", "amina", "amida", "funcional", "isomería",
+            "nomenclatura", "iupac", "saturado", "insaturado"
+        ]
+    },
+    # Usar solamente las áreas oficiales del temario actualizado
+    "H": {
+        "Historia": [
+            "chile", "chileno", "chilena", "colonia", "colonial", "independencia",
+            "república", "constitución", "guerra del pacífico", "parlamentarismo",
+            "alessandri", "ibáñez", "allende", "pinochet", "concertación", "dictadura",
+            "democracia", "transición", "frente popular", "unidad popular", "golpe de estado",
+            "reforma agraria", "nacionalización", "privatización", "antigüedad", "edad media",
+            "edad moderna", "edad contemporánea", "grecia", "roma", "imperio",
+            "revolución francesa", "revolución industrial", "mundial", "ilustración",
+            "guerra fría", "holocausto", "nazismo", "fascismo", "comunismo",
+            "capitalismo", "feudalismo", "absolutismo", "imperialismo", "colonialismo",
+            "descolonización", "revolución rusa", "primera guerra", "segunda guerra",
+            "siglo XIX", "siglo XX"
+        ],
+        "Formacion Ciudadana": [
+            "ciudadanía", "democracia", "constitución", "derechos humanos", "derechos fundamentales",
+            "participación", "representatividad", "votación", "sufragio", "elecciones",
+            "instituciones", "estado", "gobierno", "poderes del estado", "ejecutivo",
+            "legislativo", "judicial", "tecnología", "medios de comunicación", "redes sociales",
+            "libertad de expresión", "diversidad", "inclusión", "pluralismo", "tolerancia",
+            "bien común", "ley", "norma", "justicia"
+        ],
+        "Sistema Economico": [
+            "economía", "mercado", "oferta", "demanda", "precio", "consumo", "producción",
+            "bienes", "servicios", "factores productivos", "capital", "trabajo", "recursos",
+            "empresa", "industria", "comercio", "importación", "exportación", "aranceles",
+            "impuestos", "subsidios", "inflación", "deflación", "producto interno bruto",
+            "crecimiento económico", "desarrollo económico", "crisis", "recesión", "bancos",
+            "créditos", "interés", "globalización", "neoliberalismo", "libre mercado"
+        ]
+    },
+    # Áreas del temario correcto para Lenguaje según temario_paes_vf.csv
+    "L": {
+        "Evaluar": [
+            "evaluar", "evalúa", "crítica", "crítico", "juzgar", "valorar", "apreciar", "calidad", "pertinencia",
+            "información", "intención", "emisor", "propósito", "objetivo", "punto de vista", "perspectiva",
+            "opinión", "argumentos", "credibilidad", "validez", "juicio", "justificar", "criterios",
+            "convencer", "persuadir", "postura", "sesgo", "subjetividad", "objetividad", "veracidad",
+            "confiabilidad", "fundamentar", "sostener", "evidencia", "noticia", "artículo", "editorial",
+            "ensayo", "columna", "reseña", "informe", "manual", "instructivo", "expositivo", "argumentativo",
+            "obra", "literaria", "poema", "cuento", "novela", "narrativo", "lírico", "dramático", "personaje",
+            "narrador", "autor", "poeta", "dramaturgo", "literatura"
+        ],
+        "Interpretar": [
+            "interpretar", "interpreta", "comprender", "comprensión", "significado", "sentido", "idea central",
+            "tema", "mensaje", "global", "sintetizar", "resumir", "establecer", "relación", "relaciones",
+            "causa", "efecto", "problema", "solución", "comparación", "contraste", "secuencia", "párrafo",
+            "sección", "fragmento", "pasaje", "contextualizar", "implícito", "explícito", "inferir", "inferencia",
+            "deducir", "conclusión", "generalización", "específico", "detalle", "concepto", "definición",
+            "obra", "literaria", "poema", "cuento", "novela", "narrativo", "lírico", "dramático", "personaje",
+            "narrador", "autor", "poeta", "dramaturgo", "literatura"
+        ],
+        "Localizar": [
+            "localizar", "localiza", "identificar", "identifica", "información", "explícita", "reconocer",
+            "reconocimiento", "extraer", "dato", "nombres", "fechas", "lugares", "hechos", "cifras", "palabras clave",
+            "sinónimos", "paráfrasis", "equivalente", "significado", "buscar", "encontrar", "ubicar", "datos",
+            "evidencia", "elementos", "textual", "literal", "directo", "mencionado", "citado", "expuesto",
+            "presentado", "escrito", "explícito", "obra", "literaria", "poema", "cuento", "novela", "narrativo"
+        ]
+    },
+    # Áreas del temario actualizado para M1 con palabras clave ampliadas
+    "M1": {
+        "Algebra": [
+            "ecuación", "lineal", "sistemas", "inecuaciones", "fórmula", "expresión algebraica",
+            "factorización", "productos notables", "binomio", "trinomio", "monomio", "polinomio",
+            "variable", "término", "coeficiente", "resolución", "álgebra", "factor", "factorizar",
+            "combinación", "permutación", "operatoria", "símbolos", "operaciones", "signo",
+            "valor", "solución", "desarrolla", "simplifica", "sustituye", "reducir", "términos semejantes",
+            "distributiva", "ax+b", "cuadrado", "paréntesis", "corchetes", "incógnita", "resolución",
+            "evalúa"
+        ],
+        "Algebra y funciones": [
+            "función", "ecuación", "inecuación", "proporcionalidad", "gráfico", "coordenadas",
+            "pendiente", "ejes", "intercepto", "dominio", "recorrido", "imagen", "lineal",
+            "cuadrático", "exponencial", "logarítmico", "creciente", "decreciente", "directa",
+            "inversa", "plano cartesiano", "variable", "escala", "mapas", "f(x)", "g(x)", "y=",
+            "función", "evaluación", "gráfico", "tabla", "proporcional", "relación", "dependiente",
+            "independiente", "abscisa", "ordenada", "par ordenado", "punto", "xey", "recta",
+            "línea", "curva", "parábola", "exponencial", "correspondencia", "regla", "fórmula",
+            "asíntota", "intervalo", "graficar"
+        ],
+        "Estadistica": [
+            "probabilidad", "estadística", "condicional", "simple", "muestra", "población",
+            "evento", "espacio muestral", "variable aleatoria", "experimento", "frecuencia",
+            "resultado", "azar", "dado", "baraja", "extracción", "urna", "diagrama", "árbol",
+            "combinatoria", "factorial", "permutación", "conjunto", "independiente", "dependiente",
+            "caso", "favorable", "total", "laplace", "moneda", "carta", "naipe", "bola", "bolita",
+            "aleatorio", "equiprobable", "ley de laplace", "probabilidades", "casos", "ocurrir",
+            "azar", "suceso", "eventos", "posibilidad"
+        ],
+        "Geometria": [
+            "geometría", "triángulo", "cuadrado", "rectángulo", "polígono", "circunferencia",
+            "círculo", "ángulo", "lado", "vértice", "perímetro", "área", "volumen", "prisma",
+            "cilindro", "cuerpo", "sólido", "teorema", "pitagórico", "pitagoras", "cateto",
+            "hipotenusa", "trigonometría", "seno", "coseno", "tangente", "figura", "plano",
+            "espacio", "superficie", "altura", "base", "diagonal", "radio", "diámetro", "semejanza",
+            "congruencia", "paralelo", "perpendicular", "cubo", "esfera", "cono", "paralelogramo",
+            "trapecio", "rombo", "sector", "segmento", "arco", "isósceles", "equilátero",
+            "escaleno", "rectángulo", "obtusángulo", "acutángulo", "complementario", "suplementario"
+        ],
+        "Numeros": [
+            "número", "entero", "racional", "decimal", "fracción", "potencia", "raíz", "porcentaje",
+            "operación", "suma", "resta", "multiplicación", "división", "positivo", "negativo",
+            "factor", "múltiplo", "divisor", "orden", "comparación", "enésimo", "natural", "cálculo",
+            "interés", "descuento", "comercial", "numerador", "denominador", "equivalente",
+            "irreducible", "simplificar", "amplificar", "mixto", "impropio", "numérico", "valor",
+            "mayor", "menor", "igual", "distinto", "comparar", "ordenar", "sumar", "restar",
+            "multiplicar", "dividir", "potencia", "base", "exponente", "radical", "índice",
+            "radicando", "aproximar", "redondear", "truncar", "calcular", "resolver"
+        ],
+        "Probabilidad y Estadistica": [
+            "media", "mediana", "moda", "medida", "tendencia", "central", "dispersión", "dato",
+            "gráfico", "tabla", "representación", "frecuencia", "absoluta", "relativa", "acumulada",
+            "histograma", "polígono", "barras", "circular", "porcentaje", "distribución", "varianza",
+            "desviación", "estándar", "cuartil", "percentil", "población", "muestra", "estadístico",
+            "parámetro", "clase", "intervalo", "amplitud", "encuesta", "censo", "promedio", "rango",
+            "media aritmética", "ponderada", "conjunto", "datos", "variable", "cualitativa", "cuantitativa",
+            "discreta", "continua", "muestreo", "representativo", "conclusión", "análisis"
+        ]
+    },
+    # Áreas del temario actualizado para M2 con palabras clave ampliadas
+    "M2": {
+        "Algebra y funciones": [
+            "ecuación", "segundo grado", "cuadrática", "parábola", "vértice", "concavidad",
+            "discriminante", "raíces", "sistemas", "solución", "físico", "modelamiento",
+            "gráfico", "intersección", "único", "infinitas", "lineal", "recta", "múltiple",
+            "eje", "coordenada", "función", "evaluar", "valor", "dominio", "recorrido", "imagen",
+            "preimagen", "compuesta", "inversa", "creciente", "decreciente", "máximo", "mínimo",
+            "constante", "pendiente", "intercepto", "ecuación", "sistema", "sustitución", "igualación",
+            "reducción", "combinación", "gauss", "matriz", "determinante", "cramer", "eliminación"
+        ],
+        "Geometria": [
+            "homotecia", "transformación", "ampliación", "reducción", "centro", "factor",
+            "plano", "cartesiano", "similar", "proporcional", "razón", "figuras", "semejanza",
+            "trigonometría", "seno", "coseno", "tangente", "triángulo", "rectángulo", "navegación",
+            "ángulo", "altura", "distancia", "vector", "traslación", "rotación", "reflexión",
+            "simetría", "composición", "transformación", "isometría", "congruencia", "eje",
+            "punto", "origen", "imagen", "plano", "espacio", "coordenada", "proyección", "teorema",
+            "razón", "proporción", "semejanza", "congruencia", "tales", "segmento", "paralelo",
+            "transversal", "secante", "lado", "ángulos", "lados", "vértices", "inscrito", "circunscrito"
+        ],
+        "Numeros": [
+            "real", "conjunto", "operaciones", "radical", "fracción", "decimal", "logaritmo",
+            "exponencial", "crecimiento", "base", "propiedades", "matemática", "financiera",
+            "interés", "crédito", "inversión", "tasa", "capital", "simple", "compuesto", "anualidad",
+            "irracional", "racional", "entero", "natural", "número", "propiedad", "intervalo",
+            "desigualdad", "orden", "recta", "numérica", "pertenece", "pertenencia", "inclusión",
+            "subconjunto", "unión", "intersección", "complemento", "diferencia", "operación",
+            "aritmética", "logaritmo", "exponencial", "potencia", "raíz", "radical", "aplicación",
+            "capitalizar", "amortización", "valor futuro", "valor presente", "tasa", "capital"
+        ],
+        "Probabilidad y Estadistica": [
+            "dispersión", "variabilidad", "rango", "desviación", "estándar", "varianza",
+            "cuartil", "percentil", "análisis", "probabilidad", "condicional", "bayes",
+            "independencia", "toma", "decisión", "riesgo", "análisis", "árbol", "diagrama",
+            "contingencia", "tabla", "distribución", "normal", "binomial", "estándar", "media",
+            "esperanza", "dispersión", "varianza", "desviación", "coeficiente", "correlación",
+            "regresión", "línea", "ajuste", "tendencia", "proyección", "predicción", "inferencia",
+            "hipótesis", "contraste", "significativo", "nivel", "confianza", "error", "muestra",
+            "población", "parámetro", "estadístico", "aleatorio", "frecuencia", "relativa", "absoluta",
+            "acumulada", "histograma", "margen", "error", "estadística", "descriptiva", "inferencial"
+        ]
+    },
+}
+
+# Nombres de área del banco que difieren del temario, por materia
+TEMARIO_AREAS: Dict[str, Dict[str, str]] = {
+    "CQ": {
+        "Estructura atómica": "Estructura atomica",
+        # Los enlaces químicos se evalúan dentro de estructura atómica en el temario
+        "Enlaces químicos": "Estructura atomica",
+        "Reacciones químicas": "Reacciones quimicas y estequiometria",
+        "Química orgánica": "Quimica organica",
+    },
+    "M1": {
+        "Algebra": "Algebra y funciones",
+        "Estadistica": "Probabilidad y Estadistica",
+    },
+}
+
+# Pistas para el tema de Lenguaje (áreas temáticas de L en el temario)
+LENGUAJE_TEMA_KEYWORDS: Dict[str, List[str]] = {
+    "Juzgar la calidad y pertinencia de la informacion textual": [
+        "calidad", "pertinencia", "pertinente", "relevancia", "relevante", "exactitud", "validez"
+    ],
+    "Valorar la informacion textual en relacion con nuevos contextos": [
+        "contexto", "nuevo", "nueva", "aplicar", "relacionar", "extrapolar", "situación"
+    ],
+    "Determinar la intencion del emisor": [
+        "intención", "propósito", "emisor", "objetivo", "convencer", "persuadir",
+        "postura", "punto de vista"
+    ],
+    "Establecer relaciones causa-efecto y problema-solucion": [
+        "causa", "efecto", "problema", "solución", "resulta", "resultado", "consecuencia"
+    ],
+    "Determinar el significado de un parrafo o seccion": [
+        "párrafo", "sección", "fragmento", "pasaje", "parte", "apartado"
+    ],
+    "Sintetizar las ideas centrales del texto": [
+        "idea central", "ideas centrales", "sintetiza", "sintetizar", "resume", "resumen",
+        "resumir", "tema", "mensaje", "global"
+    ],
+    "Reconocer sinonimos y parafrasis en textos": [
+        "sinónimo", "paráfrasis", "significa", "significado", "equivale", "equivalente",
+        "reemplazar", "reemplaza", "sustituir"
+    ],
+    "Extraer informacion explicita de textos": [
+        "explícito", "explícita", "menciona", "según el texto", "de acuerdo con el texto", "dato",
+        "extraer", "identifica", "identificar", "señala", "afirma"
+    ],
+}
+
+# Palabras clave por habilidad: las de Lenguaje son las "áreas" L del banco
+HABILIDAD_KEYWORDS: Dict[str, List[str]] = {
+    **AREA_KEYWORDS["L"],
+    "Resolver problemas": [
+        "calcula", "calcular", "calcule", "determina", "determinar", "determine",
+        "resuelve", "resolver", "cuánto", "cuánta", "cuál es el", "cuál es la", "cuál será",
+        "valor de", "obtén", "encuentra"
+    ],
+    "Modelar": [
+        "modela", "modelar", "modelo", "expresión que representa", "plantea", "plantear",
+        "planteamiento", "ecuación que permite", "expresión que permite", "situación"
+    ],
+    "Representar": [
+        "gráfico", "tabla", "diagrama", "representa", "representar", "representación",
+        "esquema", "figura adjunta", "plano cartesiano"
+    ],
+    "Argumentar": [
+        "afirmación", "verdadera", "falsa", "justifica", "justificar", "argumenta",
+        "argumento", "demuestra", "es correcto", "es correcta", "necesariamente",
+        "suficiente", "conclusión"
+    ],
+}
@@ -136,26 +136,49 @@ async function runOCRProcessor(pdfPath, subject = null, skipPages = 0, options =
   });
 }
 
+// Subidas de imágenes compartidas ya iniciadas en este proceso (clave → Promise<URL>)
+const sharedUploads = new Map();
+
 /**
  * Sube una imagen a Supabase Storage
+ *
+ * Las imágenes del almacén deduplicado (con `sha256`) se suben una sola vez
+ * bajo `shared/<sha256>.<ext>` y todas las preguntas reutilizan esa URL; las
+ * demás se suben por pregunta como antes.
  * @param {string} imagePath - Ruta local de la imagen
  * @param {string} questionId - ID de la pregunta asociada
+ * @param {string} [sha256] - Hash del contenido, si la imagen viene del almacén compartido
  * @returns {Promise<string>} URL pública de la imagen
  */
-async function uploadImage(imagePath, questionId) {
+async function uploadImage(imagePath, questionId, sha256 = null) {
+  const fileName = path.basename(imagePath);
+  if (!sha256) {
+    return uploadImageTo(imagePath, `${questionId}/${fileName}`, true);
+  }
+
+  const key = `shared/${fileName}`;
+  if (!sharedUploads.has(key)) {
+    sharedUploads.set(key, uploadImageTo(imagePath, key, false));
+  }
+  return sharedUploads.get(key);
+}
+
+async function uploadImageTo(imagePath, key, upsert) {
   try {
-    const fileName = path.basename(imagePath);
     const fileBuffer = await fs.readFile(imagePath);
+    const ext = path.extname(imagePath).slice(1).toLowerCase();
     
     // Subir a Supabase Storage
-    const { data, error } = await supabase.storage
+    const { error } = await supabase.storage
       .from('question-images')
-      .upload(`${questionId}/${fileName}`, fileBuffer, {
-        contentType: 'image/png',
-        upsert: true
+      .upload(key, fileBuffer, {
+        contentType: ext === 'jpg' || ext === 'jpeg' ? 'image/jpeg' : `image/${ext || 'png'}`,
+        upsert
       });
     
-    if (error) {
+    // Un recurso compartido ya subido (por otra ejecución) tiene el mismo contenido
+    const alreadyExists = error && (String(error.statusCode) === '409' || /exists/i.test(error.message || ''));
+    if (error && !(alreadyExists && !upsert)) {
       console.error('Error subiendo imagen:', error);
       return null;
     }
@@ -163,7 +186,7 @@ async function uploadImage(imagePath, questionId) {
     // Obtener URL pública
     const { data: { publicUrl } } = supabase.storage
       .from('question-images')
-      .getPublicUrl(`${questionId}/${fileName}`);
+      .getPublicUrl(key);
     
     return publicUrl;
   } catch (error) {
@@ -189,10 +212,11 @@ async function importToSupabase(ocrResult, autoClassify = true) {
     errors: []
   };
   
-  // Crear un mapa de imágenes por ID para búsqueda rápida
+  // Crear un mapa de imágenes por ID para búsqueda rápida; con el almacén
+  // deduplicado una misma imagen puede aparecer en varias páginas
   const imageMap = {};
   (ocrResult.images || []).forEach(img => {
-    imageMap[img.id] = img;
+    (imageMap[img.id] = imageMap[img.id] || []).push(img);
   });
   
   // Si autoClassify está activado, clasificar las preguntas primero
@@ -282,11 +306,12 @@ async function importToSupabase(ocrResult, autoClassify = true) {
       if (question.images && question.images.length > 0) {
         const uploadedImages = [];
         const imagePromises = question.images.map(async (imageId) => {
-          const imageInfo = imageMap[imageId];
-          if (!imageInfo) return;
+          const occurrences = imageMap[imageId];
+          if (!occurrences) return;
+          const imageInfo = occurrences.find(img => img.page === question.page) || occurrences[0];
           
           // Subir imagen a storage
-          const imageUrl = await uploadImage(imageInfo.path, insertedQuestion.id);
+          const imageUrl = await uploadImage(imageInfo.path, insertedQuestion.id, imageInfo.sha256);
           
           if (imageUrl) {
             // Guardar referencia en base de datos
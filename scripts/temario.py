@@ -0,0 +1,292 @@
+"""
+Índice del temario PAES
+=======================
+
+Compila una sola vez el CSV del temario en un árbol inmutable
+materia → área temática → tema → (subtemas, habilidades) con búsquedas O(1),
+y lo memoriza en disco (pickle) bajo el hash del CSV. Lo usan el
+clasificador taxonómico, los generadores de preguntas y el constructor del
+banco de preguntas, sin necesidad de pandas.
+
+Acepta las variantes de CSV del repositorio:
+- `content/temario_paes_vs.csv`: `Subject,Area_tematica,Tema,Habilidad`
+- `content/temario_paes.csv` / `pruebas/temario_paes_vf.csv`:
+  `subject;area;theme;subtheme` (UTF-8 con BOM)
+- `temario.csv` de los generadores: `Subject;Área Temática;Tema;Subtema`
+"""
+
+import io
+import os
+import csv
+import pickle
+import hashlib
+import logging
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Subir al cambiar la estructura del índice: invalida los pickles anteriores
+TEMARIO_INDEX_VERSION = 1
+
+DEFAULT_TEMARIO_CACHE_DIR = Path(
+    os.environ.get("PAES_TEMARIO_CACHE", Path.home() / ".cache" / "paes_temario")
+)
+
+# Nombres de columna aceptados para cada campo
+_COLUMN_ALIASES = {
+    "subject": ("subject",),
+    "area": ("area_tematica", "área temática", "area temática", "area tematica", "area"),
+    "tema": ("tema", "theme"),
+    "subtema": ("subtema", "subtheme"),
+    "habilidad": ("habilidad", "habilidades"),
+}
+
+_QUOTES = "\"'“”"
+
+
+class _Frozen:
+    """Base de los nodos: sin __dict__ y sin asignaciones tras construirse"""
+
+    __slots__ = ()
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} es inmutable")
+
+    def _init(self, **values) -> None:
+        for name, value in values.items():
+            object.__setattr__(self, name, value)
+
+
+class Tema(_Frozen):
+    __slots__ = ("name", "subtemas", "habilidades")
+
+    def __init__(self, name: str, subtemas: Tuple[str, ...], habilidades: Tuple[str, ...]):
+        self._init(name=name, subtemas=subtemas, habilidades=habilidades)
+
+    def __reduce__(self):
+        return (Tema, (self.name, self.subtemas, self.habilidades))
+
+    def __repr__(self) -> str:
+        return f"Tema({self.name!r})"
+
+
+class Area(_Frozen):
+    __slots__ = ("name", "_temas", "tema_names")
+
+    def __init__(self, name: str, temas: Dict[str, Tema]):
+        self._init(name=name, _temas=dict(temas), tema_names=tuple(sorted(temas)))
+
+    def __reduce__(self):
+        return (Area, (self.name, self._temas))
+
+    def __getitem__(self, tema: str) -> Tema:
+        return self._temas[tema]
+
+    def __contains__(self, tema: str) -> bool:
+        return tema in self._temas
+
+    def __iter__(self) -> Iterator[Tema]:
+        return iter(self._temas.values())
+
+    def __len__(self) -> int:
+        return len(self._temas)
+
+    def __repr__(self) -> str:
+        return f"Area({self.name!r}, {len(self)} temas)"
+
+
+class Subject(_Frozen):
+    __slots__ = ("code", "_areas", "area_names")
+
+    def __init__(self, code: str, areas: Dict[str, Area]):
+        self._init(code=code, _areas=dict(areas), area_names=tuple(sorted(areas)))
+
+    def __reduce__(self):
+        return (Subject, (self.code, self._areas))
+
+    def __getitem__(self, area: str) -> Area:
+        return self._areas[area]
+
+    def __contains__(self, area: str) -> bool:
+        return area in self._areas
+
+    def __iter__(self) -> Iterator[Area]:
+        return iter(self._areas.values())
+
+    def __len__(self) -> int:
+        return len(self._areas)
+
+    def __repr__(self) -> str:
+        return f"Subject({self.code!r}, {len(self)} áreas)"
+
+
+class TemarioIndex(_Frozen):
+    """Temario compilado: materias con sus áreas, temas, subtemas y habilidades"""
+
+    __slots__ = ("sha256", "row_count", "_subjects", "subject_codes", "all_areas", "_temas_by_area_name")
+
+    def __init__(self, sha256: str, row_count: int, subjects: Dict[str, Subject]):
+        temas_by_area_name: Dict[str, set] = {}
+        for subject in subjects.values():
+            for area in subject:
+                temas_by_area_name.setdefault(area.name, set()).update(area.tema_names)
+
+        self._init(
+            sha256=sha256,
+            row_count=row_count,
+            _subjects=dict(subjects),
+            subject_codes=tuple(sorted(subjects)),
+            all_areas=tuple(sorted(temas_by_area_name)),
+            _temas_by_area_name={area: tuple(sorted(temas)) for area, temas in temas_by_area_name.items()},
+        )
+
+    def __reduce__(self):
+        return (TemarioIndex, (self.sha256, self.row_count, self._subjects))
+
+    def __getitem__(self, code: str) -> Subject:
+        return self._subjects[code]
+
+    def __contains__(self, code: str) -> bool:
+        return code in self._subjects
+
+    def __iter__(self) -> Iterator[Subject]:
+        return iter(self._subjects.values())
+
+    def __len__(self) -> int:
+        return len(self._subjects)
+
+    def areas(self, code: str) -> Tuple[str, ...]:
+        """Áreas de una materia, ordenadas (vacío si la materia no existe)"""
+        subject = self._subjects.get(code)
+        return subject.area_names if subject else ()
+
+    def temas(self, code: str, area: str) -> Tuple[str, ...]:
+        """Temas de un área dentro de una materia, ordenados"""
+        subject = self._subjects.get(code)
+        if subject is None or area not in subject:
+            return ()
+        return subject[area].tema_names
+
+    def temas_for_area(self, area: str) -> Tuple[str, ...]:
+        """Temas de un área en cualquier materia"""
+        return self._temas_by_area_name.get(area, ())
+
+    def rows(self) -> Iterator[Tuple[str, str, str, str]]:
+        """Filas (materia, área, tema, subtema) en orden de aparición; subtema vacío si no hay"""
+        for subject in self._subjects.values():
+            for area in subject:
+                for tema in area:
+                    for subtema in tema.subtemas or ("",):
+                        yield subject.code, area.name, tema.name, subtema
+
+    def as_nested(self) -> Dict[str, Dict[str, Dict[str, List[str]]]]:
+        """Copia mutable materia → área → tema → [subtemas], el formato de los generadores"""
+        return {
+            subject.code: {
+                area.name: {tema.name: list(tema.subtemas) for tema in area}
+                for area in subject
+            }
+            for subject in self._subjects.values()
+        }
+
+
+def _split_habilidades(value: str) -> Tuple[str, ...]:
+    return tuple(part.strip(_QUOTES + " ") for part in value.strip(_QUOTES).split(",") if part.strip(_QUOTES + " "))
+
+
+def _resolve_columns(header: List[str]) -> Dict[str, int]:
+    normalised = [column.strip().lower() for column in header]
+    columns = {}
+    for field, aliases in _COLUMN_ALIASES.items():
+        for alias in aliases:
+            if alias in normalised:
+                columns[field] = normalised.index(alias)
+                break
+    missing = [field for field in ("subject", "area", "tema") if field not in columns]
+    if missing:
+        raise ValueError(f"Columnas faltantes en el temario: {missing} (cabecera: {header})")
+    return columns
+
+
+def compile_temario(data: bytes) -> TemarioIndex:
+    """Compila el contenido de un CSV de temario en un TemarioIndex"""
+    text = data.decode("utf-8-sig")
+    first_line = text.split("\n", 1)[0]
+    delimiter = ";" if ";" in first_line else ","
+    reader = csv.reader(io.StringIO(text), delimiter=delimiter)
+    columns = _resolve_columns(next(reader))
+
+    # Diccionarios ordenados por inserción: se respeta el orden del CSV
+    tree: Dict[str, Dict[str, Dict[str, Tuple[Dict[str, None], Dict[str, None]]]]] = {}
+    row_count = 0
+    for row in reader:
+        if len(row) <= max(columns.values()):
+            continue
+        subject = row[columns["subject"]].strip().upper()
+        area = row[columns["area"]].strip()
+        tema = row[columns["tema"]].strip()
+        if not (subject and area and tema):
+            continue
+        row_count += 1
+
+        subtemas, habilidades = tree.setdefault(subject, {}).setdefault(area, {}).setdefault(tema, ({}, {}))
+        if "subtema" in columns and row[columns["subtema"]].strip():
+            subtemas[row[columns["subtema"]].strip()] = None
+        if "habilidad" in columns:
+            habilidades.update(dict.fromkeys(_split_habilidades(row[columns["habilidad"]])))
+
+    subjects = {
+        code: Subject(code, {
+            area: Area(area, {
+                tema: Tema(tema, tuple(subtemas), tuple(habilidades))
+                for tema, (subtemas, habilidades) in temas.items()
+            })
+            for area, temas in areas.items()
+        })
+        for code, areas in tree.items()
+    }
+    return TemarioIndex(hashlib.sha256(data).hexdigest(), row_count, subjects)
+
+
+# Índices ya cargados en este proceso, por hash del CSV
+_LOADED: Dict[str, TemarioIndex] = {}
+
+
+def load_temario(path, cache_dir: Optional[Path] = DEFAULT_TEMARIO_CACHE_DIR) -> TemarioIndex:
+    """
+    Índice del temario en `path`: desde memoria, desde el pickle en
+    `cache_dir` o compilando el CSV (y guardando el pickle) la primera vez
+
+    Args:
+        path: Ruta al CSV del temario
+        cache_dir: Carpeta de pickles (None para no usar caché en disco)
+    """
+    data = Path(path).read_bytes()
+    sha256 = hashlib.sha256(data).hexdigest()
+    if sha256 in _LOADED:
+        return _LOADED[sha256]
+
+    cache_file = cache_dir / f"{sha256}.v{TEMARIO_INDEX_VERSION}.pickle" if cache_dir else None
+    index = None
+    if cache_file is not None and cache_file.exists():
+        try:
+            with open(cache_file, "rb") as f:
+                index = pickle.load(f)
+        except Exception as e:
+            logger.warning(f"Caché de temario ilegible ({cache_file}): {e}")
+
+    if index is None:
+        index = compile_temario(data)
+        if cache_file is not None:
+            try:
+                cache_file.parent.mkdir(parents=True, exist_ok=True)
+                tmp_file = cache_file.with_suffix(f".{os.getpid()}.tmp")
+                with open(tmp_file, "wb") as f:
+                    pickle.dump(index, f, protocol=pickle.HIGHEST_PROTOCOL)
+                tmp_file.replace(cache_file)
+            except OSError as e:
+                logger.warning(f"No se pudo guardar la caché de temario: {e}")
+
+    _LOADED[sha256] = index
+    return index
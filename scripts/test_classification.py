@@ -49,19 +49,15 @@ def test_temario():
         return False
         
     try:
-        import pandas as pd
-        df = pd.read_csv(temario_path)
-        
-        required_columns = ['Subject', 'Area_tematica', 'Tema', 'Habilidad']
-        missing_columns = [col for col in required_columns if col not in df.columns]
+        sys.path.insert(0, str(Path(__file__).parent))
+        from temario import load_temario
         
-        if missing_columns:
-            print(f"❌ Columnas faltantes en temario: {missing_columns}")
-            return False
+        # load_temario valida las columnas requeridas
+        temario = load_temario(temario_path)
             
-        print(f"✅ Temario cargado: {len(df)} entradas")
-        print(f"   Materias: {', '.join(df['Subject'].unique())}")
-        print(f"   Total áreas temáticas: {len(df['Area_tematica'].unique())}")
+        print(f"✅ Temario cargado: {temario.row_count} entradas")
+        print(f"   Materias: {', '.join(temario.subject_codes)}")
+        print(f"   Total áreas temáticas: {len(temario.all_areas)}")
         
         return True
         
@@ -0,0 +1,74 @@
+#!/usr/bin/env python
+"""
+Pruebas de la caché de clasificaciones
+======================================
+
+La caché en SQLite de TaxonomyClassifier memoriza solo los resultados
+correctos: una falla del modelo no queda guardada y se reintenta en la
+siguiente llamada. El modelo se reemplaza por una subclase sin transformers.
+
+Uso:
+    python scripts/test_classification_cache.py
+    (o `python -m pytest scripts/test_classification_cache.py`)
+"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = SCRIPTS_DIR.parent
+if str(SCRIPTS_DIR) not in sys.path:
+    sys.path.insert(0, str(SCRIPTS_DIR))
+
+TEMARIO = PROJECT_ROOT / "content" / "temario_paes_vs.csv"
+
+
+def test_cache_skips_error_results():
+    from classification.taxonomy_classifier import TaxonomyClassifier
+
+    class FlakyClassifier(TaxonomyClassifier):
+        """Falla la primera vez que llega al modelo y clasifica desde la segunda"""
+
+        calls = 0
+
+        def _fit_for_model(self, texts):
+            return texts
+
+        def _classify_prepared(self, texts, subject):
+            FlakyClassifier.calls += 1
+            if FlakyClassifier.calls == 1:
+                return self._error_results(texts, subject, RuntimeError("modelo no disponible"))
+            stage = {'label': 'Numeros', 'score': 0.9, 'all_scores': {'Numeros': 0.9}}
+            return [self._build_result(subject, stage, stage, stage) for _ in texts]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        classifier = FlakyClassifier(temario_path=str(TEMARIO), cache_path=os.path.join(tmp, "cache.sqlite"))
+        texts = ["¿Cuánto es 2+2?"]
+
+        failed = classifier._classify_texts(texts, "M1")
+        assert failed[0]['error'] == "modelo no disponible"
+
+        # El error no quedó memorizado: la segunda vez se vuelve al modelo
+        retried = classifier._classify_texts(texts, "M1")
+        assert 'error' not in retried[0]
+        assert FlakyClassifier.calls == 2
+
+        # El resultado correcto sí se memoriza
+        cached = classifier._classify_texts(texts, "M1")
+        assert cached == retried
+        assert FlakyClassifier.calls == 2
+        classifier.cache.close()
+
+
+def run():
+    tests = [value for name, value in globals().items() if name.startswith("test_") and callable(value)]
+    for test in tests:
+        test()
+        print(f"✅ {test.__name__}")
+    print(f"✅ {len(tests)} pruebas de la caché de clasificaciones pasaron")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,69 @@
+#!/usr/bin/env python
+"""
+Pruebas del modo --stream de classify_batch.py
+==============================================
+
+La salida JSONL se reanuda desde el último registro completo: una línea
+cortada a mitad de escritura se descarta y se vuelve a clasificar.
+
+Uso:
+    python scripts/test_classify_stream.py
+    (o `python -m pytest scripts/test_classify_stream.py`)
+"""
+
+import io
+import sys
+import json
+import tempfile
+from argparse import Namespace
+from contextlib import redirect_stderr
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+if str(SCRIPTS_DIR) not in sys.path:
+    sys.path.insert(0, str(SCRIPTS_DIR))
+
+
+def test_stream_resumes_after_truncated_line():
+    import classify_batch
+
+    records = [{"id": f"q{i}", "content": f"Pregunta {i}"} for i in range(5)]
+    calls = []
+
+    def classify(batch):
+        calls.append([item["id"] for item in batch])
+        return [dict(item, area_tematica="Numeros") for item in batch]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        source = Path(tmp) / "banco.jsonl"
+        output = Path(tmp) / "clasificado.jsonl"
+        source.write_text("".join(json.dumps(r) + "\n" for r in records), encoding="utf-8")
+        # Dos registros completos y el tercero cortado a mitad de escritura
+        done = [dict(r, area_tematica="Numeros") for r in records[:3]]
+        output.write_text(
+            json.dumps(done[0]) + "\n" + json.dumps(done[1]) + "\n" + json.dumps(done[2])[:10],
+            encoding="utf-8",
+        )
+
+        args = Namespace(input=source, output=output, subject="M1", chunk_size=2)
+        with redirect_stderr(io.StringIO()):
+            total, _ = classify_batch.stream(args, classify)
+
+        written = [json.loads(line) for line in output.read_text(encoding="utf-8").splitlines()]
+
+    assert total == 3
+    assert calls == [["q2", "q3"], ["q4"]]
+    assert [item["id"] for item in written] == ["q0", "q1", "q2", "q3", "q4"]
+    assert all(item["subject"] == "M1" for item in written[2:])
+
+
+def run():
+    tests = [value for name, value in globals().items() if name.startswith("test_") and callable(value)]
+    for test in tests:
+        test()
+        print(f"✅ {test.__name__}")
+    print(f"✅ {len(tests)} pruebas de --stream pasaron")
+
+
+if __name__ == "__main__":
+    run()
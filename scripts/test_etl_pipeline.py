@@ -0,0 +1,201 @@
+#!/usr/bin/env python
+"""
+Pruebas de regresión del pipeline OCR → clasificación
+=====================================================
+
+Complementan `test_etl.js` (lado Node) con las piezas Python del pipeline
+que no necesitan Tesseract, PyMuPDF ni el modelo:
+
+- Parseo de preguntas con `span` y `bbox`
+- El parser de una sola pasada da las mismas preguntas que el original,
+  que partía el texto página a página
+
+Uso:
+    python scripts/test_etl_pipeline.py
+    (o `python -m pytest scripts/test_etl_pipeline.py`)
+"""
+
+import os
+import sys
+import random
+import tempfile
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+if str(SCRIPTS_DIR) not in sys.path:
+    sys.path.insert(0, str(SCRIPTS_DIR))
+
+from ocr.pdf_processor import PDFProcessor  # noqa: E402
+
+
+def _processor(tmp):
+    # dpi 72: las coordenadas de las palabras ya están en puntos PDF
+    return PDFProcessor(
+        output_dir=os.path.join(tmp, "output"),
+        temp_dir=os.path.join(tmp, "images"),
+        dpi=72,
+        ocr_cache_path=None,
+    )
+
+
+def _words_data(paragraphs):
+    """
+    `words_data` al estilo de `image_to_data` a partir de párrafos, cada uno
+    una lista de líneas (top, [(left, palabra), ...])
+    """
+    words = {key: [] for key in (
+        "level", "block_num", "par_num", "line_num", "word_num",
+        "left", "top", "width", "height", "text",
+    )}
+    for par_num, lines in enumerate(paragraphs, start=1):
+        for line_num, (top, line_words) in enumerate(lines, start=1):
+            for word_num, (left, text) in enumerate(line_words, start=1):
+                for key, value in (
+                    ("level", 5), ("block_num", 1), ("par_num", par_num), ("line_num", line_num),
+                    ("word_num", word_num), ("left", left), ("top", top),
+                    ("width", 10 * len(text)), ("height", 12), ("text", text),
+                ):
+                    words[key].append(value)
+    return words
+
+
+def _page(page_num, paragraphs):
+    words = _words_data(paragraphs)
+    return {
+        "page_num": page_num,
+        "text": PDFProcessor._words_to_text(words),
+        "words_data": words,
+        "source": "ocr",
+    }
+
+
+def test_parse_questions_span_and_bbox():
+    pages = [
+        _page(0, [
+            [(100, [(50, "1."), (80, "¿Cuánto"), (170, "es"), (200, "2+2?")])],
+            [(130, [(50, "A)"), (80, "3")])],
+            [(150, [(50, "B)"), (80, "4")])],
+            [(300, [(50, "2."), (80, "Lea"), (120, "el"), (150, "texto")])],
+        ]),
+        _page(1, [
+            [(40, [(60, "continúa"), (160, "el"), (190, "enunciado")])],
+            [(70, [(50, "A)"), (80, "sí")])],
+        ]),
+    ]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        questions = _processor(tmp)._parse_questions(pages)
+
+    assert [q["question_number"] for q in questions] == [1, 2]
+    first, second = questions
+    assert first["content"] == "¿Cuánto es 2+2?"
+    assert first["options"] == ["A) 3", "B) 4"]
+    assert first["span"]["start_page"] == first["span"]["end_page"] == 0
+    assert pages[0]["text"][first["span"]["start"]:first["span"]["end"]].startswith("1. ¿Cuánto")
+    assert first["bbox"] == [{"page": 0, "x0": 50, "top": 100, "x1": 240, "bottom": 162}]
+
+    # La segunda pregunta continúa en la página siguiente
+    assert second["content"] == "Lea el texto continúa el enunciado"
+    assert second["span"]["start_page"] == 0 and second["span"]["end_page"] == 1
+    assert pages[1]["text"][:second["span"]["end"]].endswith("A) sí")
+    assert [box["page"] for box in second["bbox"]] == [0, 1]
+    assert second["bbox"][0]["top"] == 300
+    assert second["bbox"][1] == {"page": 1, "x0": 50, "top": 40, "x1": 280, "bottom": 82}
+
+
+def _reference_parse_questions(pages_data):
+    """
+    `_parse_questions` original: `split('\\n\\n')` página a página y el
+    enunciado acumulado con `+=`, sin `span` ni `bbox`
+    """
+    questions = []
+    current_question = None
+
+    for page_data in pages_data:
+        blocks = [b.strip() for b in page_data['text'].split('\n\n') if b.strip()]
+        for block in blocks:
+            match = PDFProcessor.QUESTION_REGEX.match(block)
+            if match:
+                if current_question:
+                    questions.append(current_question)
+                num, content = match.groups()
+                current_question = {
+                    "question_number": int(num),
+                    "content": content.strip(),
+                    "options": [],
+                    "page": page_data['page_num'],
+                }
+            elif current_question:
+                if PDFProcessor.OPTION_REGEX.match(block):
+                    current_question["options"].append(block.strip())
+                else:
+                    current_question["content"] += " " + block.strip()
+
+    if current_question:
+        questions.append(current_question)
+    return questions
+
+
+def _assert_same_questions(pages):
+    with tempfile.TemporaryDirectory() as tmp:
+        parsed = _processor(tmp)._parse_questions(pages)
+    expected = _reference_parse_questions(pages)
+    got = [{key: question[key] for key in ("question_number", "content", "options", "page")} for question in parsed]
+    assert got == expected, (pages, got, expected)
+
+
+def test_parse_questions_matches_per_page_parser():
+    # Capa de texto: saltos de línea irregulares, bordes de página y bloques que no son preguntas
+    text_layer = [
+        {"page_num": 0, "text": "PRUEBA DE MATEMÁTICA\n\n1. ¿Cuál es el valor de x?\nSi 2x = 4\n\nA) 1\n\nB) 2\n"},
+        {"page_num": 1, "text": "\nC) 3\n\n\n\nD) 4\n\n\nE) 5\n\n2.\tEn la figura\n\n\n"},
+        {"page_num": 2, "text": ""},
+        {"page_num": 3, "text": "1.5 no es un marcador\n\nF) tampoco es opción\n\nA)sin espacio\n\n  A) con sangría  \n\n12. Última"},
+        {"page_num": 4, "text": "\n\n\n\n\n"},
+        {"page_num": 5, "text": "B) cierra\n\n\n13. Sin opciones"},
+    ]
+    _assert_same_questions(text_layer)
+
+    # OCR: texto armado desde words_data, con la pregunta partida entre páginas
+    _assert_same_questions([
+        _page(0, [
+            [(100, [(50, "1."), (80, "¿Cuánto"), (170, "es"), (200, "2+2?")])],
+            [(130, [(50, "A)"), (80, "3")])],
+            [(300, [(50, "2."), (80, "Lea"), (120, "el"), (150, "texto")])],
+        ]),
+        _page(1, [
+            [(40, [(60, "continúa"), (160, "el"), (190, "enunciado")])],
+            [(70, [(50, "A)"), (80, "sí")])],
+            [(90, [(50, "3."), (80, "Otra")])],
+        ]),
+        _page(2, [[(40, [(50, "B)"), (80, "no")])]]),
+    ])
+
+    # Páginas generadas al azar (semilla fija) con los mismos tipos de bloque
+    blocks = [
+        "1. Pregunta", "27.  Otra pregunta\ncon dos líneas", "3.sin espacio", "A) uno", "B)  dos",
+        "E) cinco", "F) seis", "Texto de apoyo", "  sangría  ", "", "\n", "4.\n\nmarcador solo",
+    ]
+    separators = ["\n", "\n\n", "\n\n\n", " \n\n ", "\n\n\n\n"]
+    rng = random.Random(25)
+    for _ in range(200):
+        pages = []
+        for page_num in range(rng.randint(1, 4)):
+            parts = []
+            for _ in range(rng.randint(0, 8)):
+                parts.append(rng.choice(blocks))
+                parts.append(rng.choice(separators))
+            pages.append({"page_num": page_num, "text": "".join(parts[:rng.randint(0, len(parts))])})
+        _assert_same_questions(pages)
+
+
+def run():
+    tests = [value for name, value in globals().items() if name.startswith("test_") and callable(value)]
+    for test in tests:
+        test()
+        print(f"✅ {test.__name__}")
+    print(f"✅ {len(tests)} pruebas de regresión del pipeline pasaron")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,68 @@
+#!/usr/bin/env python
+"""
+Pruebas del manifiesto del batch runner
+=======================================
+
+Un PDF ya procesado se salta solo si su contenido, la configuración y el
+`preguntas.json` de salida siguen siendo los mismos que al registrarlo.
+
+Uso:
+    python scripts/test_manifest.py
+    (o `python -m pytest scripts/test_manifest.py`)
+"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+if str(SCRIPTS_DIR) not in sys.path:
+    sys.path.insert(0, str(SCRIPTS_DIR))
+
+from ocr.manifest import Manifest  # noqa: E402
+
+
+def test_manifest_invalidation():
+    with tempfile.TemporaryDirectory() as tmp:
+        pdf = Path(tmp) / "prueba.pdf"
+        output = Path(tmp) / "prueba" / "preguntas.json"
+        pdf.write_bytes(b"%PDF-1.4 original")
+        output.parent.mkdir()
+        output.write_text("{}", encoding="utf-8")
+
+        manifest = Manifest(Path(tmp) / ".manifest.json")
+        manifest.record(pdf, "config-a", output)
+        manifest.save()
+
+        manifest = Manifest(Path(tmp) / ".manifest.json")
+        assert manifest.is_current(pdf, "config-a", output)
+        # Otra configuración (p. ej. otro PIPELINE_VERSION) invalida el resultado
+        assert not manifest.is_current(pdf, "config-b", output)
+
+        # Mismo contenido con otro mtime (copia) sigue vigente
+        stat = pdf.stat()
+        os.utime(pdf, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        assert manifest.is_current(pdf, "config-a", output)
+
+        # Contenido distinto lo invalida
+        pdf.write_bytes(b"%PDF-1.4 cambiado")
+        assert not manifest.is_current(pdf, "config-a", output)
+
+        # Sin preguntas.json tampoco está vigente
+        pdf.write_bytes(b"%PDF-1.4 original")
+        manifest.record(pdf, "config-a", output)
+        output.unlink()
+        assert not manifest.is_current(pdf, "config-a", output)
+
+
+def run():
+    tests = [value for name, value in globals().items() if name.startswith("test_") and callable(value)]
+    for test in tests:
+        test()
+        print(f"✅ {test.__name__}")
+    print(f"✅ {len(tests)} pruebas del manifiesto pasaron")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,68 @@
+#!/usr/bin/env python
+"""
+Pruebas de asociación de imágenes y tablas a preguntas
+======================================================
+
+`_associate_images_to_questions` reparte las figuras y tablas de cada página
+según la altura de los marcadores "N." de las preguntas. Las páginas se arman
+con `words_data` sintético, sin OCR.
+
+Uso:
+    python scripts/test_question_association.py
+    (o `python -m pytest scripts/test_question_association.py`)
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+if str(SCRIPTS_DIR) not in sys.path:
+    sys.path.insert(0, str(SCRIPTS_DIR))
+
+from test_etl_pipeline import _page, _processor  # noqa: E402
+
+
+def test_associate_images_with_missing_marker():
+    # El marcador de la 6 se leyó "6," y no ancla; la 7 igual se localiza
+    page = _page(0, [
+        [(100, [(50, "5."), (80, "Enunciado")])],
+        [(300, [(50, "6,"), (80, "Enunciado")])],
+        [(500, [(50, "7."), (80, "Enunciado")])],
+    ])
+    questions = [{"question_number": n, "page": 0} for n in (5, 6, 7)]
+    images = [
+        {"id": "figura-5", "page": 0, "coordinates": {"center_y": 200}},
+        {"id": "figura-7", "page": 0, "coordinates": {"center_y": 600}},
+    ]
+    tables = [{"page": 0, "coordinates": {"x0": 0, "top": 550, "x1": 100, "bottom": 650}}]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        _processor(tmp)._associate_images_to_questions(questions, images, [page], tables)
+
+    assert [q["images"] for q in questions] == [["figura-5"], [], ["figura-7"]]
+    assert [len(q["tables"]) for q in questions] == [0, 0, 1]
+    assert [q["has_visual_content"] for q in questions] == [True, False, True]
+
+
+def test_associate_images_without_anchors_falls_back_to_page():
+    page = _page(0, [[(100, [(50, "Sin"), (90, "marcadores")])]])
+    questions = [{"question_number": n, "page": 0} for n in (1, 2)]
+    images = [{"id": "figura", "page": 0, "coordinates": {"center_y": 200}}]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        _processor(tmp)._associate_images_to_questions(questions, images, [page])
+
+    assert [q["images"] for q in questions] == [["figura"], ["figura"]]
+
+
+def run():
+    tests = [value for name, value in globals().items() if name.startswith("test_") and callable(value)]
+    for test in tests:
+        test()
+        print(f"✅ {test.__name__}")
+    print(f"✅ {len(tests)} pruebas de asociación de imágenes pasaron")
+
+
+if __name__ == "__main__":
+    run()
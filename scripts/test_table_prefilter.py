@@ -0,0 +1,98 @@
+#!/usr/bin/env python
+"""
+Pruebas del pre-filtro de tablas de PDFProcessor
+================================================
+
+`_is_table_candidate` decide, con los trazos de `page.get_drawings()`, si
+vale la pena pasarle la página a pdfplumber. Las páginas se simulan con los
+mismos items que entrega PyMuPDF ("l", "re", "qu", "c"), sin abrir un PDF.
+
+Uso:
+    python scripts/test_table_prefilter.py
+    (o `python -m pytest scripts/test_table_prefilter.py`)
+"""
+
+import sys
+import tempfile
+from collections import namedtuple
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+if str(SCRIPTS_DIR) not in sys.path:
+    sys.path.insert(0, str(SCRIPTS_DIR))
+
+from test_etl_pipeline import _processor  # noqa: E402
+
+Point = namedtuple("Point", "x y")
+Quad = namedtuple("Quad", "ul ur ll lr")
+
+
+class FakePage:
+    """Página con solo `get_drawings`, como la devuelve PyMuPDF"""
+
+    def __init__(self, *drawings):
+        self.drawings = [{"items": items} for items in drawings]
+
+    def get_drawings(self):
+        return self.drawings
+
+
+def _line(x0, y0, x1, y1):
+    return ("l", Point(x0, y0), Point(x1, y1))
+
+
+def _curve(*points):
+    return ("c", *(Point(x, y) for x, y in points))
+
+
+def _is_candidate(page):
+    with tempfile.TemporaryDirectory() as tmp:
+        return _processor(tmp)._is_table_candidate(page)
+
+
+def test_figure_without_table_is_skipped():
+    # Un círculo (cuatro Bézier) y un triángulo con base horizontal
+    circle = [
+        _curve((100, 50), (128, 50), (150, 72), (150, 100)),
+        _curve((150, 100), (150, 128), (128, 150), (100, 150)),
+        _curve((100, 150), (72, 150), (50, 128), (50, 100)),
+        _curve((50, 100), (50, 72), (72, 50), (100, 50)),
+    ]
+    triangle = [_line(200, 150, 300, 150), _line(300, 150, 250, 60), _line(250, 60, 200, 150)]
+    assert not _is_candidate(FakePage(circle, triangle))
+
+
+def test_rotated_quad_is_not_a_cell():
+    rotated = Quad(ul=Point(50, 0), ur=Point(100, 50), ll=Point(0, 50), lr=Point(50, 100))
+    assert not _is_candidate(FakePage([("qu", rotated)]))
+
+    upright = Quad(ul=Point(0, 0), ur=Point(100, 0), ll=Point(0, 50), lr=Point(100, 50))
+    assert _is_candidate(FakePage([("qu", upright)]))
+
+
+def test_ruled_table_is_candidate():
+    # Una celda dibujada como rectángulo basta
+    assert _is_candidate(FakePage([("re", None, 1)]))
+
+    # Grilla de líneas repartida en varios trazos
+    rows = [_line(0, y, 300, y) for y in (0, 20, 40)]
+    cols = [_line(x, 0, x, 40) for x in (0, 150, 300)]
+    assert _is_candidate(FakePage(rows, cols))
+
+
+def test_lone_rules_are_not_a_table():
+    # Subrayados y separadores horizontales sin bordes verticales
+    assert not _is_candidate(FakePage([_line(0, y, 500, y) for y in (100, 300, 500)]))
+    assert not _is_candidate(FakePage())
+
+
+def run():
+    tests = [value for name, value in globals().items() if name.startswith("test_") and callable(value)]
+    for test in tests:
+        test()
+        print(f"✅ {test.__name__}")
+    print(f"✅ {len(tests)} pruebas del pre-filtro de tablas pasaron")
+
+
+if __name__ == "__main__":
+    run()